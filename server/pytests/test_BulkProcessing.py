@@ -0,0 +1,59 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "src"))  # Needed for sub-imports
+
+from src.BulkProcessing import *
+from src.SaveBlocks import *
+from src.SaveBlockProcessing import *
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+SAVE_DIR = os.path.join(DATA_DIR, "saves")
+BULK_SAVES = ["all_pokemon", "flex", "ng+", "magm", "inflamed_red", "invalid_block_id", "old_unbound_version"]
+
+
+class TestLoadSave:
+    def testMatchesSingleLoad(self):
+        saveBlocks, fileSignature = SaveBlocks.LoadAll(f"{SAVE_DIR}/flex.sav")
+        Defines.LoadAll(fileSignature)
+        allPokemon = SaveBlockProcessing.LoadPCPokemon(saveBlocks)
+        titles = SaveBlockProcessing.LoadCFRUBoxTitles(saveBlocks)
+
+        result = BulkProcessing.LoadSave(f"{SAVE_DIR}/flex.sav")
+        assert result["boxes"] == allPokemon
+        assert result["titles"] == titles
+        assert result["fileSignature"] == fileSignature
+        assert result["error"] == ""
+
+    def testFakePath(self):
+        result = BulkProcessing.LoadSave("fake_path")
+        assert result["boxes"] == []
+        assert result["error"] != ""
+
+    def testOldVersionSave(self):
+        result = BulkProcessing.LoadSave(f"{SAVE_DIR}/old_unbound_version.sav")
+        assert result["oldVersion"] == "Unbound v2.0"
+        assert result["boxes"] == []
+
+    def testSwitchesGames(self):
+        magm = BulkProcessing.LoadSave(f"{SAVE_DIR}/magm.sav")
+        flex = BulkProcessing.LoadSave(f"{SAVE_DIR}/flex.sav")
+        assert BulkProcessing.LoadSave(f"{SAVE_DIR}/magm.sav") == magm
+        assert magm["gameId"] != flex["gameId"]
+
+
+class TestLoadMany:
+    def testSerialMatchesLoadSave(self):
+        paths = [f"{SAVE_DIR}/{saveName}.sav" for saveName in BULK_SAVES]
+        results = list(BulkProcessing.LoadMany(paths, workerCount=1))
+        assert [result["path"] for result in results] == paths
+        assert results == [BulkProcessing.LoadSave(path) for path in paths]
+
+    def testParallelMatchesSerial(self):
+        paths = [f"{SAVE_DIR}/{saveName}.sav" for saveName in BULK_SAVES]
+        serial = {result["path"]: result for result in BulkProcessing.LoadMany(paths, workerCount=1)}
+        parallel = list(BulkProcessing.LoadMany(paths, workerCount=2, chunkSize=2))
+        assert len(parallel) == len(paths)
+        assert {result["path"]: result for result in parallel} == serial
+
+    def testNoPaths(self):
+        assert list(BulkProcessing.LoadMany([], workerCount=2)) == []
@@ -0,0 +1,90 @@
+import os, sys, random
+from pytest import raises
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "src"))  # Needed for sub-imports
+
+from src.CharMap import *
+from src.Defines import *
+
+
+def LegacyDecode(byteString: list) -> str:
+    string = ""
+    for byte in byteString:
+        byte = int(byte)
+        if byte == EOS:
+            break
+        elif byte in Defines.charMap:
+            string += Defines.charMap[byte]
+    return string
+
+
+def LegacyEncode(string: str, length: int) -> list:
+    charList = []
+    for char in string:
+        if char in Defines.reverseCharMap:
+            char = hex(Defines.reverseCharMap[char])[2:].zfill(2)
+        charList.append(char)
+
+    while len(charList) < length:
+        charList.append("FF")
+
+    return [int(byte, 16) for byte in charList]
+
+
+class TestDecode:
+    def testEveryByte(self):
+        Defines.LoadCharMap()
+        for byte in range(0x100):
+            assert Defines.charMapCodec.Decode(bytes([byte])) == LegacyDecode([byte])
+
+    def testRandomStrings(self):
+        Defines.LoadCharMap()
+        rng = random.Random(0)
+        for _ in range(1000):
+            byteString = bytes(rng.randrange(0x100) for _ in range(rng.randrange(12)))
+            assert Defines.charMapCodec.Decode(byteString) == LegacyDecode(byteString)
+
+    def testStopsAtEOS(self):
+        Defines.LoadCharMap()
+        assert Defines.charMapCodec.Decode(bytes([205, 223, 217, 224, 221, EOS, 180])) == "Skeli"
+
+    def testInputTypes(self):
+        Defines.LoadCharMap()
+        byteString = [205, 223, 217, 224, 221, EOS]
+        assert Defines.charMapCodec.Decode(byteString) == "Skeli"
+        assert Defines.charMapCodec.Decode(bytearray(byteString)) == "Skeli"
+        assert Defines.charMapCodec.Decode(memoryview(bytes(byteString))) == "Skeli"
+
+    def testNoCharMap(self):
+        assert CharMapCodec({}, {}).Decode(bytes([205, 223])) == ""
+
+    def testDecodeMany(self):
+        Defines.LoadCharMap()
+        assert Defines.charMapCodec.DecodeMany([bytes([205, 223, EOS]), b"", bytes([217, 224, 221])]) == ["Sk", "", "eli"]
+
+
+class TestEncode:
+    def testName(self):
+        Defines.LoadCharMap()
+        assert Defines.charMapCodec.Encode("Skeli", 10) == [205, 223, 217, 224, 221] + [EOS] * 5
+
+    def testMatchesLegacy(self):
+        Defines.LoadCharMap()
+        characters = list(Defines.reverseCharMap)
+        rng = random.Random(0)
+        for _ in range(1000):
+            string = "".join(rng.choice(characters) for _ in range(rng.randrange(11)))
+            assert Defines.charMapCodec.Encode(string, 10) == LegacyEncode(string, 10)
+
+    def testRoundTrip(self):
+        Defines.LoadCharMap()
+        assert Defines.charMapCodec.Decode(Defines.charMapCodec.Encode("Pikachu", 10)) == "Pikachu"
+
+    def testLongerThanLength(self):
+        Defines.LoadCharMap()
+        assert len(Defines.charMapCodec.Encode("Skeli", 3)) == 5
+
+    def testUnknownCharacter(self):
+        Defines.LoadCharMap()
+        with raises(ValueError):
+            Defines.charMapCodec.Encode("一", 10)
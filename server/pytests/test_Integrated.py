@@ -94,6 +94,11 @@ class TestIntegrated:
     def testReplaceAllHoopaShayminPresetBox(self):
         LoadAndReplaceTest("test_hoopa_shaymin_preset_box")
 
+    def testReplaceFromSaveImage(self, tmp_path):
+        SaveImageReplaceTest("flex", tmp_path)
+        SaveImageReplaceTest("single_save", tmp_path)
+        SaveImageReplaceTest("gs_chronicles_2.7.1", tmp_path)
+
     def testTransferPokemonFromCFREToUnbound(self):
         TransferTest("all_pokemon", "cfre", "firered", "unbound")
 
@@ -182,6 +187,34 @@ def LoadAndReplaceTest(saveName: str, definesAdjustmentFunc=None, shouldFail=Fal
     # assert file1Contents == file2Contents
 
 
+def SaveImageReplaceTest(saveName: str, outputDir):
+    originalSaveFilePath = f"{SAVE_DIR}/{saveName}.sav"
+    newFilePath = f"{outputDir}/{saveName}_new.sav"  # The PC is rearranged, so don't overwrite the tracked saves
+
+    # Update the save using the list save blocks
+    saveBlocks, fileSignature = SaveBlocks.LoadAll(originalSaveFilePath)
+    Defines.LoadAll(fileSignature)
+    allPokemon = SaveBlockProcessing.LoadPCPokemon(saveBlocks)
+    allPokemon = allPokemon[MonsPerBox:] + allPokemon[:MonsPerBox]  # Move the first Box to the end
+    seenFlags, caughtFlags = SaveBlockProcessing.LoadPokedexFlags(saveBlocks)
+    newSaveBlocks = SaveBlockProcessing.UpdateCFRUBoxData(saveBlocks, allPokemon)
+    newSaveBlocks = SaveBlockProcessing.UpdatePokedexFlags(newSaveBlocks, seenFlags, caughtFlags)
+    shutil.copyfile(originalSaveFilePath, newFilePath)
+    SaveBlocks.ReplaceAll(newFilePath, newSaveBlocks)
+    listResult = SaveBlocks.ReadSaveFile(newFilePath)
+
+    # Update the save using the save image
+    saveImage, _ = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(originalSaveFilePath))
+    assert SaveBlockProcessing.LoadPCPokemon(saveImage) == SaveBlockProcessing.LoadPCPokemon(saveBlocks)
+    newSaveImage = SaveBlockProcessing.UpdateCFRUBoxData(saveImage, allPokemon)
+    newSaveImage = SaveBlockProcessing.UpdatePokedexFlags(newSaveImage, seenFlags, caughtFlags)
+    shutil.copyfile(originalSaveFilePath, newFilePath)
+    SaveBlocks.ReplaceAll(newFilePath, newSaveImage)
+
+    assert SaveBlocks.ReadSaveFile(newFilePath) == listResult
+    assert SaveBlockProcessing.LoadPCPokemon(saveImage) == SaveBlockProcessing.LoadPCPokemon(saveBlocks)  # Original wasn't modified
+
+
 def TransferTest(saveName: str, setMetGame: str, metGameAfterLoad: str, originalMetGame: str):
     originalSaveFilePath = f"{SAVE_DIR}/{saveName}.sav"
     newFilePath = f"{SAVE_DIR}/{saveName}_new.sav"
@@ -0,0 +1,179 @@
+import os, sys, json, shutil
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "src"))  # Needed for sub-imports
+
+from src.Interface import *
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+SAVE_DIR = os.path.join(DATA_DIR, "saves")
+
+
+def CopySave(saveName: str, outputDir) -> str:
+    # Uploaded saves are temp files the Node server deletes, so never hand over the originals
+    gUploadCache.Clear()
+    gSaveImageCache.Clear()
+    saveFilePath = f"{outputDir}/{saveName}.sav"
+    shutil.copyfile(f"{SAVE_DIR}/{saveName}.sav", saveFilePath)
+    return saveFilePath
+
+
+def LoadAllPokemon(saveName: str) -> list:
+    saveBlocks, fileSignature = SaveBlocks.LoadAll(f"{SAVE_DIR}/{saveName}.sav")
+    Defines.LoadAll(fileSignature)
+    return SaveBlockProcessing.LoadPCPokemon(saveBlocks)
+
+
+class TestUploadSaveCache:
+    def testSameSaveTwice(self, tmp_path):
+        saveFilePath = CopySave("flex", tmp_path)
+        startStats = uploadCacheStats()
+        result = uploadSave(saveFilePath)
+        stats = uploadCacheStats()
+        assert stats["misses"] == startStats["misses"] + 1
+        assert stats["hits"] == startStats["hits"]
+        assert stats["entries"] == 1
+
+        assert uploadSave(saveFilePath) == result
+        stats = uploadCacheStats()
+        assert stats["misses"] == startStats["misses"] + 1
+        assert stats["hits"] == startStats["hits"] + 1
+        assert stats["entries"] == 1
+
+    def testDifferentSaves(self, tmp_path):
+        CopySave("flex", tmp_path)
+        shutil.copyfile(f"{SAVE_DIR}/magm.sav", f"{tmp_path}/magm.sav")
+        startStats = uploadCacheStats()
+        uploadSave(f"{tmp_path}/flex.sav")
+        uploadSave(f"{tmp_path}/magm.sav")
+        stats = uploadCacheStats()
+        assert stats["misses"] == startStats["misses"] + 2
+        assert stats["hits"] == startStats["hits"]
+        assert stats["entries"] == 2
+
+
+class TestUploadSaveFirstBoxOnly:
+    def testFirstBox(self, tmp_path):
+        allPokemon = LoadAllPokemon("flex")
+        result = uploadSave(CopySave("flex", tmp_path), firstBoxOnly=True)
+        assert result["boxes"] == allPokemon[:MONS_PER_BOX]
+        assert result["saveKey"] != ""
+
+    def testLaterBoxesAfterFileDeleted(self, tmp_path):
+        allPokemon = LoadAllPokemon("flex")
+        saveFilePath = CopySave("flex", tmp_path)
+        result = uploadSave(saveFilePath, firstBoxOnly=True)
+        os.remove(saveFilePath)  # Like the Node server does after /uploadsave
+
+        for box in range(1, result["boxCount"]):
+            assert uploadSaveBox(result["saveKey"], box) == allPokemon[box * MONS_PER_BOX:(box + 1) * MONS_PER_BOX]
+
+    def testBoxesFromFullUpload(self, tmp_path):
+        allPokemon = LoadAllPokemon("flex")
+        result = uploadSave(CopySave("flex", tmp_path))
+        assert uploadSaveBox(result["saveKey"], 1) == allPokemon[MONS_PER_BOX:MONS_PER_BOX * 2]
+
+    def testOutOfRangeBox(self, tmp_path):
+        result = uploadSave(CopySave("flex", tmp_path), firstBoxOnly=True)
+        assert uploadSaveBox(result["saveKey"], result["boxCount"]) == []
+        assert uploadSaveBox(result["saveKey"], -1) == []
+
+    def testOutOfRangeBoxFromFullUpload(self, tmp_path):
+        result = uploadSave(CopySave("flex", tmp_path))
+        assert uploadSaveBox(result["saveKey"], result["boxCount"]) == []
+        assert uploadSaveBox(result["saveKey"], result["boxCount"] + 5) == []
+
+    def testUnknownSaveKey(self, tmp_path):
+        CopySave("flex", tmp_path)
+        assert uploadSaveBox(UploadCache.GetKey(b"fake").hex(), 1) == []
+        assert uploadSaveBox("not hex", 1) == []
+        assert uploadSaveBox("", 1) == []
+
+
+class TestUpdateStats:
+    def testCountsRewrittenBlocks(self, tmp_path):
+        saveFilePath = CopySave("flex", tmp_path)
+        updatedDataJSON = f"{tmp_path}/updated.json"
+        with open(updatedDataJSON, "w", encoding="utf-8") as jsonFile:
+            json.dump(LoadAllPokemon("flex"), jsonFile)
+
+        startStats = updateStats()
+        newFilePath = updateSave(updatedDataJSON, saveFilePath)  # Cleans up the data after the names' ends
+        assert newFilePath != ""
+        assert updateStats()["updates"] == startStats["updates"] + 1
+
+        # Nothing left to rewrite in the updated save
+        startStats = updateStats()
+        newFilePath = shutil.move(newFilePath, f"{tmp_path}/updated.sav")
+        assert updateSave(updatedDataJSON, newFilePath) != ""
+        assert updateStats() == {"updates": startStats["updates"] + 1, "blocksRewritten": startStats["blocksRewritten"]}
+
+        # Swapping two Pokemon in the first box only changes its block
+        saveBlocks, _ = SaveBlocks.LoadAll(newFilePath)
+        allPokemon = SaveBlockProcessing.LoadPCPokemon(saveBlocks)
+        allPokemon[0], allPokemon[1] = allPokemon[1], allPokemon[0]
+        with open(updatedDataJSON, "w", encoding="utf-8") as jsonFile:
+            json.dump(allPokemon, jsonFile)
+        assert updateSave(updatedDataJSON, newFilePath) != ""
+        assert updateStats() == {"updates": startStats["updates"] + 2, "blocksRewritten": startStats["blocksRewritten"] + 1}
+
+
+class TestCreateSavePatch:
+    def testReturnsPatch(self, tmp_path):
+        saveFilePath = CopySave("flex", tmp_path)
+        newSaveFilePath = f"{tmp_path}/flex_new.sav"
+        shutil.copyfile(f"{SAVE_DIR}/flex_new.sav", newSaveFilePath)
+
+        response = createSavePatch(saveFilePath, newSaveFilePath)
+        assert response.status_code == 200
+        assert SavePatch.Apply(SaveBlocks.ReadSaveFile(saveFilePath), response.body) == SaveBlocks.ReadSaveFile(newSaveFilePath)
+        assert sorted(os.listdir(tmp_path)) == ["flex.sav", "flex_new.sav"]  # No patch file left behind
+
+    def testMissingPath(self, tmp_path):
+        assert createSavePatch(CopySave("flex", tmp_path), "").status_code == 400
+        assert createSavePatch("", "").status_code == 400
+
+
+def WriteSlotEdits(edits: list, outputDir) -> str:
+    updatedSlotsJSON = f"{outputDir}/slots.json"
+    with open(updatedSlotsJSON, "w", encoding="utf-8") as jsonFile:
+        json.dump(edits, jsonFile)
+    return updatedSlotsJSON
+
+
+class TestUpdateSaveSlots:
+    def testMovesPokemon(self, tmp_path):
+        saveFilePath = CopySave("flex", tmp_path)
+        allPokemon = LoadAllPokemon("flex")
+        edits = [{"box": 0, "slot": 0, "pokemon": allPokemon[MONS_PER_BOX + 1]}, {"box": 1, "slot": 1, "pokemon": allPokemon[0]}]
+
+        newFilePath = updateSaveSlots(WriteSlotEdits(edits, tmp_path), saveFilePath)
+        assert newFilePath == f"{tmp_path}/flex_new.sav"
+        saveBlocks, _ = SaveBlocks.LoadAll(newFilePath)
+        newPokemon = SaveBlockProcessing.LoadPCPokemon(saveBlocks)
+        assert newPokemon[0]["personality"] == allPokemon[MONS_PER_BOX + 1]["personality"]
+        assert newPokemon[MONS_PER_BOX + 1]["personality"] == allPokemon[0]["personality"]
+        assert newPokemon[2:MONS_PER_BOX] == allPokemon[2:MONS_PER_BOX]  # Rest of the PC is untouched
+
+    def testInvalidBox(self, tmp_path, capsys):
+        saveFilePath = CopySave("flex", tmp_path)
+        pokemon = LoadAllPokemon("flex")[0]
+        for box, slot in [(Defines.BoxCount(), 0), (-1, 0), (0, MONS_PER_BOX), (0, -1)]:
+            assert updateSaveSlots(WriteSlotEdits([{"box": box, "slot": slot, "pokemon": pokemon}], tmp_path), saveFilePath) == ""
+            assert "Invalid slot edits: Invalid PC slot" in capsys.readouterr().out
+        assert not os.path.exists(f"{tmp_path}/flex_new.sav")
+
+    def testMissingPokemon(self, tmp_path, capsys):
+        saveFilePath = CopySave("flex", tmp_path)
+        assert updateSaveSlots(WriteSlotEdits([{"box": 0, "slot": 0}], tmp_path), saveFilePath) == ""
+        assert "Invalid slot edits: Slot edit is missing pokemon" in capsys.readouterr().out
+        assert not os.path.exists(f"{tmp_path}/flex_new.sav")
+
+    def testWrongTypes(self, tmp_path, capsys):
+        saveFilePath = CopySave("flex", tmp_path)
+        pokemon = LoadAllPokemon("flex")[0]
+        for edits in [{"box": 0, "slot": 0, "pokemon": pokemon}, [{"box": "0", "slot": 0, "pokemon": pokemon}], [[0, 0, pokemon]]]:
+            assert updateSaveSlots(WriteSlotEdits(edits, tmp_path), saveFilePath) == ""
+            assert "Invalid slot edits" in capsys.readouterr().out
+
+    def testMissingPath(self, tmp_path):
+        assert updateSaveSlots("", CopySave("flex", tmp_path)) == ""
@@ -0,0 +1,87 @@
+import os, sys, random
+from pytest import importorskip
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "src"))  # Needed for sub-imports
+
+numpy = importorskip("numpy")
+
+from src.Defines import *
+from src.PokemonArrays import *
+from src.PokemonProcessing import *
+from src.SaveBlocks import *
+from src.SaveBlockProcessing import *
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+SAVE_DIR = os.path.join(DATA_DIR, "saves")
+ARRAY_SAVES = ["flex", "all_pokemon", "magm", "inflamed_red", "gs_chronicles_2.7.1"]
+
+
+def LoadSave(saveName: str) -> SaveImage:
+    saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/{saveName}.sav"))
+    Defines.LoadAll(fileSignature)
+    return saveImage
+
+
+class TestGetColumns:
+    def testMatchesRawRecords(self):
+        Defines.LoadAll(UNBOUND_2_1_FILE_SIGNATURE)
+        rng = random.Random(0)
+        pcData = bytes(rng.randrange(0x100) for _ in range(CFRUCompressedPokemonSize * MONS_PER_BOX * 5))
+        columns = PokemonArrays.GetColumns(PokemonArrays.LoadRecords(pcData))
+        for i, rawMon in enumerate(PokemonProcessing.LoadCFRUCompressedMons(pcData)):
+            assert columns["personality"][i] == rawMon["personality"]
+            assert columns["species"][i] == rawMon["species"]
+            assert columns["experience"][i] == rawMon["experience"]
+            assert list(columns["moves"][i]) == [(rawMon["moves"] >> (10 * j)) & 0x3FF for j in range(4)]
+            assert list(columns["ivs"][i]) == [(rawMon["ivs"] >> (5 * j)) & 0x1F for j in range(6)]
+            assert list(columns["evs"][i]) == [rawMon["hpEv"], rawMon["atkEv"], rawMon["defEv"], rawMon["spdEv"], rawMon["spAtkEv"], rawMon["spDefEv"]]
+            assert columns["hiddenAbility"][i] == ((rawMon["ivs"] >> 31) != 0)
+            assert columns["metGame"][i] == (rawMon["metInfo"] >> 7) & 0xF
+            assert columns["nature"][i] == rawMon["personality"] % 25
+
+    def testMatchesLoadPCPokemon(self):
+        for saveName in ARRAY_SAVES:
+            saveImage = LoadSave(saveName)
+            columns = PokemonArrays.LoadPC(saveImage)
+            allPokemon = SaveBlockProcessing.LoadPCPokemon(saveImage)
+            assert len(columns["species"]) == len(allPokemon) == Defines.BoxCount() * MONS_PER_BOX, saveName
+            for i, pokemon in enumerate(allPokemon):
+                if columns["badEgg"][i]:
+                    continue  # Wiped when loaded normally
+
+                assert list(columns["ivs"][i]) == pokemon["ivs"], saveName
+                assert list(columns["evs"][i]) == pokemon["evs"], saveName
+                assert columns["isEgg"][i] == pokemon["isEgg"], saveName
+                assert columns["hiddenAbility"][i] == pokemon["hiddenAbility"], saveName
+                assert columns["shiny"][i] == pokemon["shiny"], saveName
+                assert columns["metLevel"][i] == pokemon["metLevel"], saveName
+                assert columns["gigantamax"][i] == pokemon["gigantamax"], saveName
+                assert ("F" if columns["femaleOt"][i] else "M") == pokemon["otGender"], saveName
+                if pokemon["species"] in Defines.baseStats:
+                    assert Defines.natures[int(columns["nature"][i])] == pokemon["nature"], saveName
+                    assert columns["abilitySlot"][i] == pokemon["abilitySlot"], saveName
+
+    def testEmpty(self):
+        columns = PokemonArrays.GetColumns(PokemonArrays.LoadRecords(b""))
+        assert len(columns["species"]) == 0
+        assert columns["moves"].shape == (0, 4)
+
+
+class TestCountSpecies:
+    def testMatchesLoadPCPokemon(self):
+        saveImage = LoadSave("all_pokemon")
+        columns = PokemonArrays.LoadPC(saveImage)
+        rawMons = PokemonProcessing.LoadCFRUCompressedMons(SaveBlockProcessing.GetCFRUPCData(saveImage))
+        counts = {}
+        for rawMon in rawMons:
+            if rawMon["species"] != 0 and not rawMon["sanity"] & SANITY_IS_BAD_EGG:
+                species = Defines.species.get(rawMon["species"], rawMon["species"])
+                counts[species] = counts.get(species, 0) + 1
+        assert PokemonArrays.CountSpecies(columns) == counts
+
+
+class TestGetDType:
+    def testMatchesFieldTable(self):
+        dtype = PokemonArrays.GetDType()
+        assert dtype.itemsize == CFRUCompressedPokemonSize
+        assert [dtype.fields[tag][1] for tag in CFRUCompressedPokemon] == [offset for offset, _ in CFRUCompressedPokemon.values()]
@@ -1,15 +1,218 @@
-import os, shutil, sys
+import os, random, shutil, sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "src"))  # Needed for sub-imports
 
 from src.Defines import *
 from src.PokemonProcessing import *
+from src.SaveBlocks import *
+from src.SaveBlockProcessing import *
+from src.Util import ConvertToReverseByteList
 from pytests.data import *
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+SAVE_DIR = os.path.join(DATA_DIR, "saves")
+ENCODER_SAVES = ["flex", "all_pokemon", "magm", "inflamed_red", "inflamed_red_gen_9", "gs_chronicles_2.7.1", "cfre", "ng+"]
 DEX_FLAGS_SIZE = (999 // 8) + 1
 
 
+def LegacyUpdatePokedexFlags(seenFlags: list, caughtFlags: list, allPokemonData: list) -> tuple:
+    # One Pokemon and one bit at a time, as the flags were set before the precomputed table
+    newSeenFlags, newCaughtFlags = seenFlags.copy(), caughtFlags.copy()
+    for pokemonData in allPokemonData:
+        dexNum = Defines.GetSpeciesDexNum(pokemonData["species"])
+        if dexNum >= 1:
+            newSeenFlags[(dexNum - 1) // 8] |= 1 << ((dexNum - 1) % 8)
+            newCaughtFlags[(dexNum - 1) // 8] |= 1 << ((dexNum - 1) % 8)
+    return newSeenFlags, newCaughtFlags
+
+
+def LegacyConvertPokemonToCFRUCompressedMon(pokemonData: dict, boxId) -> list:
+    # Every field through hex strings, as Pokemon were encoded before the field structs
+    species = pokemonData["species"]
+    finalData = [0] * CFRUCompressedPokemonSize
+    inPresetBox = boxId == UNBOUND_PRESET_BOX and Defines.GetCurrentGameName() == "unbound"
+    if species == 0 or species == "SPECIES_NONE":
+        return finalData  # No point in wasting time
+
+    if "checksum" not in pokemonData and PokemonUtil.IsUpdatedDataVersion(pokemonData):
+        return finalData  # Checksum is missing
+
+    if PokemonUtil.CalculateChecksum(pokemonData) != pokemonData["checksum"]:
+        return finalData  # Data is corrupted
+
+    # Filter out non-existant moves and update PP Bonuses accordingly
+    if type(pokemonData["moves"]) == list:  # Don't check if it exists, because if it doesn't an error should be thrown
+        actualMoves = []
+        actualPPBonuses = []
+        for i, move in enumerate(pokemonData["moves"]):
+            if move in Defines.reverseMoves:
+                actualMoves.append(move)
+                if type(pokemonData["ppBonuses"]) == list:
+                    actualPPBonuses.append(pokemonData["ppBonuses"][i])
+                else:
+                    actualPPBonuses.append(pokemonData["ppBonuses"] & (3 << i))
+    else:
+        return finalData  # Can't sneak in moves that isn't a list
+
+    # Dissect the actual data
+    for key in pokemonData:
+        if key == "species":
+            if not inPresetBox:
+                if species == "SPECIES_HOOPA_UNBOUND":
+                    species = "SPECIES_HOOPA"  # Reverts when placed in the PC
+                elif species == "SPECIES_SHAYMIN_SKY":
+                    species = "SPECIES_SHAYMIN"  # Reverts when placed in the PC
+
+            if species in Defines.reverseSpecies:
+                finalSpecies = Defines.reverseSpecies[species]
+            elif species in Defines.unofficialSpecies:
+                finalSpecies = int(species)  # Species in game, but not supported on the site
+            else:
+                finalSpecies = 0  # Bye, bye, Pokemon!
+
+            if finalSpecies != 0:
+                finalData[CFRUCompressedPokemon["sanity"][0]] |= 2  # hasSpecies
+            else:
+                return [0] * CFRUCompressedPokemonSize  # Wipe Pokemon with fake species
+
+            data = finalSpecies
+            offset = CFRUCompressedPokemon[key][0]
+        elif key == "moves":
+            moves = 0
+            for i, move in enumerate(actualMoves):
+                move = Defines.reverseMoves[move]
+                moves |= (min(move, 0x3FF) << (10 * i))
+
+            if moves == 0:
+                moves = 1  # Pound
+
+            data = moves
+            offset = CFRUCompressedPokemon[key][0]
+        elif key == "ppBonuses":
+            data = 0
+            for i, bonus in enumerate(actualPPBonuses):
+                data |= (min(bonus, 3) << (2 * i))
+            offset = CFRUCompressedPokemon[key][0]
+        elif key == "ivs":
+            ivs = 0
+            if pokemonData[key] is not None:
+                for i, iv in enumerate(pokemonData[key]):
+                    ivs |= (min(iv, 31) << (5 * i))
+            data = ivs
+            offset = CFRUCompressedPokemon[key][0]
+        elif key == "evs":
+            evs = 0
+            if pokemonData[key] is not None:
+                for i, ev in enumerate(pokemonData[key]):
+                    evs |= (min(ev, 0xFF) << (8 * i))
+            data = evs
+            offset = CFRUCompressedPokemon["hpEv"][0]
+        elif key == "isEgg":
+            if pokemonData["isEgg"] != 0:
+                finalData[CFRUCompressedPokemon["sanity"][0]] |= 4
+                finalData[57] |= 0x40  # End of IVs
+            continue
+        elif key == "hiddenAbility":
+            if pokemonData["hiddenAbility"]:
+                finalData[57] |= 0x80  # End of IVs
+            continue
+        elif key == "item":
+            item = pokemonData[key]
+            if pokemonData["item"] in Defines.reverseItems:
+                item = Defines.reverseItems[item]
+            else:
+                item = 0
+            data = item
+            offset = CFRUCompressedPokemon[key][0]
+        elif key == "pokeBall":
+            data = pokemonData[key]
+            if data in Defines.reverseBallTypes:
+                data = Defines.reverseBallTypes[data]
+            else:
+                data = Defines.reverseBallTypes["BALL_TYPE_POKE_BALL"]
+            offset = CFRUCompressedPokemon[key][0]
+        elif key == "language":
+            data = pokemonData[key]
+            if data in Defines.reverseLanguages:
+                data = Defines.reverseLanguages[data]
+            else:
+                data = Defines.reverseLanguages["LANGUAGE_ENGLISH"]
+            offset = CFRUCompressedPokemon[key][0]
+        elif key == "markings":
+            markings = pokemonData[key]
+            data = markings
+            if type(data) == list:
+                data = sum([1 << i if markings[i] else 0 for i in range(len(markings))]) & 0xF  # Only 4 markings actually in base game
+            offset = CFRUCompressedPokemon[key][0]
+        elif key == "metLevel":
+            data = min(pokemonData[key], 0x7F)  # 7 bits
+            offset = CFRUCompressedPokemon["metInfo"][0]  # Part of Met Info
+        elif key == "metGame":
+            data = Defines.GetMetIdToBeSaved(pokemonData[key])
+            data = (data & 0xF) << 7  # 4 bits
+            offset = CFRUCompressedPokemon["metInfo"][0]  # Part of Met Info
+        elif key == "gigantamax":
+            if pokemonData[key]:
+                data = 1 << 11  # Gigantamax bit set
+                offset = CFRUCompressedPokemon["metInfo"][0]  # Part of Met Info
+            else:
+                continue
+        elif key == "otGender":
+            if pokemonData[key] == "F":
+                data = 1 << 15  # Female OT
+                offset = CFRUCompressedPokemon["metInfo"][0]  # Part of Met Info
+            else:
+                continue
+        elif key == "nickname" or key == "otName":
+            charList = []
+            name = pokemonData[key]
+            for char in name:
+                if char in Defines.reverseCharMap:
+                    char = hex(Defines.reverseCharMap[char])[2:].zfill(2)  # Make it look like "03" or "57"
+                charList.append(char)
+
+            while(len(charList)) < CFRUCompressedPokemon[key][1]:
+                charList.append("FF")  # EOS
+
+            offset = CFRUCompressedPokemon[key][0]
+            for i, byte in enumerate(charList):
+                finalData[offset + i] |= int(byte, 16)  # Data is stored one byte at a time
+            continue
+        else:
+            if key in CFRUCompressedPokemon:
+                data = pokemonData[key]
+                offset = CFRUCompressedPokemon[key][0]
+            else:
+                continue
+
+        data = ConvertToReverseByteList(hex(data))  # Data is stored in little endian
+
+        for i, byte in enumerate(data):
+            finalData[offset + i] |= int(byte, 16)
+
+    return finalData
+
+
+def LegacyLoadCFRUCompressedMon(rawMon: list) -> dict:
+    # One field at a time, as records were read before the compiled struct
+    pokemonData = {}
+    for tag, (offset, size) in CFRUCompressedPokemon.items():
+        if tag == "nickname" or tag == "otName":
+            pokemonData[tag] = LegacyDecodeString(rawMon[offset:offset + size])
+        else:
+            pokemonData[tag] = sum(rawMon[offset + i] << (8 * i) for i in range(size))
+    return pokemonData
+
+
+def LegacyDecodeString(byteString: list) -> str:
+    string = ""
+    for byte in byteString:
+        if byte == 0xFF:
+            break
+        string += Defines.charMap.get(byte, "")
+    return string
+
+
 class TestLoadCFRUCompressedMonAtBoxOffset:
     def testSingleBlankRawPokemon(self):
         Defines.LoadAll(CFRE_FILE_SIGNATURE)
@@ -20,6 +223,30 @@ class TestLoadCFRUCompressedMonAtBoxOffset:
         assert PokemonProcessing.LoadCFRUCompressedMonAtBoxOffset([1] * CFRUCompressedPokemonSize + [0] * CFRUCompressedPokemonSize,
                                                                   CFRUCompressedPokemonSize) == BLANK_TEST_POKEMON_RAW
 
+    def testMatchesPerFieldDecode(self):
+        Defines.LoadAll(UNBOUND_2_1_FILE_SIGNATURE)
+        rng = random.Random(0)
+        for _ in range(200):
+            rawMon = [rng.randrange(0x100) for _ in range(CFRUCompressedPokemonSize)]
+            assert PokemonProcessing.LoadCFRUCompressedMonAtBoxOffset(rawMon, 0) == LegacyLoadCFRUCompressedMon(rawMon)
+            assert PokemonProcessing.LoadCFRUCompressedMonAtBoxOffset(bytes(rawMon), 0) == LegacyLoadCFRUCompressedMon(rawMon)
+
+
+class TestLoadCFRUCompressedMons:
+    def testMatchesSingleMonLoads(self):
+        Defines.LoadAll(UNBOUND_2_1_FILE_SIGNATURE)
+        rng = random.Random(0)
+        allBoxes = bytes(rng.randrange(0x100) for _ in range(CFRUCompressedPokemonSize * MONS_PER_BOX))
+        assert PokemonProcessing.LoadCFRUCompressedMons(allBoxes) == \
+               [PokemonProcessing.LoadCFRUCompressedMonAtBoxOffset(allBoxes, offset) for offset in range(0, len(allBoxes), CFRUCompressedPokemonSize)]
+
+    def testFieldOrder(self):
+        Defines.LoadAll(UNBOUND_2_1_FILE_SIGNATURE)
+        assert list(PokemonProcessing.LoadCFRUCompressedMons(bytes(CFRUCompressedPokemonSize))[0]) == list(CFRUCompressedPokemon)
+
+    def testEmpty(self):
+        assert PokemonProcessing.LoadCFRUCompressedMons(b"") == []
+
 
 class TestAssignConstantsToCFRUData:
     def testNormalData(self):
@@ -168,6 +395,87 @@ class TestConvertPokemonToCFRUCompressedMon:
         assert convertedData == SHAYMIN_BYTE_LIST
 
 
+class TestLoadCFRUMons:
+    def testMatchesPerRecordLoad(self):
+        for saveName in ["flex", "all_pokemon", "magm"]:
+            saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/{saveName}.sav"))
+            Defines.LoadAll(fileSignature)
+            pcData = SaveBlockProcessing.GetCFRUPCData(saveImage)
+            assert pcData.count(BlankCFRUCompressedPokemon) > 0, saveName
+            expected = PokemonProcessing.LoadCFRUCompressedMons(pcData)
+            for pokemonData in expected:
+                PokemonProcessing.AssignConstantsToCFRUData(pokemonData)
+            assert PokemonProcessing.LoadCFRUMons(pcData) == expected, saveName
+
+    def testBlankCopiesAreSeparate(self):
+        Defines.LoadAll(UNBOUND_2_1_FILE_SIGNATURE)
+        allPokemon = PokemonProcessing.LoadCFRUMons(BlankCFRUCompressedPokemon * 2)
+        allPokemon[0]["moves"][0] = "MOVE_POUND"
+        allPokemon[0]["species"] = "SPECIES_BULBASAUR"
+        assert allPokemon[1] == PokemonProcessing.GetBlankCFRUPokemon()
+        assert allPokemon[1]["moves"][0] == "MOVE_NONE"
+
+    def testBlankPerGame(self):
+        Defines.LoadAll(UNBOUND_2_1_FILE_SIGNATURE)
+        assert PokemonProcessing.GetBlankCFRUPokemon() is PokemonProcessing.GetBlankCFRUPokemon()
+        assert PokemonProcessing.GetBlankCFRUPokemon()["metGame"] == "unbound"
+        Defines.LoadAll(MAGM_FILE_SIGNATURE)
+        assert PokemonProcessing.GetBlankCFRUPokemon()["metGame"] == "magm"
+
+
+class TestGetAllCFRUCompressedMonsData:
+    def testMatchesPerPokemonEncode(self):
+        saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav"))
+        Defines.LoadAll(fileSignature)
+        allPokemon = SaveBlockProcessing.LoadPCPokemon(saveImage)
+        expected = []
+        for i, pokemonData in enumerate(allPokemon):
+            expected += LegacyConvertPokemonToCFRUCompressedMon(pokemonData, (i // MONS_PER_BOX) + 1)
+        assert PokemonProcessing.GetAllCFRUCompressedMonsData(allPokemon) == bytes(expected)
+        assert PokemonProcessing.GetAllCFRUCompressedMons(allPokemon) == expected
+
+    def testEmpty(self):
+        assert PokemonProcessing.GetAllCFRUCompressedMonsData([]) == b""
+
+
+class TestEncoderMatchesLegacy:
+    def testSaves(self):
+        for saveName in ENCODER_SAVES:
+            saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/{saveName}.sav"))
+            Defines.LoadAll(fileSignature)
+            for i, pokemon in enumerate(SaveBlockProcessing.LoadPCPokemon(saveImage)):
+                boxId = (i // MONS_PER_BOX) + 1
+                assert PokemonProcessing.ConvertPokemonToCFRUCompressedMon(pokemon, boxId) == \
+                       LegacyConvertPokemonToCFRUCompressedMon(pokemon, boxId), f"{saveName} {i}"
+
+    def testEditedPokemon(self):
+        saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/all_pokemon.sav"))
+        Defines.LoadAll(fileSignature)
+        allPokemon = [pokemon for pokemon in SaveBlockProcessing.LoadPCPokemon(saveImage) if pokemon["species"] != "SPECIES_NONE"]
+        edits = [{"isEgg": True}, {"hiddenAbility": True}, {"gigantamax": True}, {"otGender": "F"}, {"nickname": "Skeli"},
+                 {"nickname": "LongerThanTen"}, {"friendship": 0x1FF}, {"personality": 0xFFFFFFFF}, {"metLevel": 200},
+                 {"ivs": [31] * 6}, {"evs": [252, 252, 4, 0, 0, 0]}, {"markings": [True] * 8}, {"ppBonuses": [3, 0, 2, 1]},
+                 {"moves": ["MOVE_NONE"] * 4}, {"item": "ITEM_FAKE"}, {"pokeBall": "BALL_TYPE_FAKE"}, {"language": "LANGUAGE_FAKE"},
+                 {"species": "SPECIES_HOOPA_UNBOUND"}, {"species": "SPECIES_SHAYMIN_SKY"}]
+        rng = random.Random(0)
+        for edit in edits:
+            for pokemon in rng.sample(allPokemon, 20):
+                pokemon = dict(pokemon, **edit)
+                pokemon["checksum"] = PokemonUtil.CalculateChecksum(pokemon)
+                for boxId in [1, UNBOUND_PRESET_BOX]:
+                    assert PokemonProcessing.ConvertPokemonToCFRUCompressedMon(pokemon, boxId) == \
+                           LegacyConvertPokemonToCFRUCompressedMon(pokemon, boxId), edit
+
+    def testOverflowIntoNextField(self):
+        Defines.LoadAll(UNBOUND_2_1_FILE_SIGNATURE)
+        pokemon = dict(TEST_POKEMON, friendship=0x1FF)
+        pokemon["checksum"] = PokemonUtil.CalculateChecksum(pokemon)
+        convertedData = PokemonProcessing.ConvertPokemonToCFRUCompressedMon(pokemon, 0)
+        assert convertedData == LegacyConvertPokemonToCFRUCompressedMon(pokemon, 0)
+        assert convertedData[CFRUCompressedPokemon["friendship"][0]] == 0xFF
+        assert convertedData[CFRUCompressedPokemon["pokeBall"][0]] & 1
+
+
 class TestUpdatePokedexFlags:
     def testVenusaur(self):
         Defines.LoadAll(UNBOUND_2_1_FILE_SIGNATURE)
@@ -211,6 +519,38 @@ class TestUpdatePokedexFlags:
         assert seenFlags == [4] + [0] * (DEX_FLAGS_SIZE - 1)
         assert caughtFlags == [4] + [0] * (DEX_FLAGS_SIZE - 1)
 
+    def testMatchesPerPokemonLoop(self):
+        Defines.LoadAll(UNBOUND_2_1_FILE_SIGNATURE)
+        allSpecies = [species for species in Defines.speciesToDexNum if Defines.GetSpeciesDexNum(species) <= DEX_FLAGS_SIZE * 8]
+        allSpecies += ["SPECIES_NONE", "", "SPECIES_FAKE"]
+        rng = random.Random(0)
+        for _ in range(50):
+            seenFlags = [rng.randrange(0x100) if rng.random() < 0.1 else 0 for _ in range(DEX_FLAGS_SIZE)]
+            caughtFlags = [rng.randrange(0x100) if rng.random() < 0.1 else 0 for _ in range(DEX_FLAGS_SIZE)]
+            allPokemon = [{"species": rng.choice(allSpecies)} for _ in range(rng.randrange(MONS_PER_BOX * 3))]
+            assert PokemonProcessing.UpdatePokedexFlags(seenFlags, caughtFlags, allPokemon) == \
+                   LegacyUpdatePokedexFlags(seenFlags, caughtFlags, allPokemon)
+
+    def testReportsChange(self):
+        Defines.LoadAll(UNBOUND_2_1_FILE_SIGNATURE)
+        seenFlags = [4] + [0] * (DEX_FLAGS_SIZE - 1)
+        caughtFlags = [0] * DEX_FLAGS_SIZE
+        assert PokemonProcessing.UpdatePokedexFlagsWithChange(seenFlags, caughtFlags, [TEST_POKEMON])[2]  # Seen but not caught yet
+
+    def testReportsNoChange(self):
+        Defines.LoadAll(UNBOUND_2_1_FILE_SIGNATURE)
+        seenFlags = [4] + [0] * (DEX_FLAGS_SIZE - 1)
+        caughtFlags = [4] + [0] * (DEX_FLAGS_SIZE - 1)
+        assert not PokemonProcessing.UpdatePokedexFlagsWithChange(seenFlags, caughtFlags, [TEST_POKEMON, {"species": "SPECIES_NONE"}])[2]
+        assert not PokemonProcessing.UpdatePokedexFlagsWithChange(seenFlags, caughtFlags, [])[2]
+
+    def testInputNotModified(self):
+        Defines.LoadAll(UNBOUND_2_1_FILE_SIGNATURE)
+        seenFlags = [0] * DEX_FLAGS_SIZE
+        caughtFlags = [0] * DEX_FLAGS_SIZE
+        PokemonProcessing.UpdatePokedexFlags(seenFlags, caughtFlags, [TEST_POKEMON])
+        assert seenFlags == caughtFlags == [0] * DEX_FLAGS_SIZE
+
 
 class TestConvertOldDataStructToNew:
     def testConvertOldTestPokemon(self):
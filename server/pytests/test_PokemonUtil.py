@@ -1,10 +1,55 @@
-import os, sys
+import os, sys, json, hashlib, random
 sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "src"))  # Needed for sub-imports
 
 from src.Defines import *
 from src.PokemonUtil import *
 from pytests.data import *
+from pytests import data as testData
+
+
+def LegacySerializeForChecksum(pokemon: dict) -> str:
+    # The copy, delete and json.dumps the checksum was calculated from before the canonical serializer
+    pokemon = pokemon.copy()
+    for key in ["markings", "checksum", "wonderTradeTimestamp"]:
+        if key in pokemon:
+            del pokemon[key]
+    return json.dumps(pokemon, sort_keys=True)
+
+
+def LegacyCalculateChecksum(pokemon: dict) -> str:
+    return hashlib.md5((LegacySerializeForChecksum(pokemon) + CHECKSUM_KEY).encode("utf-8")).hexdigest()
+
+
+def GetFixturePokemon() -> list:
+    allPokemon = []
+    for name, value in vars(testData).items():
+        if name.isupper() and type(value) == dict:
+            allPokemon.append(value)
+        elif name.isupper() and type(value) == list and len(value) > 0 and all(type(item) == dict for item in value):
+            allPokemon += value
+    return allPokemon
+
+
+def CreateRandomValue(rng: random.Random, depth: int = 0):
+    choice = rng.randrange(9 if depth < 2 else 6)
+    if choice == 0:
+        return rng.randrange(-2 ** 40, 2 ** 40)
+    elif choice == 1:
+        return rng.choice([True, False, None])
+    elif choice == 2:
+        return rng.choice([0.5, -1.25, 1e100, float("inf"), float("-inf"), float("nan"), 3.0])
+    elif choice == 3:
+        return "".join(rng.choice("abcXYZ \"\\/\n\t\x00\x7féé♂♀▶😀") for _ in range(rng.randrange(12)))
+    elif choice == 4:
+        return "SPECIES_" + str(rng.randrange(1000))
+    elif choice == 5:
+        return rng.randrange(0x100)
+    elif choice == 6:
+        return [CreateRandomValue(rng, depth + 1) for _ in range(rng.randrange(5))]
+    elif choice == 7:
+        return tuple(CreateRandomValue(rng, depth + 1) for _ in range(rng.randrange(3)))
+    return {str(rng.randrange(100)): CreateRandomValue(rng, depth + 1) for _ in range(rng.randrange(4))}
 
 
 class TestGetBaseStats:
@@ -354,6 +399,43 @@ class TestCalculateChecksum:
         assert PokemonUtil.CalculateChecksum(pokemon) == pokemon["checksum"]
 
 
+class TestSerializeForChecksum:
+    def testMatchesDataFixtures(self):
+        allPokemon = GetFixturePokemon()
+        assert len(allPokemon) > 10
+        for pokemon in allPokemon:
+            assert PokemonUtil.SerializeForChecksum(pokemon) == LegacySerializeForChecksum(pokemon)
+            assert PokemonUtil.CalculateChecksum(pokemon) == LegacyCalculateChecksum(pokemon)
+
+    def testMatchesJSONDumps(self):
+        rng = random.Random(0)
+        keys = list(TEST_POKEMON) + ["markings", "checksum", "wonderTradeTimestamp", "ñame", "key \"quoted\""]
+        for _ in range(2000):
+            pokemon = {key: CreateRandomValue(rng) for key in rng.sample(keys, rng.randrange(len(keys)))}
+            assert PokemonUtil.SerializeForChecksum(pokemon) == LegacySerializeForChecksum(pokemon)
+
+    def testNonStringKeys(self):
+        pokemon = {1: "SPECIES_BULBASAUR", 2: [1, 2]}
+        assert PokemonUtil.SerializeForChecksum(pokemon) == LegacySerializeForChecksum(pokemon)
+
+    def testEmpty(self):
+        assert PokemonUtil.SerializeForChecksum({}) == "{}"
+        assert PokemonUtil.SerializeForChecksum({"checksum": "abc"}) == "{}"
+
+    def testFrontEndFormat(self):
+        assert PokemonUtil.SerializeForChecksum({"Hello": [0, 1, 2, 3, 4], "nickname": "Flabébé"}) == \
+               '{"Hello": [0, 1, 2, 3, 4], "nickname": "Flab\\u00e9b\\u00e9"}'  # Same as PythonJSONStringify in util.js
+
+
+class TestCalculateChecksums:
+    def testMatchesCalculateChecksum(self):
+        allPokemon = GetFixturePokemon()
+        assert PokemonUtil.CalculateChecksums(allPokemon) == [PokemonUtil.CalculateChecksum(pokemon) for pokemon in allPokemon]
+
+    def testEmpty(self):
+        assert PokemonUtil.CalculateChecksums([]) == []
+
+
 class TestIsUpdatedDataVersion:
     def testUpdatedVersion(self):
         assert PokemonUtil.IsUpdatedDataVersion(TEST_POKEMON)
@@ -0,0 +1,97 @@
+import os, sys, json
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "src"))  # Needed for sub-imports
+
+from src.SaveAudit import *
+from src.SaveBlockProcessing import *
+from src.SaveBlocks import *
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+SAVE_DIR = os.path.join(DATA_DIR, "saves")
+FLAG_TEST_DIR = os.path.join(SAVE_DIR, "flag_test")
+
+
+class TestAuditSave:
+    def testValidSave(self):
+        result = SaveAudit.AuditSave(f"{SAVE_DIR}/flex.sav")
+        assert result["valid"]
+        assert result["gameName"] == "unbound"
+        assert result["boxCount"] == 25
+        assert not result["randomizer"]
+        assert result["error"] == ""
+
+    def testRandomizerSave(self):
+        result = SaveAudit.AuditSave(f"{FLAG_TEST_DIR}/unbound_randomizers.sav")
+        assert result["randomizer"]
+
+    def testOldVersionSave(self):
+        result = SaveAudit.AuditSave(f"{SAVE_DIR}/old_unbound_version.sav")
+        assert result["valid"]
+        assert result["oldVersion"] == "Unbound v2.0"
+        assert result["gameName"] == ""
+
+    def testInvalidSave(self):
+        result = SaveAudit.AuditSave(f"{SAVE_DIR}/single_save_corrupt_save_1.sav")
+        assert not result["valid"]
+        assert result["boxCount"] == 0
+
+    def testInvalidChecksum(self, tmp_path):
+        for blockId in [2, 7]:  # Read for the save's status, and only read for the PC
+            saveData = bytearray(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav"))
+            saveImage, _ = SaveBlocks.LoadAllFromData(saveData)
+            saveData[saveImage.blockOffsets[blockId] + VanillaVarsOffset] ^= 0xFF
+            with open(f"{tmp_path}/corrupt.sav", "wb") as binaryFile:
+                binaryFile.write(saveData)
+
+            assert not SaveBlocks.Validate(f"{tmp_path}/corrupt.sav")
+            assert not SaveAudit.AuditSave(f"{tmp_path}/corrupt.sav")["valid"], blockId
+
+    def testInvalidChecksumInOtherSave(self, tmp_path):
+        saveData = bytearray(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/ng+.sav"))
+        saveData[SaveSize + BlockSize * 3] ^= 0xFF  # Save 2 isn't the one used, but both must be valid
+        with open(f"{tmp_path}/corrupt.sav", "wb") as binaryFile:
+            binaryFile.write(saveData)
+
+        assert not SaveBlocks.Validate(f"{tmp_path}/corrupt.sav")
+        assert not SaveAudit.AuditSave(f"{tmp_path}/corrupt.sav")["valid"]
+
+    def testFakePath(self):
+        assert not SaveAudit.AuditSave("fake_path")["valid"]
+
+
+class TestFindSaveFiles:
+    def testFindsSubdirectories(self):
+        saveFilePaths = list(SaveAudit.FindSaveFiles(SAVE_DIR))
+        assert f"{SAVE_DIR}/flex.sav" in saveFilePaths
+        assert os.path.join(FLAG_TEST_DIR, "unbound_randomizers.sav") in saveFilePaths
+        assert all(saveFilePath.endswith(".sav") for saveFilePath in saveFilePaths)
+
+    def testSkipPaths(self):
+        skipPath = os.path.join(FLAG_TEST_DIR, "unbound_randomizers.sav")
+        saveFilePaths = list(SaveAudit.FindSaveFiles(FLAG_TEST_DIR, {skipPath}))
+        assert len(saveFilePaths) == 3
+        assert skipPath not in saveFilePaths
+
+
+class TestRun:
+    def testOutputFile(self, tmp_path):
+        outputFilePath = str(tmp_path / "audit.jsonl")
+        assert SaveAudit.Run(FLAG_TEST_DIR, outputFilePath, workerCount=1) == 4
+
+        with open(outputFilePath, "r", encoding="utf-8") as outputFile:
+            results = [json.loads(line) for line in outputFile]
+
+        assert sorted(result["path"] for result in results) == sorted(SaveAudit.FindSaveFiles(FLAG_TEST_DIR))
+
+    def testResume(self, tmp_path):
+        outputFilePath = str(tmp_path / "audit.jsonl")
+        with open(outputFilePath, "w", encoding="utf-8") as outputFile:
+            outputFile.write(json.dumps(SaveAudit.AuditSave(os.path.join(FLAG_TEST_DIR, "magm_before_pc.sav"))) + "\n")
+            outputFile.write('{"path": "cut off')  # Stopped mid-write
+
+        assert SaveAudit.Run(FLAG_TEST_DIR, outputFilePath, resume=True, workerCount=1) == 3
+        assert len(SaveAudit.LoadCheckpoint(outputFilePath)) == 4
+
+    def testParallel(self, tmp_path):
+        outputFilePath = str(tmp_path / "audit.jsonl")
+        assert SaveAudit.Run(FLAG_TEST_DIR, outputFilePath, workerCount=2, chunkSize=1) == 4
@@ -6,6 +6,7 @@ sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__
 from src.Defines import *
 from src.SaveBlocks import *
 from src.SaveBlockProcessing import *
+from src.SaveTables import *
 from pytests.data import *
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
@@ -31,6 +32,122 @@ class TestLoadPCPokemon:
                 assert allPokemon == correctPokemon
 
 
+class TestGetPCLayout:
+    def testSlotCounts(self):
+        assert len(SaveBlockProcessing.GetPCLayout(25)) == 25 * MonsPerBox
+        assert len(SaveBlockProcessing.GetPCLayout(24)) == 24 * MonsPerBox
+        assert len(SaveBlockProcessing.GetPCLayout(19)) == 19 * MonsPerBox
+
+    def testPartialRegions(self):
+        for boxCount in range(20, 23 + 1):  # Games that stop partway through the expanded box memory
+            assert len(SaveBlockProcessing.GetPCLayout(boxCount)) == boxCount * MonsPerBox
+            assert SaveBlockProcessing.GetPCLayout(boxCount) == SaveBlockProcessing.GetPCLayout(25)[:boxCount * MonsPerBox]
+
+    def testSlotSizes(self):
+        for spans in SaveBlockProcessing.GetPCLayout(25):
+            assert 1 <= len(spans) <= 2
+            assert sum(length for _, _, length in spans) == CFRUCompressedPokemonSize
+            assert all(offset + length <= BlockDataSize for _, offset, length in spans)
+
+    def testKnownSlots(self):
+        layout = SaveBlockProcessing.GetPCLayout(25)
+        assert layout[0] == [(5, 4, CFRUCompressedPokemonSize)]
+        assert layout[19 * MonsPerBox] == [(30, 0xB0C, CFRUCompressedPokemonSize)]
+        assert layout[22 * MonsPerBox] == [(2, 0xF18, CFRUCompressedPokemonSize)]
+        assert layout[24 * MonsPerBox] == [(0, 0xB0, CFRUCompressedPokemonSize)]
+        assert layout[-1] == [(0, 0xB0 + CFRUCompressedPokemonSize * (MonsPerBox - 1), CFRUCompressedPokemonSize)]
+
+    def testSplitSlot(self):
+        firstSplit = next(spans for spans in SaveBlockProcessing.GetPCLayout(25) if len(spans) == 2)
+        (firstBlock, firstOffset, firstLength), (secondBlock, secondOffset, secondLength) = firstSplit
+        assert (firstBlock, secondBlock) == (5, 6)
+        assert firstOffset + firstLength == BlockDataSize
+        assert secondOffset == 0
+
+    def testCached(self):
+        assert SaveBlockProcessing.GetPCLayout(25) is SaveBlockProcessing.GetPCLayout(25)
+
+    def testMatchesAllBoxesData(self):
+        for saveName in ["flex", "magm"]:
+            saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/{saveName}.sav"))
+            Defines.LoadAll(fileSignature)
+            layoutData = b"".join(bytes(SaveBlockProcessing.ReadSpans(saveImage, spans))
+                                  for spans in SaveBlockProcessing.GetPCLayout(Defines.BoxCount()))
+            assert layoutData == SaveBlockProcessing.GetAllCFRUBoxesData(saveImage)
+
+    def testRuns(self):
+        runs = SaveBlockProcessing.GetPCRuns(25)
+        assert [saveBlockNum for saveBlockNum, _, _ in runs] == VanillaBoxSaveSections + [30, 31, 2, 3, 0]
+        assert sum(length for _, _, length in runs) == 25 * MonsPerBox * CFRUCompressedPokemonSize
+        assert sum(length for _, _, length in SaveBlockProcessing.GetPCRuns(20)) == 20 * MonsPerBox * CFRUCompressedPokemonSize
+
+    def testRunsMatchAllBoxesData(self):
+        for saveName in ["flex", "magm"]:
+            saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/{saveName}.sav"))
+            Defines.LoadAll(fileSignature)
+            assert SaveBlockProcessing.GetCFRUPCData(saveImage) == SaveBlockProcessing.GetAllCFRUBoxesData(saveImage)[:Defines.BoxCount() * MonsPerBox * CFRUCompressedPokemonSize]
+
+    def testSlotSpans(self):
+        Defines.LoadAll(UNBOUND_2_1_FILE_SIGNATURE)
+        assert SaveBlockProcessing.GetPCSlotSpans(24, 0) == [(0, 0xB0, CFRUCompressedPokemonSize)]
+
+
+class TestLoadBoxPokemon:
+    def testMatchesLoadPCPokemon(self):
+        for saveName in ["flex", "magm"]:
+            saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/{saveName}.sav"))
+            Defines.LoadAll(fileSignature)
+            allPokemon = SaveBlockProcessing.LoadPCPokemon(saveImage)
+            for box in range(Defines.BoxCount()):
+                assert SaveBlockProcessing.LoadBoxPokemon(saveImage, box) == allPokemon[box * MonsPerBox:(box + 1) * MonsPerBox]
+
+    def testBoxOutOfRange(self):
+        saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/magm.sav"))
+        Defines.LoadAll(fileSignature)
+        assert SaveBlockProcessing.LoadBoxPokemon(saveImage, Defines.BoxCount()) == []
+        assert SaveBlockProcessing.LoadBoxPokemon(saveImage, -1) == []
+
+    def testBoxOutOfRangePartialRegion(self, monkeypatch):
+        saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/all_pokemon.sav"))
+        Defines.LoadAll(fileSignature)
+        monkeypatch.setattr(Defines, "BoxCount", lambda: 20)
+        assert len(SaveBlockProcessing.LoadBoxPokemon(saveImage, 19)) == MonsPerBox
+        assert SaveBlockProcessing.LoadBoxPokemon(saveImage, 20) == []  # Block 30 & 31 memory past the last box isn't read
+        assert SaveBlockProcessing.LoadBoxPokemon(saveImage, 21) == []
+        assert len(SaveBlockProcessing.LoadPCPokemon(saveImage)) == 20 * MonsPerBox
+
+    def testOnlyBoxBlockLoaded(self):
+        saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav"), lazy=True)
+        Defines.LoadAll(fileSignature)
+        SaveBlockProcessing.LoadBoxPokemon(saveImage, 24)
+        assert sorted(saveImage.uncheckedBlocks) == list(range(1, 13 + 1))  # Only block 0 was read
+
+
+class TestLoadSlotPokemon:
+    def testMatchesLoadPCPokemon(self):
+        saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/all_pokemon.sav"))
+        Defines.LoadAll(fileSignature)
+        allPokemon = SaveBlockProcessing.LoadPCPokemon(saveImage)
+        for box, slot in [(0, 0), (0, 29), (1, 10), (18, 29), (19, 0), (22, 0), (24, 29)]:
+            assert SaveBlockProcessing.LoadSlotPokemon(saveImage, box, slot) == allPokemon[box * MonsPerBox + slot]
+
+    def testSplitSlot(self):
+        saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/all_pokemon.sav"))
+        Defines.LoadAll(fileSignature)
+        allPokemon = SaveBlockProcessing.LoadPCPokemon(saveImage)
+        layout = SaveBlockProcessing.GetPCLayout(Defines.BoxCount())
+        splitSlots = [i for i, spans in enumerate(layout) if len(spans) == 2]
+        assert splitSlots != []
+        for i in splitSlots:
+            assert SaveBlockProcessing.LoadSlotPokemon(saveImage, i // MonsPerBox, i % MonsPerBox) == allPokemon[i]
+
+    def testOutOfRange(self):
+        saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/all_pokemon.sav"))
+        Defines.LoadAll(fileSignature)
+        for box, slot in [(Defines.BoxCount(), 0), (-1, 0), (0, MonsPerBox), (0, -1)]:
+            assert SaveBlockProcessing.LoadSlotPokemon(saveImage, box, slot) == {}
+
+
 class TestLoadCFRUBoxTitles:
     def testFlex(self):
         Defines.LoadAll(UNBOUND_2_1_FILE_SIGNATURE)
@@ -261,6 +378,83 @@ class TestVarGet:
         assert SaveBlockProcessing.VarGet(VAR_UNBOUND_KEYSTONE, saveBlocks) == 0x161
 
 
+class TestFlagTable:
+    def testMatchesFlagBytes(self):
+        saveBlocks, fileSignature = SaveBlocks.LoadAll(f"{SAVE_DIR}/flag_test/unbound_randomizers.sav")
+        Defines.LoadAll(fileSignature)
+        flagTable = SaveBlockProcessing.GetFlagTable(saveBlocks)
+        vanillaFlags = saveBlocks[VanillaFlagsASaveBlock][VanillaFlagsAOffset:VanillaFlagsAEndOffset] \
+                     + saveBlocks[VanillaFlagsBSaveBlock][VanillaFlagsBOffset:VanillaFlagsBEndOffset]
+        cfruFlags = saveBlocks[CFRUFlagsASaveBlock][CFRUFlagsAOffset:CFRUFlagsAEndOffset] \
+                  + saveBlocks[CFRUFlagsBSaveBlock][CFRUFlagsBOffset:CFRUFlagsBEndOffset]
+        for flag in range(0, CFRU_FLAGS_START):
+            assert flagTable.Get(flag) == ((vanillaFlags[flag // 8] >> (flag % 8)) & 1 == 1)
+        for flag in range(CFRU_FLAGS_START, CFRU_FLAGS_END):
+            assert flagTable.Get(flag) == ((cfruFlags[(flag - CFRU_FLAGS_START) // 8] >> (flag % 8)) & 1 == 1)
+
+    def testAnySet(self):
+        saveBlocks, fileSignature = SaveBlocks.LoadAll(f"{SAVE_DIR}/flag_test/unbound_randomizers.sav")
+        Defines.LoadAll(fileSignature)
+        flagTable = SaveBlockProcessing.GetFlagTable(saveBlocks)
+        assert flagTable.AnySet([FLAG_UNBOUND_NEW_GAME_PLUS, FLAG_UNBOUND_SPECIES_RANDOMIZER])
+        assert flagTable.AnySet([FLAG_FR_GAME_CLEAR, FLAG_UNBOUND_NEW_GAME_PLUS]) == flagTable.Get(FLAG_FR_GAME_CLEAR)
+        assert not flagTable.AnySet([])
+
+    def testFakeFlag(self):
+        saveBlocks, fileSignature = SaveBlocks.LoadAll(f"{SAVE_DIR}/magm.sav")
+        Defines.LoadAll(fileSignature)
+        with raises(ValueError):
+            SaveBlockProcessing.GetFlagTable(saveBlocks).AnySet([FLAG_FR_GAME_CLEAR, 0xFFFF])
+
+    def testMissingBlocks(self):
+        Defines.LoadAll(UNBOUND_2_1_FILE_SIGNATURE)
+        flagTable = SaveBlockProcessing.GetFlagTable({0: [0] * BlockDataSize, 4: [0xFF] * BlockDataSize})
+        assert flagTable.Get(FLAG_UNBOUND_NEW_GAME_PLUS)
+        with raises(ValueError):
+            flagTable.Get(FLAG_FR_GAME_CLEAR)
+
+    def testUnsupported(self):
+        flagTable = FlagTable(None, None, supported=False)
+        assert not flagTable.Get(FLAG_FR_GAME_CLEAR)
+        assert not flagTable.AnySet([0xFFFF])
+
+    def testDecodedOncePerSave(self):
+        saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav"))
+        Defines.LoadAll(fileSignature)
+        flagTable = SaveBlockProcessing.GetFlagTable(saveImage)
+        assert SaveBlockProcessing.GetFlagTable(saveImage) is flagTable
+        assert SaveBlockProcessing.GetVarTable(saveImage) is SaveBlockProcessing.GetVarTable(saveImage)
+
+    def testRedecodedAfterWrite(self):
+        saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav"))
+        Defines.LoadAll(fileSignature)
+        assert not SaveBlockProcessing.FlagGet(FLAG_UNBOUND_NEW_GAME_PLUS, saveImage)
+        flagOffset = CFRUFlagsBOffset + (FLAG_UNBOUND_NEW_GAME_PLUS - CFRU_FLAGS_START) // 8 - CFRUFlagsASize
+        saveImage.GetWritableBlock(CFRUFlagsBSaveBlock)[flagOffset] |= 1 << (FLAG_UNBOUND_NEW_GAME_PLUS % 8)
+        assert SaveBlockProcessing.FlagGet(FLAG_UNBOUND_NEW_GAME_PLUS, saveImage)
+
+
+class TestVarTable:
+    def testMatchesVarBytes(self):
+        saveBlocks, fileSignature = SaveBlocks.LoadAll(f"{SAVE_DIR}/flex.sav")
+        Defines.LoadAll(fileSignature)
+        varTable = SaveBlockProcessing.GetVarTable(saveBlocks)
+        vanillaVars = saveBlocks[VanillaVarsSaveBlock][VanillaVarsOffset:VanillaVarsEndOffset]
+        cfruVars = saveBlocks[CFRUVarsASaveBlock][CFRUVarsAOffset:CFRUVarsAEndOffset] \
+                 + saveBlocks[CFRUVarsBSaveBlock][CFRUVarsBOffset:CFRUVarsBEndOffset]
+        for var in range(VARS_START, VARS_START + 0x100):
+            assert varTable.Get(var) == BytesToInt(vanillaVars[(var - VARS_START) * 2:(var - VARS_START) * 2 + 2])
+        for var in range(CFRU_VARS_START, CFRU_VARS_END):
+            assert varTable.Get(var) == BytesToInt(cfruVars[(var - CFRU_VARS_START) * 2:(var - CFRU_VARS_START) * 2 + 2])
+
+    def testFakeVar(self):
+        with raises(ValueError):
+            VarTable(bytes(0x200), bytes(0x200)).Get(0x6000)
+
+    def testUnsupported(self):
+        assert VarTable(None, None, supported=False).Get(VAR_UNBOUND_MAIN_STORY) == -1
+
+
 class TestIsAccessibleCurrently:
     def testEmptySaveBlocks(self):
         assert not SaveBlockProcessing.IsAccessibleCurrently(dict())
@@ -301,6 +495,163 @@ class TestIsAccessibleCurrently:
         assert SaveBlockProcessing.IsAccessibleCurrently(saveBlocks)
 
 
+class TestLoadFromSaveBlockViews:
+    def testMatchesLists(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav")
+        saveBlockViews, fileSignature = SaveBlocks.LoadAllFromData(saveData)
+        saveBlocks, _ = SaveBlocks.LoadAll(f"{SAVE_DIR}/flex.sav")
+        Defines.LoadAll(fileSignature)
+        assert SaveBlockProcessing.LoadPCPokemon(saveBlockViews) == SaveBlockProcessing.LoadPCPokemon(saveBlocks)
+        assert SaveBlockProcessing.LoadCFRUBoxTitles(saveBlockViews) == SaveBlockProcessing.LoadCFRUBoxTitles(saveBlocks)
+        assert SaveBlockProcessing.LoadPokedexFlags(saveBlockViews) == SaveBlockProcessing.LoadPokedexFlags(saveBlocks)
+        assert SaveBlockProcessing.LoadCFRUTrainerDetails(saveBlockViews) == SaveBlockProcessing.LoadCFRUTrainerDetails(saveBlocks)
+        assert SaveBlockProcessing.FlagGet(FLAG_FR_GAME_CLEAR, saveBlockViews)
+        assert SaveBlockProcessing.VarGet(VAR_UNBOUND_MAIN_STORY, saveBlockViews) == 0x56
+        assert SaveBlockProcessing.VarGet(VAR_UNBOUND_HEALING_MAP, saveBlockViews) == 0x21
+
+
+class TestLazyBlocks:
+    def testChecksDontLoadPC(self):
+        for saveName in ["flex", "cfre_egglocke", "flag_test/unbound_randomizers"]:
+            saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/{saveName}.sav"), lazy=True)
+            Defines.LoadAll(fileSignature)
+            SaveBlockProcessing.IsRandomizedSave(saveImage)
+            SaveBlockProcessing.LoadCFRUTrainerDetails(saveImage)
+            assert set(VanillaBoxSaveSections[:-1]) <= set(saveImage.uncheckedBlocks), saveName  # Block 13 also has vars
+
+    def testLoadPCLoadsBoxBlocks(self):
+        saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav"), lazy=True)
+        Defines.LoadAll(fileSignature)
+        SaveBlockProcessing.LoadPCPokemon(saveImage)
+        assert not set(VanillaBoxSaveSections) & set(saveImage.uncheckedBlocks)
+
+    def testMatchesFullLoad(self):
+        for saveName in ["flex", "all_pokemon", "magm", "single_save"]:
+            saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/{saveName}.sav")
+            saveImage, fileSignature = SaveBlocks.LoadAllFromData(saveData)
+            lazySaveImage, lazyFileSignature = SaveBlocks.LoadAllFromData(saveData, lazy=True)
+            Defines.LoadAll(fileSignature)
+            assert lazyFileSignature == fileSignature, saveName
+            assert SaveBlockProcessing.LoadPCPokemon(lazySaveImage) == SaveBlockProcessing.LoadPCPokemon(saveImage), saveName
+            assert SaveBlockProcessing.GetSaveStatus(lazySaveImage) == SaveBlockProcessing.GetSaveStatus(saveImage), saveName
+
+
+class TestSaveMemorySubset:
+    def testWithinBlock(self):
+        saveBlocks = {1: [0] * BlockDataSize}
+        SaveBlockProcessing.SaveMemorySubset(saveBlocks, 1, [1, 2, 3], 0x10, 3)
+        assert saveBlocks[1][0xF:0x14] == [0, 1, 2, 3, 0]
+        assert len(saveBlocks[1]) == BlockDataSize
+
+    def testWrapsToNextBlock(self):
+        saveBlocks = {30: [0] * BlockDataSize, 31: [0] * BlockDataSize}
+        memToSave = list(range(1, 11))
+        SaveBlockProcessing.SaveMemorySubset(saveBlocks, 30, memToSave, BlockDataSize - 4, len(memToSave))
+        assert saveBlocks[30][-4:] == [1, 2, 3, 4]
+        assert saveBlocks[31][StartingBoxMemoryOffsets[31]:StartingBoxMemoryOffsets[31] + 6] == [5, 6, 7, 8, 9, 10]
+
+    def testWrapsToBoxMemoryOffset(self):
+        saveBlocks = {2: [0] * BlockDataSize, 3: [0] * BlockDataSize}
+        SaveBlockProcessing.SaveMemorySubset(saveBlocks, 2, [7] * 0x100, StartingBoxMemoryOffsets[2], 0x100)
+        assert saveBlocks[2][StartingBoxMemoryOffsets[2]:] == [7] * (BlockDataSize - StartingBoxMemoryOffsets[2])
+        assert saveBlocks[3][:0x100 - (BlockDataSize - StartingBoxMemoryOffsets[2])] == [7] * 0x28
+
+    def testSaveImage(self):
+        saveImage, _ = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav"))
+        saveBlocks = {blockId: list(saveImage[blockId]) for blockId in saveImage}
+        memToSave = [0xAB] * (BlockDataSize * 2)
+        SaveBlockProcessing.SaveMemorySubset(saveImage, 5, memToSave, StartingBoxMemoryOffsets[5], len(memToSave))
+        SaveBlockProcessing.SaveMemorySubset(saveBlocks, 5, memToSave, StartingBoxMemoryOffsets[5], len(memToSave))
+        assert {blockId: list(saveImage[blockId]) for blockId in saveImage} == saveBlocks
+        assert saveImage.dirtyBlocks == {5, 6, 7}
+
+
+class TestDirtyBlocks:
+    def testMoveMonWithinFirstBox(self):
+        saveImage = LoadReencodedSaveImage("flex")
+        allPokemon = SaveBlockProcessing.LoadPCPokemon(saveImage)
+        allPokemon[0], allPokemon[1] = allPokemon[1], allPokemon[0]
+        newSaveImage = SaveBlockProcessing.UpdateCFRUBoxData(saveImage, allPokemon)
+        assert newSaveImage.dirtyBlocks == {5}  # Box 1 is entirely within block 5
+        assert list(newSaveImage.modifiedBlocks) == [5]  # Only the written block was copied
+        assert saveImage.DirtyBlockCount() == 0  # Original wasn't modified
+        assert SaveBlockProcessing.LoadPCPokemon(saveImage) != allPokemon
+
+    def testNoChanges(self):
+        saveImage = LoadReencodedSaveImage("flex")
+        allPokemon = SaveBlockProcessing.LoadPCPokemon(saveImage)
+        seenFlags, caughtFlags = SaveBlockProcessing.LoadPokedexFlags(saveImage)
+        newSaveImage = SaveBlockProcessing.UpdateCFRUBoxData(saveImage, allPokemon)
+        newSaveImage = SaveBlockProcessing.UpdatePokedexFlags(newSaveImage, seenFlags, caughtFlags)
+        assert newSaveImage.DirtyBlockCount() == 0
+
+    def testPokedexFlagsChanged(self):
+        saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/ng+.sav"))
+        Defines.LoadAll(fileSignature)
+        seenFlags, caughtFlags = SaveBlockProcessing.LoadPokedexFlags(saveImage)
+        caughtFlags[0] |= 1
+        newSaveImage = SaveBlockProcessing.UpdatePokedexFlags(saveImage, seenFlags, caughtFlags)
+        assert newSaveImage.dirtyBlocks == {CFRUPokedexFlagsSaveBlock}
+
+
+
+class TestUpdateCFRUBoxData:
+    def testTooFewPokemon(self):
+        saveImage = LoadReencodedSaveImage("flex")
+        allPokemon = SaveBlockProcessing.LoadPCPokemon(saveImage)
+        allPokemon[0], allPokemon[1] = allPokemon[1], allPokemon[0]
+        with raises(ValueError):
+            SaveBlockProcessing.UpdateCFRUBoxData(saveImage, allPokemon[:-1])
+
+    def testShortDataNotWritten(self):
+        saveImage = LoadReencodedSaveImage("flex")
+        runs = SaveBlockProcessing.GetPCRuns(Defines.BoxCount())
+        with raises(ValueError):
+            SaveBlockProcessing.SaveSpans(saveImage, runs, bytes(sum(length for _, _, length in runs) - 1))
+        assert saveImage.DirtyBlockCount() == 0  # Nothing was written before the error
+    def testMatchesFullUpdate(self):
+        saveImage = LoadReencodedSaveImage("all_pokemon")
+        allPokemon = SaveBlockProcessing.LoadPCPokemon(saveImage)
+        splitSlot = next(i for i, spans in enumerate(SaveBlockProcessing.GetPCLayout(Defines.BoxCount())) if len(spans) == 2)
+        edits = [(0, 0, allPokemon[1]), (0, 1, allPokemon[0]), (splitSlot // MonsPerBox, splitSlot % MonsPerBox, allPokemon[0]),
+                 (24, 29, BLANK_TEST_POKEMON_CONVERTED)]
+        for box, slot, pokemonData in edits:
+            allPokemon[box * MonsPerBox + slot] = pokemonData
+
+        fullSaveImage = SaveBlockProcessing.UpdateCFRUBoxData(saveImage, allPokemon)
+        slotsSaveImage = SaveBlockProcessing.UpdateCFRUSlots(saveImage, edits)
+        assert {blockId: bytes(slotsSaveImage[blockId]) for blockId in slotsSaveImage} == \
+               {blockId: bytes(fullSaveImage[blockId]) for blockId in fullSaveImage}
+        assert slotsSaveImage.dirtyBlocks == fullSaveImage.dirtyBlocks
+        assert saveImage.DirtyBlockCount() == 0  # Original wasn't modified
+
+    def testOnlyEditedBlocksWritten(self):
+        saveImage = LoadReencodedSaveImage("flex")
+        newSaveImage = SaveBlockProcessing.UpdateCFRUSlots(saveImage, [(24, 0, SaveBlockProcessing.LoadSlotPokemon(saveImage, 0, 0))])
+        assert newSaveImage.dirtyBlocks == {0}
+        assert SaveBlockProcessing.LoadSlotPokemon(newSaveImage, 24, 0) == SaveBlockProcessing.LoadSlotPokemon(saveImage, 0, 0)
+
+    def testNoEdits(self):
+        saveImage = LoadReencodedSaveImage("flex")
+        assert SaveBlockProcessing.UpdateCFRUSlots(saveImage, []).DirtyBlockCount() == 0
+
+    def testInvalidSlot(self):
+        saveImage = LoadReencodedSaveImage("flex")
+        for box, slot in [(-1, 0), (Defines.BoxCount(), 0), (0, -1), (0, MonsPerBox)]:
+            with raises(ValueError):
+                SaveBlockProcessing.UpdateCFRUSlots(saveImage, [(box, slot, BLANK_TEST_POKEMON_CONVERTED)])
+
+
+def LoadReencodedSaveImage(saveName: str) -> SaveImage:
+    # Saves straight from the game don't always match what the site writes back, so write it once first
+    saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/{saveName}.sav")
+    saveImage, fileSignature = SaveBlocks.LoadAllFromData(saveData)
+    Defines.LoadAll(fileSignature)
+    saveImage = SaveBlockProcessing.UpdateCFRUBoxData(saveImage, SaveBlockProcessing.LoadPCPokemon(saveImage))
+    saveImage, _ = SaveBlocks.LoadAllFromData(SaveBlocks.ReplaceAllInData(saveData, saveImage))
+    return saveImage
+
+
 def CalcFlagCount(flagList):
     counter = 0
     flags = [False] * 9999
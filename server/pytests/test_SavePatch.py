@@ -0,0 +1,93 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "src"))  # Needed for sub-imports
+
+from src.SavePatch import *
+from src.SaveBlocks import *
+from src.SaveBlockProcessing import *
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+SAVE_DIR = os.path.join(DATA_DIR, "saves")
+
+
+def UpdateSaveData(saveName: str) -> tuple:
+    saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/{saveName}.sav")
+    saveImage, fileSignature = SaveBlocks.LoadAllFromData(saveData)
+    Defines.LoadAll(fileSignature)
+    allPokemon = SaveBlockProcessing.LoadPCPokemon(saveImage)
+    allPokemon[0], allPokemon[1] = allPokemon[1], allPokemon[0]
+    newSaveImage = SaveBlockProcessing.UpdateCFRUBoxData(saveImage, allPokemon)
+    return saveData, SaveBlocks.ReplaceAllInData(saveData, newSaveImage)
+
+
+class TestFindChangedRanges:
+    def testNoChanges(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav")
+        assert SavePatch.FindChangedRanges(saveData, saveData) == []
+
+    def testSeparateRanges(self):
+        originalData = bytes(0x2000)
+        newData = bytearray(originalData)
+        newData[0x10] = 1
+        newData[0x1800:0x1804] = b"\x01\x02\x03\x04"
+        assert SavePatch.FindChangedRanges(originalData, newData) == [(0x10, 1), (0x1800, 4)]
+
+    def testCloseRangesMerged(self):
+        originalData = bytes(0x100)
+        newData = bytearray(originalData)
+        newData[0x10] = 1
+        newData[0x10 + MaxRangeGap] = 1
+        assert SavePatch.FindChangedRanges(originalData, newData) == [(0x10, MaxRangeGap + 1)]
+
+    def testRangesAcrossBlocks(self):
+        originalData = bytes(BlockSize * 2)
+        newData = bytearray(originalData)
+        newData[BlockSize - 1:BlockSize + 1] = b"\x01\x01"
+        assert SavePatch.FindChangedRanges(originalData, newData) == [(BlockSize - 1, 2)]
+
+    def testLongerNewData(self):
+        assert SavePatch.FindChangedRanges(bytes(0x20), bytes(0x30)) == [(0x20, 0x10)]
+
+
+class TestCreate:
+    def testNoChanges(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav")
+        assert len(SavePatch.Create(saveData, saveData)) == PatchHeaderStruct.size
+
+    def testUpdatedSave(self):
+        originalData, newData = UpdateSaveData("flex")
+        assert originalData != newData
+        patch = SavePatch.Create(originalData, newData)
+        assert len(patch) < len(newData) // 16  # Only the moved Pokemon and the checksums
+        assert SavePatch.Apply(originalData, patch) == newData
+        assert SavePatch.Verify(originalData, newData, patch)
+
+
+class TestApply:
+    def testWrongOriginal(self):
+        originalData, newData = UpdateSaveData("flex")
+        patch = SavePatch.Create(originalData, newData)
+        assert SavePatch.Apply(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/ng+.sav"), patch) == b""
+
+    def testCorruptedPatch(self):
+        originalData, newData = UpdateSaveData("flex")
+        patch = bytearray(SavePatch.Create(originalData, newData))
+        patch[-1] ^= 0xFF
+        assert SavePatch.Apply(originalData, patch) == b""
+        assert not SavePatch.Verify(originalData, newData, patch)
+
+    def testTruncatedPatch(self):
+        originalData, newData = UpdateSaveData("flex")
+        patch = SavePatch.Create(originalData, newData)
+        assert SavePatch.Apply(originalData, patch[:-1]) == b""
+        assert SavePatch.Apply(originalData, patch[:PatchHeaderStruct.size - 1]) == b""
+
+    def testNotAPatch(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav")
+        assert SavePatch.Apply(saveData, saveData) == b""
+
+    def testSizeChange(self):
+        originalData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flashcart.sav")
+        newData = originalData[:0x20000]
+        patch = SavePatch.Create(originalData, newData)
+        assert SavePatch.Apply(originalData, patch) == newData
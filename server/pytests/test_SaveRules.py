@@ -0,0 +1,140 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "src"))  # Needed for sub-imports
+
+from src.Defines import *
+from src.SaveBlocks import *
+from src.SaveBlockProcessing import *
+from src.SaveRules import *
+from src.SaveTables import *
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+SAVE_DIR = os.path.join(DATA_DIR, "saves")
+RULE_SAVES = ["flex", "magm", "ng+", "inflamed_red", "cfre_egglocke", "gs_chronicles_2.7.1",
+              "flag_test/magm_before_pc", "flag_test/unbound_easy_puzzles", "flag_test/unbound_hard_puzzles", "flag_test/unbound_randomizers"]
+
+
+def CreateFlagTable(setFlags: list) -> FlagTable:
+    vanillaFlags, cfruFlags = bytearray(0x120), bytearray(0x200)
+    for flag in setFlags:
+        if flag < CFRU_FLAGS_START:
+            vanillaFlags[flag // 8] |= 1 << (flag % 8)
+        else:
+            cfruFlags[(flag - CFRU_FLAGS_START) // 8] |= 1 << (flag % 8)
+
+    return FlagTable(bytes(vanillaFlags), bytes(cfruFlags))
+
+
+def CreateVarTable(varValues: dict) -> VarTable:
+    cfruVars = bytearray(0x200)
+    for var, value in varValues.items():
+        cfruVars[(var - CFRU_VARS_START) * 2:(var - CFRU_VARS_START) * 2 + 2] = value.to_bytes(2, "little")
+
+    return VarTable(bytes(0x200), bytes(cfruVars))
+
+
+def InterpretInaccessibleConditions(conditions: list, flags: FlagTable, vars: VarTable) -> str:
+    # The conditions read directly, as they were before being compiled
+    for condition in conditions:
+        if "butNotIfFlagSet" in condition:
+            skipFlags = condition["butNotIfFlagSet"]
+            if any(flags.Get(flag) for flag in (skipFlags if type(skipFlags) == list else [skipFlags])):
+                continue
+
+        if "flagSet" in condition and flags.Get(condition["flagSet"]):
+            return condition["reason"]
+        elif "flagNotSet" in condition and not flags.Get(condition["flagNotSet"]):
+            return condition["reason"]
+        elif "varSetTo" in condition and vars.Get(condition["varSetTo"][0]) == condition["varSetTo"][1]:
+            return condition["reason"]
+        elif "varNotSetTo" in condition and vars.Get(condition["varNotSetTo"][0]) != condition["varNotSetTo"][1]:
+            return condition["reason"]
+
+    return ""
+
+
+class TestInaccessibleRule:
+    def testFlagSet(self):
+        rule = InaccessibleRule({"flagSet": FLAG_UNBOUND_SANDBOX_MODE, "reason": "Sandbox"})
+        assert rule.GetReason(CreateFlagTable([FLAG_UNBOUND_SANDBOX_MODE]), CreateVarTable({})) == "Sandbox"
+        assert rule.GetReason(CreateFlagTable([]), CreateVarTable({})) == ""
+
+    def testFlagNotSet(self):
+        rule = InaccessibleRule({"flagNotSet": FLAG_MAGM_PC_ACCESSED, "reason": "No PC"})
+        assert rule.GetReason(CreateFlagTable([]), CreateVarTable({})) == "No PC"
+        assert rule.GetReason(CreateFlagTable([FLAG_MAGM_PC_ACCESSED]), CreateVarTable({})) == ""
+
+    def testVarSetTo(self):
+        rule = InaccessibleRule({"varSetTo": (VAR_UNBOUND_GAME_DIFFICULTY, INSANE_DIFFICULTY_UNBOUND), "reason": "Insane"})
+        assert rule.GetReason(CreateFlagTable([]), CreateVarTable({VAR_UNBOUND_GAME_DIFFICULTY: INSANE_DIFFICULTY_UNBOUND})) == "Insane"
+        assert rule.GetReason(CreateFlagTable([]), CreateVarTable({VAR_UNBOUND_GAME_DIFFICULTY: 1})) == ""
+
+    def testVarNotSetTo(self):
+        rule = InaccessibleRule({"varNotSetTo": (VAR_UNBOUND_GAME_DIFFICULTY, 1), "reason": "Not 1"})
+        assert rule.GetReason(CreateFlagTable([]), CreateVarTable({VAR_UNBOUND_GAME_DIFFICULTY: 2})) == "Not 1"
+        assert rule.GetReason(CreateFlagTable([]), CreateVarTable({VAR_UNBOUND_GAME_DIFFICULTY: 1})) == ""
+
+    def testButNotIfFlagSet(self):
+        rule = InaccessibleRule({"flagSet": FLAG_UNBOUND_SANDBOX_MODE, "butNotIfFlagSet": FLAG_FR_GAME_CLEAR, "reason": "Sandbox"})
+        assert rule.GetReason(CreateFlagTable([FLAG_UNBOUND_SANDBOX_MODE, FLAG_FR_GAME_CLEAR]), CreateVarTable({})) == ""
+
+    def testButNotIfAnyFlagSet(self):
+        rule = InaccessibleRule({"flagSet": FLAG_UNBOUND_SANDBOX_MODE, "butNotIfFlagSet": [FLAG_FR_GAME_CLEAR, FLAG_UNBOUND_NEW_GAME_PLUS],
+                                 "reason": "Sandbox"})
+        assert rule.GetReason(CreateFlagTable([FLAG_UNBOUND_SANDBOX_MODE, FLAG_UNBOUND_NEW_GAME_PLUS]), CreateVarTable({})) == ""
+        assert rule.GetReason(CreateFlagTable([FLAG_UNBOUND_SANDBOX_MODE]), CreateVarTable({})) == "Sandbox"
+
+    def testNoTest(self):
+        rule = InaccessibleRule({"butNotIfFlagSet": FLAG_FR_GAME_CLEAR, "reason": "Never"})
+        assert rule.GetReason(CreateFlagTable([]), CreateVarTable({})) == ""
+
+
+class TestSaveRules:
+    def testCompiledWhenDefinesLoaded(self):
+        Defines.LoadAll(UNBOUND_FILE_SIGNATURE)
+        assert Defines.saveRules.fileSignature == UNBOUND_FILE_SIGNATURE
+        assert Defines.GetSaveRules() is Defines.saveRules
+        assert len(Defines.saveRules.inaccessibleRules) == len(Defines.GetInaccessibleConditions())
+
+    def testMatchesConditionsForEveryGame(self):
+        flagSets = [[], [FLAG_FR_GAME_CLEAR], [FLAG_UNBOUND_SANDBOX_MODE], [FLAG_UNBOUND_SANDBOX_MODE, FLAG_FR_GAME_CLEAR],
+                    [FLAG_UNBOUND_SANDBOX_POSTGAME_WITH_NO_CLOUD], [FLAG_MAGM_PC_ACCESSED], [FLAG_FR_SYS_PC_BILL],
+                    [FLAG_IR_SANDBOX_MODE], [FLAG_UNBOUND_NEW_GAME_PLUS]]
+        varSets = [{}, {VAR_UNBOUND_GAME_DIFFICULTY: INSANE_DIFFICULTY_UNBOUND}]
+        for fileSignature, gameDetails in GameDetails.items():
+            if not gameDetails["cfru"]:
+                continue
+
+            saveRules = SaveRules(fileSignature, gameDetails)
+            for setFlags in flagSets:
+                for varValues in varSets:
+                    flags, vars = CreateFlagTable(setFlags), CreateVarTable(varValues)
+                    randomizer, reason = saveRules.Evaluate(flags, vars)
+                    assert reason == InterpretInaccessibleConditions(gameDetails.get("inaccessible", []), flags, vars)
+                    assert randomizer == any(flags.Get(flag) for flag in gameDetails.get("randomizerFlags", []))
+
+    def testRandomizerFlags(self):
+        saveRules = SaveRules(UNBOUND_FILE_SIGNATURE, GameDetails[UNBOUND_FILE_SIGNATURE])
+        assert saveRules.IsRandomized(CreateFlagTable([FLAG_UNBOUND_LEARNSET_RANDOMIZER]))
+        assert not saveRules.IsRandomized(CreateFlagTable([FLAG_CFRU_LEARNSET_RANDOMIZER]))
+
+    def testNoRandomizerFlags(self):
+        saveRules = SaveRules(MAGM_FILE_SIGNATURE, GameDetails[MAGM_FILE_SIGNATURE])
+        assert not saveRules.IsRandomized(CreateFlagTable([FLAG_CFRU_SPECIES_RANDOMIZER]))
+
+
+class TestGetSaveStatus:
+    def testMatchesSeparateChecks(self):
+        for saveName in RULE_SAVES:
+            saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/{saveName}.sav"))
+            Defines.LoadAll(fileSignature)
+            assert SaveBlockProcessing.GetSaveStatus(saveImage) == (SaveBlockProcessing.IsRandomizedSave(saveImage),
+                                                                    SaveBlockProcessing.GetInaccessibleReason(saveImage)), saveName
+
+    def testInaccessibleSave(self):
+        saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flag_test/magm_before_pc.sav"))
+        Defines.LoadAll(fileSignature)
+        assert SaveBlockProcessing.GetSaveStatus(saveImage) == (False, "The PC has never been accessed.")
+
+    def testEmptySaveBlocks(self):
+        assert SaveBlockProcessing.GetSaveStatus({}) == (False, "Saveblocks are empty.")
@@ -1,4 +1,5 @@
-import os, sys, json, shutil
+import os, sys, copy, json, shutil
+from pytest import raises
 sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "src"))  # Needed for sub-imports
 
@@ -36,6 +37,20 @@ class TestValidate:
         assert not SaveBlocks.Validate(f"{SAVE_DIR}/single_save_corrupt_save_2.sav")
 
 
+class TestValidateData:
+    def testEmptyData(self):
+        assert not SaveBlocks.ValidateData(b"")
+
+    def testValidSaveData(self):
+        assert SaveBlocks.ValidateData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/all_pokemon.sav"))
+
+    def testFlashcartSaveData(self):
+        assert SaveBlocks.ValidateData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flashcart.sav"))
+
+    def testCorruptedSaveData(self):
+        assert not SaveBlocks.ValidateData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/single_save_corrupt_save_1.sav"))
+
+
 class TestValidateSave:
     def testValidSave1(self):
         with open(f"{SAVE_DIR}/all_pokemon.sav", "rb") as binaryFile:
@@ -76,6 +91,46 @@ class TestValidateSave:
             assert SaveBlocks.ValidateSave(binaryFile, SaveSize, SaveSize * 2)  # Save 2 should still be valid
 
 
+class TestLoadFooterTable:
+    def testEveryBlockInFile(self):
+        footers = SaveBlocks.LoadFooterTable(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/all_pokemon.sav"))
+        assert len(footers) == FileBlockCount
+
+    def testMatchesFooterBytes(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/all_pokemon.sav")
+        footers = SaveBlocks.LoadFooterTable(saveData)
+        for fileBlock, (blockId, checksum, fileSignature, saveIndex) in enumerate(footers):
+            offset = fileBlock * BlockSize
+            assert blockId == int.from_bytes(saveData[offset + BlockIdOffset:offset + BlockIdOffset + 2], "little")
+            assert checksum == int.from_bytes(saveData[offset + ChecksumOffset:offset + ChecksumOffset + 2], "little")
+            assert fileSignature == int.from_bytes(saveData[offset + FileSignatureOffset:offset + FileSignatureOffset + 4], "little")
+            assert saveIndex == int.from_bytes(saveData[offset + SaveIndexOffset:offset + SaveIndexOffset + 4], "little")
+
+    def testUsesSaveIndexA(self):
+        footers = SaveBlocks.LoadFooterTable(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/single_save.sav"))
+        assert SaveBlocks.UsesSaveIndexA(footers) == (footers[BlocksPerSave][2] == 0xFFFFFFFF)
+
+
+class TestValidateSaveFooters:
+    def testValidFooters(self):
+        footers = SaveBlocks.LoadFooterTable(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/all_pokemon.sav"))
+        assert SaveBlocks.ValidateSaveFooters(footers, 0)
+        assert SaveBlocks.ValidateSaveFooters(footers, BlocksPerSave)
+
+    def testInvalidFootersRejectedWithoutChecksums(self):
+        for saveName in ["invalid_block_id", "duplicate_block_id", "mismatched_file_signature", "invalid_file_signature", "mismatched_save_index"]:
+            footers = SaveBlocks.LoadFooterTable(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/{saveName}.sav"))
+            assert not SaveBlocks.ValidateSaveFooters(footers, 0), saveName
+            assert SaveBlocks.ValidateSaveFooters(footers, BlocksPerSave), saveName  # Save 2 should still be valid
+
+    def testInvalidChecksumOnlyCaughtByChecksums(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/invalid_checksum.sav")
+        footers = SaveBlocks.LoadFooterTable(saveData)
+        assert SaveBlocks.ValidateSaveFooters(footers, 0)
+        assert not SaveBlocks.ValidateSaveChecksums(saveData, footers, 0)
+        assert SaveBlocks.ValidateSaveChecksums(saveData, footers, BlocksPerSave)
+
+
 class TestValidateChecksum:
     def testCFRUBlock0(self):
         with open(f"{SAVE_DIR}/flex.sav", "rb") as binaryFile:
@@ -105,6 +160,43 @@ class TestValidateChecksum:
         assert SaveBlocks.CalculateChecksum(saveBlockData, 2) == 0
 
 
+    def testViewOfBlock(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav")
+        assert SaveBlocks.CalculateChecksum(memoryview(saveData)[BlockSize * 13:BlockSize * 13 + BlockDataSize], 13) == 0x807A
+
+    def testOverflowingBlock(self):
+        saveBlockData = [0xFF] * BlockDataSize
+        assert SaveBlocks.CalculateChecksum(saveBlockData, 2) == 0xFC03
+
+
+class TestCalculateChecksums:
+    def testFlexBlocks(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav")
+        blocks = [(BlockSize * 0, 0), (BlockSize * 1, 1), (BlockSize * 4, 4), (BlockSize * 13, 13)]
+        assert SaveBlocks.CalculateChecksums(saveData, blocks) == [0xBC86, 0xA848, 0x5120, 0x807A]
+
+    def testMatchesSingleChecksums(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/all_pokemon.sav")
+        blocks = [(offset, BytesToInt(saveData[offset + BlockIdOffset:offset + BlockIdOffset + 2])) for offset in range(0, SaveSize * 2, BlockSize)]
+        checksums = SaveBlocks.CalculateChecksums(saveData, blocks)
+        assert checksums == [SaveBlocks.CalculateChecksum(list(saveData[offset:offset + BlockDataSize]), blockId) for offset, blockId in blocks]
+        assert checksums == [BytesToInt(saveData[offset + ChecksumOffset:offset + ChecksumOffset + 2]) for offset, _ in blocks]
+
+    def testNoBlocks(self):
+        assert SaveBlocks.CalculateChecksums(b"", []) == []
+
+    def testSplitRuns(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flashcart.sav")
+        blocks = [(BlockSize * 31, 31), (BlockSize * 3, 0), (BlockSize * 4, 13), (BlockSize * 5, 4), (BlockSize * 9, 5), (BlockSize * 30, 30)]
+        assert SaveBlocks.CalculateChecksums(saveData, blocks) == \
+               [SaveBlocks.CalculateChecksumAtOffset(saveData, offset, blockId) for offset, blockId in blocks]
+
+    def testBlockWithoutFooter(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav")[:BlockSize + BlockDataSize]
+        blocks = [(0, 0), (BlockSize, 1)]
+        assert SaveBlocks.CalculateChecksums(saveData, blocks) == [0xBC86, 0xA848]
+
+
 class TestCreateBlankDict:
     def testCorrectOutput(self):
         assert SaveBlocks.CreateBlankDict() == {0: [], 1: [], 2: [], 3: [], 4: [], 5: [], 6: [], 7: [], 8: [], 9: [], 10: [], 11: [], 12: [], 13: [], 30: [], 31: []}
@@ -138,12 +230,160 @@ class TestLoadAll:
             contents = json.loads(contentsJSON)
             assert contents == json.load(file)
 
+    def testErasedSaveWithSaveIndex(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/single_save.sav")
+        erasedSaveData = bytearray(saveData)
+        for fileBlock in range(BlocksPerSave):  # Save 1's file signature is erased but its save index is higher than save 2's
+            offset = fileBlock * BlockSize + SaveIndexOffset
+            erasedSaveData[offset:offset + 4] = (5).to_bytes(4, "little")
+
+        contents, fileSignature = SaveBlocks.LoadAllFromData(erasedSaveData)
+        originalContents, originalFileSignature = SaveBlocks.LoadAllFromData(saveData)
+        assert fileSignature == originalFileSignature
+        assert contents.blockOffsets == originalContents.blockOffsets  # Save 2 is still the one used
+        assert SaveBlocks.ReplaceAllInData(erasedSaveData, contents) == erasedSaveData
+
+    def testMissingBlockId(self):
+        saveData = bytearray(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/single_save.sav"))
+        for fileBlock in range(BlocksPerSave, BlocksPerSave * 2):
+            offset = fileBlock * BlockSize + BlockIdOffset
+            if BytesToInt(saveData[offset:offset + 2]) == 5:
+                saveData[offset:offset + 2] = (30).to_bytes(2, "little")  # Same checksum size so the save is still valid
+        assert SaveBlocks.ValidateData(saveData)
+        assert SaveBlocks.LoadAllFromData(saveData) == [{}, 0]
+
     def testOldVersionSave(self):
         contents, fileSignature = SaveBlocks.LoadAll(f"{SAVE_DIR}/old_unbound_version.sav")
         assert fileSignature == UNBOUND_2_0_FILE_SIGNATURE
         assert len(contents) == 0
 
 
+class TestReadSaveFile:
+    def testFakePath(self):
+        assert SaveBlocks.ReadSaveFile("fake_path") == b""
+
+    def testEntireFileRead(self):
+        assert len(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav")) == 0x20000
+
+
+class TestLoadAllFromData:
+    def testEmptyData(self):
+        assert SaveBlocks.LoadAllFromData(b"") == [{}, 0]
+
+    def testMatchesLoadAll(self):
+        for saveName in ["flex", "single_save", "single_save_2", "flashcart", "mismatched_file_signature"]:
+            saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/{saveName}.sav")
+            contents, fileSignature = SaveBlocks.LoadAllFromData(saveData)
+            loadAllContents, loadAllFileSignature = SaveBlocks.LoadAll(f"{SAVE_DIR}/{saveName}.sav")
+            assert fileSignature == loadAllFileSignature
+            assert {blockId: list(contents[blockId]) for blockId in contents} == loadAllContents
+
+    def testBlocksAreViews(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav")
+        contents, _ = SaveBlocks.LoadAllFromData(saveData)
+        assert all(type(contents[blockId]) == memoryview for blockId in contents)
+        assert all(contents[blockId].obj is contents.data for blockId in contents)  # No copies of the blocks were made
+
+    def testOldVersionSave(self):
+        contents, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/old_unbound_version.sav"))
+        assert fileSignature == UNBOUND_2_0_FILE_SIGNATURE
+        assert len(contents) == 0
+
+
+class TestSaveImage:
+    def testBlockIds(self):
+        saveImage, _ = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/ng+.sav"))
+        assert list(saveImage.keys()) == SaveBlockNumbers
+        assert len(saveImage) == len(SaveBlockNumbers)
+        assert 13 in saveImage and 14 not in saveImage
+
+    def testBlockOffsets(self):
+        saveImage, _ = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/ng+.sav"))
+        assert saveImage.blockOffsets[12] == BlockSize * 8  # Save 1 is the most recent save
+        assert saveImage.blockOffsets[30] == BlockSize * 30
+        assert saveImage.blockOffsets[31] == BlockSize * 31
+        for blockId in SaveBlockNumbers[:-2]:
+            offset = saveImage.blockOffsets[blockId]
+            assert BytesToInt(saveImage.data[offset + BlockIdOffset:offset + BlockIdOffset + 2]) == blockId
+
+    def testBlocksReadOnly(self):
+        saveImage, _ = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav"))
+        with raises(TypeError):
+            saveImage[5][4] = 0
+
+    def testWritableBlock(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav")
+        saveImage, _ = SaveBlocks.LoadAllFromData(saveData)
+        saveImage.GetWritableBlock(5)[4:8] = b"\x01\x02\x03\x04"
+        assert saveImage[5][4:8] == b"\x01\x02\x03\x04"
+        assert saveImage.data == saveData  # Loaded save is untouched
+        assert saveImage.GetOriginalBlock(5)[4:8] != b"\x01\x02\x03\x04"
+        assert saveImage.dirtyBlocks == {5}
+        assert list(saveImage.modifiedBlocks) == [5]  # No other blocks were copied
+
+    def testRollback(self):
+        saveImage, _ = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav"))
+        originalBlock = bytes(saveImage[5])
+        saveImage.GetWritableBlock(5)[4] ^= 0xFF
+        saveImage.Rollback()
+        assert bytes(saveImage[5]) == originalBlock
+        assert saveImage.DirtyBlockCount() == 0
+
+    def testChecksumsAlreadyChecked(self):
+        saveImage, _ = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav"))
+        assert saveImage.uncheckedBlocks == {}
+
+    def testLazyChecksums(self):
+        saveImage, _ = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav"), lazy=True)
+        assert sorted(saveImage.uncheckedBlocks) == list(range(0, 13 + 1))
+        saveImage[13]
+        saveImage.GetWritableBlock(5)
+        assert sorted(saveImage.uncheckedBlocks) == [blockId for blockId in range(0, 13 + 1) if blockId not in [5, 13]]
+
+    def testLazyInvalidChecksum(self):
+        saveData = bytearray(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/ng+.sav"))
+        saveImage, _ = SaveBlocks.LoadAllFromData(saveData)
+        saveData[saveImage.blockOffsets[5]] ^= 0xFF
+        assert SaveBlocks.LoadAllFromData(saveData) == [{}, 0]
+
+        saveImage, fileSignature = SaveBlocks.LoadAllFromData(saveData, lazy=True)
+        assert fileSignature != 0
+        saveImage[6]  # Other blocks can still be read
+        with raises(InvalidBlockError):
+            saveImage[5]
+        with raises(InvalidBlockError):
+            saveImage.GetWritableBlock(5)
+
+    def testLazyInvalidFooters(self):
+        assert SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/single_save_corrupt_save_1.sav"), lazy=True) == [{}, 0]
+
+    def testLazyMatchesFullLoad(self):
+        for saveName in ["flex", "single_save", "flashcart", "mismatched_file_signature", "invalid_block_id", "mismatched_save_index"]:
+            saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/{saveName}.sav")
+            saveImage, fileSignature = SaveBlocks.LoadAllFromData(saveData)
+            lazySaveImage, lazyFileSignature = SaveBlocks.LoadAllFromData(saveData, lazy=True)
+            assert lazyFileSignature == fileSignature, saveName
+            assert lazySaveImage.blockOffsets == saveImage.blockOffsets, saveName
+            assert {blockId: bytes(lazySaveImage[blockId]) for blockId in lazySaveImage} == {blockId: bytes(saveImage[blockId]) for blockId in saveImage}, saveName
+
+    def testCopy(self):
+        saveImage, _ = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav"))
+        saveImageCopy = copy.deepcopy(saveImage)
+        saveImageCopy.GetWritableBlock(5)[4] = saveImage[5][4] ^ 0xFF
+        assert saveImageCopy[5][4] != saveImage[5][4]  # Original is untouched
+        assert saveImageCopy[6] == saveImage[6]
+        assert saveImageCopy.data is saveImage.data  # Unmodified blocks are shared
+
+    def testCopyOfModifiedImage(self):
+        saveImage, _ = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flex.sav"))
+        saveImage.GetWritableBlock(5)[4] ^= 0xFF
+        saveImageCopy = saveImage.Copy()
+        saveImageCopy.GetWritableBlock(5)[5] ^= 0xFF
+        assert saveImageCopy[5][4] == saveImage[5][4]  # Earlier change carried over
+        assert saveImageCopy[5][5] != saveImage[5][5]  # But later ones aren't shared
+        assert saveImageCopy.dirtyBlocks == {5}
+
+
 class TestLoadOne:
     def testLoadOneFlexSave1(self):
         with open(f"{SAVE_DIR}/flex.sav", "rb") as binaryFile: 
@@ -186,6 +426,46 @@ class TestReplaceAll:
             contents, _ = SaveBlocks.LoadAll(f"{SAVE_DIR}/single_save_new.sav")
             assert contents == saveBlocks  # Should be Flex saveblocks now
 
+class TestReplaceAllInData:
+    def testPutFlexInNGPlus(self):
+        with open(f"{DATA_DIR}/flex_saveblocks.json", "r") as file:
+            saveBlocks = json.load(file)
+            saveBlocks = {int(blockId): saveBlocks[blockId] for blockId in saveBlocks}
+            saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/ng+.sav")
+            newSaveData = SaveBlocks.ReplaceAllInData(saveData, saveBlocks)
+            assert saveData == SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/ng+.sav")  # Original data is unchanged
+            assert SaveBlocks.ValidateData(newSaveData)
+            contents, _ = SaveBlocks.LoadAllFromData(newSaveData)
+            assert {blockId: list(contents[blockId]) for blockId in contents} == saveBlocks  # Should be Flex saveblocks now
+
+    def testMatchesReplaceAll(self):
+        with open(f"{DATA_DIR}/flex_saveblocks.json", "r") as file:
+            saveBlocks = json.load(file)
+            saveBlocks = {int(blockId): saveBlocks[blockId] for blockId in saveBlocks}
+            shutil.copyfile(f"{SAVE_DIR}/single_save.sav", f"{SAVE_DIR}/single_save_new.sav")
+            assert SaveBlocks.ReplaceAll(f"{SAVE_DIR}/single_save_new.sav", saveBlocks)
+            newSaveData = SaveBlocks.ReplaceAllInData(SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/single_save.sav"), saveBlocks)
+            assert newSaveData == SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/single_save_new.sav")
+
+    def testUnchangedSaveImage(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flashcart.sav")
+        saveImage, _ = SaveBlocks.LoadAllFromData(saveData)
+        assert saveImage.DirtyBlockCount() == 0
+        assert SaveBlocks.ReplaceAllInData(saveData, saveImage) == saveData  # Nothing was modified so nothing is rewritten
+
+    def testOnlyDirtyBlocksRewritten(self):
+        saveData = SaveBlocks.ReadSaveFile(f"{SAVE_DIR}/flashcart.sav")
+        saveImage, _ = SaveBlocks.LoadAllFromData(saveData)
+        saveImage.GetWritableBlock(6)[0] ^= 0xFF
+        saveImage.GetWritableBlock(31)[0] ^= 0xFF
+        assert saveImage.DirtyBlockCount() == 2
+
+        newSaveData = SaveBlocks.ReplaceAllInData(saveData, saveImage)
+        changedBlocks = {offset // BlockSize for offset in range(len(saveData)) if saveData[offset] != newSaveData[offset]}
+        assert changedBlocks == {saveImage.blockOffsets[6] // BlockSize, 31}
+        assert SaveBlocks.ValidateData(newSaveData)
+
+
 class TestReplaceOne:
     def testPutFlexBlock3InNGPlus(self):
         with open(f"{DATA_DIR}/flex_saveblocks.json", "r") as file:
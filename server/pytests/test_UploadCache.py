@@ -0,0 +1,82 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "src"))  # Needed for sub-imports
+
+from src.UploadCache import *
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+SAVE_DIR = os.path.join(DATA_DIR, "saves")
+
+
+class TestGetKey:
+    def testSameData(self):
+        assert UploadCache.GetKey(b"\x01\x02\x03") == UploadCache.GetKey(bytes([1, 2, 3]))
+
+    def testDifferentData(self):
+        assert UploadCache.GetKey(b"\x01\x02\x03") != UploadCache.GetKey(b"\x01\x02\x04")
+
+    def testSaveFile(self):
+        with open(f"{SAVE_DIR}/flex.sav", "rb") as binaryFile:
+            saveData = binaryFile.read()
+        assert UploadCache.GetKey(saveData) == UploadCache.GetKey(bytearray(saveData))
+        assert UploadCache.GetKey(saveData) != UploadCache.GetKey(saveData[:-1])
+
+
+class TestGet:
+    def testMiss(self):
+        cache = UploadCache()
+        assert cache.Get(b"key") is None
+        assert cache.misses == 1
+        assert cache.hits == 0
+
+    def testHit(self):
+        cache = UploadCache()
+        cache.Add(b"key", {"boxes": [1, 2, 3]})
+        assert cache.Get(b"key") == {"boxes": [1, 2, 3]}
+        assert cache.hits == 1
+        assert cache.misses == 0
+
+
+class TestAdd:
+    def testCountEviction(self):
+        cache = UploadCache(maxEntries=2)
+        cache.Add(b"1", {"data": 1})
+        cache.Add(b"2", {"data": 2})
+        cache.Add(b"3", {"data": 3})
+        assert cache.Get(b"1") is None  # Oldest was removed
+        assert cache.Get(b"2") == {"data": 2}
+        assert cache.Get(b"3") == {"data": 3}
+
+    def testLeastRecentlyUsedEvicted(self):
+        cache = UploadCache(maxEntries=2)
+        cache.Add(b"1", {"data": 1})
+        cache.Add(b"2", {"data": 2})
+        cache.Get(b"1")  # Now 2 is the least recently used
+        cache.Add(b"3", {"data": 3})
+        assert cache.Get(b"1") == {"data": 1}
+        assert cache.Get(b"2") is None
+
+    def testReplaceSameKey(self):
+        cache = UploadCache()
+        cache.Add(b"1", {"data": 1})
+        cache.Add(b"1", {"data": 22})
+        assert cache.Get(b"1") == {"data": 22}
+        assert cache.GetStats()["entries"] == 1
+
+    def testReplacedKeyMostRecentlyUsed(self):
+        cache = UploadCache(maxEntries=2)
+        cache.Add(b"1", {"data": 1})
+        cache.Add(b"2", {"data": 2})
+        cache.Add(b"1", {"data": 11})  # Now 2 is the least recently used
+        cache.Add(b"3", {"data": 3})
+        assert cache.Get(b"1") == {"data": 11}
+        assert cache.Get(b"2") is None
+
+
+class TestClear:
+    def testClear(self):
+        cache = UploadCache()
+        cache.Add(b"1", {"data": 1})
+        cache.Clear()
+        assert cache.Get(b"1") is None
+        assert cache.GetStats() == {"entries": 0, "hits": 0, "misses": 1}
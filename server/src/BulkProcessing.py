@@ -0,0 +1,64 @@
+import multiprocessing
+from typing import Callable, Iterable, Iterator
+
+from Defines import Defines
+from SaveBlocks import SaveBlocks
+from SaveBlockProcessing import SaveBlockProcessing
+
+DEFAULT_CHUNK_SIZE = 8  # Saves handed to a worker at once
+DEFAULT_WORKER_COUNT = None  # One per CPU core
+
+gLoadedFileSignature = 0  # Game data currently loaded in this process
+
+
+class BulkProcessing:
+    @staticmethod
+    def LoadDefines(fileSignature: int) -> bool:
+        global gLoadedFileSignature
+
+        if fileSignature == gLoadedFileSignature and fileSignature == Defines.fileSignature:
+            return True  # Saves in a batch are usually from the same game, so don't reread its data every time
+
+        if Defines.LoadAll(fileSignature):
+            gLoadedFileSignature = fileSignature
+            return True
+
+        return False
+
+    @staticmethod
+    def LoadSave(saveFilePath: str) -> dict:
+        saveBlocks, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(saveFilePath))
+        result = {"path": saveFilePath, "fileSignature": fileSignature, "gameId": "", "boxes": [], "titles": [],
+                  "oldVersion": "", "error": ""}
+
+        try:
+            if Defines.IsOldVersionFileSignature(fileSignature):
+                result["oldVersion"] = Defines.GetOldVersionGameName(fileSignature)
+            elif saveBlocks != {} and fileSignature != 0 and BulkProcessing.LoadDefines(fileSignature):
+                result["gameId"] = Defines.GetCurrentDefinesDir()
+                result["boxes"] = SaveBlockProcessing.LoadPCPokemon(saveBlocks)
+                result["titles"] = SaveBlockProcessing.LoadCFRUBoxTitles(saveBlocks)
+            else:
+                result["error"] = "Invalid save file"
+        except Exception as e:
+            result["error"] = str(e)  # One bad save shouldn't stop the rest of the batch
+
+        return result
+
+    @staticmethod
+    def LoadMany(saveFilePaths: Iterable[str], workerCount: int = DEFAULT_WORKER_COUNT,
+                 chunkSize: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+        return BulkProcessing.ProcessMany(BulkProcessing.LoadSave, saveFilePaths, workerCount, chunkSize)
+
+    @staticmethod
+    def ProcessMany(processFunc: Callable[[str], dict], saveFilePaths: Iterable[str],
+                    workerCount: int = DEFAULT_WORKER_COUNT, chunkSize: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+        # Results are yielded as soon as they're ready, so they won't be in the same order as the paths
+        # processFunc must be importable by the workers (eg. a static method of a top level class)
+        if workerCount == 1:
+            for saveFilePath in saveFilePaths:
+                yield processFunc(saveFilePath)
+            return
+
+        with multiprocessing.Pool(workerCount) as pool:
+            yield from pool.imap_unordered(processFunc, saveFilePaths, chunkSize)
@@ -0,0 +1,26 @@
+from typing import Dict, Iterable, List
+
+EOS = 0xFF  # End of string
+
+
+class CharMapCodec:
+    def __init__(self, charMap: Dict[int, str], reverseCharMap: Dict[str, int]):
+        self.decodeTable = [charMap.get(byte) for byte in range(0x100)]  # Byte -> character, None for bytes with no character
+        self.encodeTable = dict(reverseCharMap)  # Character -> byte
+
+    def Decode(self, byteString: Iterable[int]) -> str:
+        byteString = bytes(byteString)
+        end = byteString.find(EOS)
+        if end != -1:
+            byteString = byteString[:end]
+
+        return byteString.decode("latin-1").translate(self.decodeTable)  # Bytes with no character are dropped
+
+    def DecodeMany(self, byteStrings: Iterable[Iterable[int]]) -> List[str]:
+        return [self.Decode(byteString) for byteString in byteStrings]
+
+    def Encode(self, string: str, length: int) -> List[int]:
+        # Padded to the length with EOS, but longer strings aren't cut off
+        encoded = [self.encodeTable[char] if char in self.encodeTable else int(char, 16) for char in string]  # Unknown characters have always been read as hex
+        encoded.extend([EOS] * (length - len(encoded)))
+        return encoded
@@ -3,6 +3,9 @@ import os
 import sys
 from typing import Dict, List
 
+from CharMap import CharMapCodec
+from SaveRules import SaveRules
+
 ## Defines Files ##
 SRC_DIR = os.path.dirname(os.path.realpath(__file__))
 GAME_DATA_DIR = f"{SRC_DIR}/data"  # os.path.join(os.path.dirname(os.path.dirname(SRC_DIR)), "public", "data")
@@ -254,6 +257,7 @@ class Defines:
     dexNum = dict()
     reverseDexNum = dict()
     speciesToDexNum = dict()
+    speciesDexBits = dict()
     moves = dict()
     reverseMoves = dict()
     items = dict()
@@ -266,6 +270,8 @@ class Defines:
     baseStats = dict()
     charMap = dict()
     reverseCharMap = dict()
+    charMapCodec = CharMapCodec({}, {})
+    saveRules = None
 
     @staticmethod
     def GetCurrentGameName() -> str:
@@ -289,6 +295,13 @@ class Defines:
 
         return []
 
+    @staticmethod
+    def GetSaveRules() -> SaveRules:
+        if Defines.saveRules is None or Defines.saveRules.fileSignature != Defines.fileSignature:
+            Defines.saveRules = SaveRules(Defines.fileSignature, GameDetails[Defines.fileSignature])
+
+        return Defines.saveRules
+
     @staticmethod
     def GetMonOriginalGameName(monGameId: str) -> str:
         gameName = "unknown"
@@ -371,6 +384,16 @@ class Defines:
                 return Defines.reverseDexNum[dexTag]
         return 0
 
+    @staticmethod
+    def SpeciesDexBitMaker() -> Dict[str, int]:
+        # Species -> its bit in the Pokedex flags read as one little endian int (byte (dexNum - 1) // 8, mask 1 << ((dexNum - 1) % 8))
+        dexBits = {}
+        for species in Defines.speciesToDexNum:
+            dexNum = Defines.GetSpeciesDexNum(species)
+            if dexNum >= 1:
+                dexBits[species] = 1 << (dexNum - 1)
+        return dexBits
+
     @staticmethod
     def LoadAll(fileSignature: int) -> bool:
         if Defines.IsValidFileSignature(fileSignature):
@@ -395,6 +418,7 @@ class Defines:
             Defines.speciesToDexNum = Defines.DictMakerFromJSON(speciesToDexNumDefines)
             Defines.dexNum = Defines.DictMakerFromJSON(dexNumDefines, True)
             Defines.reverseDexNum = Defines.Reverse(Defines.dexNum)
+            Defines.speciesDexBits = Defines.SpeciesDexBitMaker()
             Defines.moves = Defines.DictMakerFromJSON(movesDefines, True)
             Defines.reverseMoves = Defines.Reverse(Defines.moves)
             Defines.items = Defines.DictMakerFromJSON(itemDefines, True)
@@ -408,6 +432,7 @@ class Defines:
             Defines.experienceCurves = Defines.DictMakerFromJSON(experienceCurveDefines, False)
             Defines.baseStats = Defines.DictMakerFromJSON(baseStatsDefines)
             Defines.LoadCharMap()
+            Defines.saveRules = SaveRules(fileSignature, GameDetails[fileSignature])  # Compiled once instead of on every check
             return True
         else:
             return False
@@ -416,6 +441,7 @@ class Defines:
     def LoadCharMap():
         Defines.charMap = Defines.PokeByteTableMaker(CharMapDefines)
         Defines.reverseCharMap = Defines.Reverse(Defines.charMap)
+        Defines.charMapCodec = CharMapCodec(Defines.charMap, Defines.reverseCharMap)
 
     @staticmethod
     def DictMaker(definesFile: str) -> dict:
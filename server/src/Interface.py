@@ -1,47 +1,135 @@
 import json
-import shutil
+import threading
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 
 from Defines import Defines, UNBOUND_2_1_FILE_SIGNATURE
-from PokemonProcessing import PokemonProcessing
+from PokemonProcessing import PokemonProcessing, MONS_PER_BOX
 from SaveBlocks import SaveBlocks
 from SaveBlockProcessing import SaveBlockProcessing
+from SavePatch import SavePatch
+from UploadCache import UploadCache
 
 PORT = 3005
+SAVE_IMAGE_CACHE_ENTRIES = 32
 app = FastAPI()
+gUploadCache = UploadCache()
+gSaveImageCache = UploadCache(maxEntries=SAVE_IMAGE_CACHE_ENTRIES)  # Saves uploaded with firstBoxOnly, for /uploadsavebox
+gUpdateStats = {"updates": 0, "blocksRewritten": 0}
+gUpdateStatsLock = threading.Lock()  # Requests are handled on multiple threads
 
 
 @app.get("/uploadsave")
-def uploadSave(saveFilePath: str):
+def uploadSave(saveFilePath: str, firstBoxOnly: bool = False):
     if saveFilePath == "":
         print("No save file path provided")
         return {}
 
-    saveBlocks, fileSignature = SaveBlocks.LoadAll(saveFilePath)
+    saveData = SaveBlocks.ReadSaveFile(saveFilePath)
+    cacheKey = UploadCache.GetKey(saveData)
+    saveKey = cacheKey.hex()  # Used to get the rest of the boxes after a firstBoxOnly upload
+    cachedResult = gUploadCache.Get(cacheKey)
+    if cachedResult is not None:
+        if firstBoxOnly:  # Same save was already uploaded
+            return dict(cachedResult, boxes=cachedResult["boxes"][:MONS_PER_BOX])
+        return cachedResult
+
+    saveBlocks, fileSignature = SaveBlocks.LoadAllFromData(saveData)
     allPokemon = []   # In case error reading save blocks
     boxTitles = []
     randomizer = False
     inaccessibleReason = ""
     oldVersion = ""
+    cacheable = False  # Only fully read saves are worth caching
 
     try:
         if Defines.IsOldVersionFileSignature(fileSignature):
             oldVersion = Defines.GetOldVersionGameName(fileSignature)
         elif saveBlocks != {} and fileSignature != 0 and Defines.LoadAll(fileSignature):
-            allPokemon = SaveBlockProcessing.LoadPCPokemon(saveBlocks)
+            if firstBoxOnly:
+                allPokemon = SaveBlockProcessing.LoadBoxPokemon(saveBlocks, 0)  # The rest are loaded with /uploadsavebox
+                gSaveImageCache.Add(cacheKey, (saveBlocks, fileSignature))  # The file is deleted after this request
+            else:
+                allPokemon = SaveBlockProcessing.LoadPCPokemon(saveBlocks)
             boxTitles = SaveBlockProcessing.LoadCFRUBoxTitles(saveBlocks)
 
-            if SaveBlockProcessing.IsRandomizedSave(saveBlocks):
-                randomizer = True
+            randomizer, inaccessibleReason = SaveBlockProcessing.GetSaveStatus(saveBlocks)
 
-            if not SaveBlockProcessing.IsAccessibleCurrently(saveBlocks):
-                inaccessibleReason = SaveBlockProcessing.GetInaccessibleReason(saveBlocks)
+            cacheable = not firstBoxOnly
     except Exception as e:
         print("Error reading save data: " + str(e))
 
-    return {"gameId": Defines.GetCurrentDefinesDir(), "boxCount": Defines.BoxCount(),  # gameId is used on the front-end to load game-specific data
-            "boxes": allPokemon, "titles": boxTitles, "randomizer": randomizer, "inaccessibleReason": inaccessibleReason, "oldVersion": oldVersion}
+    result = {"gameId": Defines.GetCurrentDefinesDir(), "boxCount": Defines.BoxCount(),  # gameId is used on the front-end to load game-specific data
+              "boxes": allPokemon, "titles": boxTitles, "randomizer": randomizer, "inaccessibleReason": inaccessibleReason, "oldVersion": oldVersion,
+              "saveKey": saveKey}
+
+    if cacheable:
+        gUploadCache.Add(cacheKey, result)
+
+    return result
+
+
+@app.get("/uploadsavebox")
+def uploadSaveBox(saveKey: str, box: int):
+    # saveKey is from the /uploadsave call, so the save file doesn't need to be kept around
+    try:
+        cacheKey = bytes.fromhex(saveKey)
+    except ValueError:
+        cacheKey = b""
+
+    if cacheKey == b"" or box < 0:
+        print("No save key or invalid box provided")
+        return []
+
+    cachedResult = gUploadCache.Get(cacheKey)
+    if cachedResult is not None:
+        if box >= cachedResult["boxCount"]:
+            return []
+        return cachedResult["boxes"][box * MONS_PER_BOX:(box + 1) * MONS_PER_BOX]  # Entire save was already loaded
+
+    cachedSave = gSaveImageCache.Get(cacheKey)
+    if cachedSave is None:
+        print("Save is no longer loaded")
+        return []
+
+    saveBlocks, fileSignature = cachedSave
+    boxPokemon = []  # In case error reading save blocks
+
+    try:
+        if (Defines.fileSignature == fileSignature or Defines.LoadAll(fileSignature)) and box < Defines.BoxCount():
+            boxPokemon = SaveBlockProcessing.LoadBoxPokemon(saveBlocks, box)
+    except Exception as e:
+        print("Error reading save data: " + str(e))
+
+    return boxPokemon
+
+
+@app.get("/uploadcachestats")
+def uploadCacheStats():
+    return gUploadCache.GetStats()
+
+
+@app.get("/updatestats")
+def updateStats():
+    with gUpdateStatsLock:
+        return dict(gUpdateStats)
+
+
+def writeUpdatedSave(saveData: bytes, saveBlocks, newSaveBlocks, newPokemon: list, originalSaveFilePath: str) -> str:
+    seenFlags, caughtFlags = SaveBlockProcessing.LoadPokedexFlags(saveBlocks)
+    seenFlags, caughtFlags, dexChanged = PokemonProcessing.UpdatePokedexFlagsWithChange(seenFlags, caughtFlags, newPokemon)
+    if dexChanged:  # Nothing to write if every Pokemon was already registered
+        newSaveBlocks = SaveBlockProcessing.UpdatePokedexFlags(newSaveBlocks, seenFlags, caughtFlags)
+    newSaveData = SaveBlocks.ReplaceAllInData(saveData, newSaveBlocks)
+    with gUpdateStatsLock:
+        gUpdateStats["updates"] += 1
+        gUpdateStats["blocksRewritten"] += newSaveBlocks.DirtyBlockCount()
+
+    newFilePath = originalSaveFilePath.split(".sav")[0] + "_new.sav"
+    with open(newFilePath, "wb") as binaryFile:
+        binaryFile.write(newSaveData)  # Finished file is written once for the Node server to send back
+
+    return newFilePath
 
 
 @app.get("/updatesave")
@@ -51,22 +139,16 @@ def updateSave(updatedDataJSON: str, originalSaveFilePath: str):
         return ""
 
     try:
-        saveBlocks, fileSignature = SaveBlocks.LoadAll(originalSaveFilePath)
+        saveData = SaveBlocks.ReadSaveFile(originalSaveFilePath)
+        saveBlocks, fileSignature = SaveBlocks.LoadAllFromData(saveData)
         newFilePath = ""  # In case error reading save file
 
         if saveBlocks != {} and fileSignature != 0 and Defines.LoadAll(fileSignature):
-            newFilePath = originalSaveFilePath.split(".sav")[0] + "_new.sav"
-            shutil.copyfile(originalSaveFilePath, newFilePath)
-
             with open(updatedDataJSON, 'r', encoding="utf-8") as jsonFile:
                 newPokemon = json.load(jsonFile)
 
-            seenFlags, caughtFlags = SaveBlockProcessing.LoadPokedexFlags(saveBlocks)
-            seenFlags, caughtFlags = PokemonProcessing.UpdatePokedexFlags(seenFlags, caughtFlags, newPokemon)
             newSaveBlocks = SaveBlockProcessing.UpdateCFRUBoxData(saveBlocks, newPokemon)
-            newSaveBlocks = SaveBlockProcessing.UpdatePokedexFlags(newSaveBlocks, seenFlags, caughtFlags)
-            if not SaveBlocks.ReplaceAll(newFilePath, newSaveBlocks):
-                newFilePath = ""  # An error occurred 
+            newFilePath = writeUpdatedSave(saveData, saveBlocks, newSaveBlocks, newPokemon, originalSaveFilePath)
     except Exception as e:
         print("Error updating save data: " + str(e))
         newFilePath = ""
@@ -74,6 +156,73 @@ def updateSave(updatedDataJSON: str, originalSaveFilePath: str):
     return newFilePath
 
 
+def loadSlotEdits(updatedSlotsJSON: str) -> list:
+    with open(updatedSlotsJSON, 'r', encoding="utf-8") as jsonFile:
+        edits = json.load(jsonFile)
+
+    if type(edits) != list:
+        raise ValueError("Slot edits must be a list")
+
+    slotEdits = []
+    for edit in edits:
+        if type(edit) != dict:
+            raise ValueError(f"Slot edit must be an object: {edit}")
+
+        missingKeys = [key for key in ["box", "slot", "pokemon"] if key not in edit]
+        if len(missingKeys) > 0:
+            raise ValueError(f"Slot edit is missing {', '.join(missingKeys)}")
+
+        if type(edit["box"]) != int or type(edit["slot"]) != int or type(edit["pokemon"]) != dict:
+            raise ValueError(f"Slot edit has the wrong types: box {edit['box']}, slot {edit['slot']}")
+
+        slotEdits.append((edit["box"], edit["slot"], edit["pokemon"]))
+
+    return slotEdits
+
+
+@app.get("/updatesaveslots")
+def updateSaveSlots(updatedSlotsJSON: str, originalSaveFilePath: str):
+    # Like /updatesave but the JSON only has the changed slots: [{"box": 0, "slot": 0, "pokemon": {...}}, ...]
+    if updatedSlotsJSON == "" or originalSaveFilePath == "":
+        print("No updated slots or save file path provided")
+        return ""
+
+    try:
+        saveData = SaveBlocks.ReadSaveFile(originalSaveFilePath)
+        saveBlocks, fileSignature = SaveBlocks.LoadAllFromData(saveData)
+        newFilePath = ""  # In case error reading save file
+
+        if saveBlocks != {} and fileSignature != 0 and Defines.LoadAll(fileSignature):
+            edits = loadSlotEdits(updatedSlotsJSON)
+            newSaveBlocks = SaveBlockProcessing.UpdateCFRUSlots(saveBlocks, edits)  # Also checks the boxes and slots are in the PC
+            newFilePath = writeUpdatedSave(saveData, saveBlocks, newSaveBlocks, [pokemon for _, _, pokemon in edits], originalSaveFilePath)
+    except ValueError as e:
+        print("Invalid slot edits: " + str(e))
+        newFilePath = ""
+    except Exception as e:
+        print("Error updating save slots: " + str(e))
+        newFilePath = ""
+
+    return newFilePath
+
+
+@app.get("/createsavepatch")
+def createSavePatch(originalSaveFilePath: str, newSaveFilePath: str):
+    # Clients with the original save only need the patch instead of the whole new save
+    if originalSaveFilePath == "" or newSaveFilePath == "":
+        print("No original or new save file path provided")
+        return Response(status_code=400)
+
+    originalSaveData = SaveBlocks.ReadSaveFile(originalSaveFilePath)
+    newSaveData = SaveBlocks.ReadSaveFile(newSaveFilePath)
+    patch = SavePatch.Create(originalSaveData, newSaveData)
+    if not SavePatch.Verify(originalSaveData, newSaveData, patch):
+        print("Error creating save patch")
+        return Response(status_code=500)
+
+    return Response(content=patch, media_type="application/octet-stream")  # Sent back directly so there's no file to clean up
+
+
 @app.get("/convertoldcloudfile")
 def convertOldCloudFile(cloudFilePath: str):
     if cloudFilePath == "":
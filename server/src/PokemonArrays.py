@@ -0,0 +1,92 @@
+from typing import Dict, List
+
+try:
+    import numpy
+except ImportError:  # Optional, only needed for reading whole PCs in bulk
+    numpy = None
+
+from Defines import Defines
+from PokemonProcessing import CFRUCompressedPokemon, CFRUCompressedPokemonSize, SANITY_IS_BAD_EGG, SANITY_IS_EGG
+from SaveBlockProcessing import SaveBlockProcessing
+
+gPokemonDType = None
+
+
+class PokemonArrays:
+    # The PC as columns of raw values instead of a dict per Pokemon, for analytics and batch jobs
+    # Constants aren't assigned and Bad Eggs aren't wiped like in AssignConstantsToCFRUData, they're marked in "badEgg" instead
+
+    @staticmethod
+    def IsAvailable() -> bool:
+        return numpy is not None
+
+    @staticmethod
+    def GetDType() -> "numpy.dtype":
+        global gPokemonDType
+
+        if gPokemonDType is None:
+            formats = {1: "u1", 2: "<u2", 4: "<u4"}
+            gPokemonDType = numpy.dtype({
+                "names": list(CFRUCompressedPokemon),
+                "formats": [formats.get(size, ("u1", (size,))) for _, size in CFRUCompressedPokemon.values()],  # Others are read as byte arrays
+                "offsets": [offset for offset, _ in CFRUCompressedPokemon.values()],
+                "itemsize": CFRUCompressedPokemonSize,
+            })
+
+        return gPokemonDType
+
+    @staticmethod
+    def LoadRecords(pcData: bytes) -> "numpy.ndarray":
+        if numpy is None:
+            raise ImportError("NumPy is needed to load the PC as arrays")
+
+        return numpy.frombuffer(bytes(pcData), dtype=PokemonArrays.GetDType())
+
+    @staticmethod
+    def LoadPC(saveBlocks: Dict[int, List[int]]) -> Dict[str, "numpy.ndarray"]:
+        if not Defines.IsCFRUHack():
+            return PokemonArrays.GetColumns(PokemonArrays.LoadRecords(b""))
+
+        return PokemonArrays.GetColumns(PokemonArrays.LoadRecords(SaveBlockProcessing.GetCFRUPCData(saveBlocks)))
+
+    @staticmethod
+    def GetColumns(records: "numpy.ndarray") -> Dict[str, "numpy.ndarray"]:
+        columns = {tag: records[tag] for tag in ["personality", "otId", "species", "item", "experience", "friendship", "pokeBall",
+                                                 "language", "sanity", "markings", "ppBonuses", "pokerus", "metLocaton"]}
+
+        # Moves - 4 x 10 bits
+        packedMoves = numpy.zeros(len(records), dtype=numpy.uint64)
+        for i in range(CFRUCompressedPokemon["moves"][1]):
+            packedMoves |= records["moves"][:, i].astype(numpy.uint64) << numpy.uint64(8 * i)
+        columns["moves"] = (packedMoves[:, None] >> numpy.arange(0, 40, 10, dtype=numpy.uint64)) & numpy.uint64(0x3FF)
+
+        # IVs - 6 x 5 bits, then the egg and Hidden Ability bits
+        ivs = records["ivs"]
+        columns["ivs"] = (ivs[:, None] >> numpy.arange(0, 30, 5, dtype=numpy.uint32)) & numpy.uint32(0x1F)
+        columns["evs"] = numpy.stack([records[tag] for tag in ["hpEv", "atkEv", "defEv", "spdEv", "spAtkEv", "spDefEv"]], axis=1)
+        columns["isEgg"] = ((ivs >> 30) & 1 != 0) | (records["sanity"] & SANITY_IS_EGG != 0)
+        columns["hiddenAbility"] = (ivs >> 31) & 1 != 0
+        columns["badEgg"] = records["sanity"] & SANITY_IS_BAD_EGG != 0
+
+        # Met info - level, game id, Gigantamax and OT gender
+        metInfo = records["metInfo"]
+        columns["metLevel"] = metInfo & 0x7F
+        columns["metGame"] = (metInfo & 0x780) >> 7
+        columns["gigantamax"] = metInfo & 0x800 != 0
+        columns["femaleOt"] = metInfo & 0x8000 != 0
+
+        # Values calculated from the personality
+        personality, otId = records["personality"], records["otId"]
+        shinyValue = (otId >> 16) ^ (otId & 0xFFFF) ^ (personality >> 16) ^ (personality & 0xFFFF)
+        columns["shiny"] = (records["species"] != 0) & (shinyValue < Defines.shinyOdds)
+        columns["nature"] = personality % 25  # Id in Defines.natures
+        columns["abilitySlot"] = numpy.where(columns["hiddenAbility"], 2, personality & 1)
+
+        return columns
+
+    @staticmethod
+    def CountSpecies(columns: Dict[str, "numpy.ndarray"]) -> Dict[str, int]:
+        # How many of each species are in the PC, leaving out empty slots and Bad Eggs
+        species = columns["species"][(columns["species"] != 0) & ~columns["badEgg"]]
+        speciesIds, counts = numpy.unique(species, return_counts=True)
+        return {Defines.species.get(int(speciesId), int(speciesId)): int(count) for speciesId, count in zip(speciesIds, counts)}
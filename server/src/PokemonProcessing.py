@@ -1,8 +1,8 @@
 import json
-from typing import List, Tuple
+import struct
+from typing import Dict, Iterable, List, Tuple
 from Defines import Defines
 from PokemonUtil import PokemonUtil  # , NUM_STATS
-from Util import BytesToString, BytesToInt, ConvertToReverseByteList
 
 CFRUCompressedPokemon = {
     "personality": (0, 4),
@@ -32,9 +32,33 @@ CFRUCompressedPokemon = {
 }
 
 CFRUCompressedPokemonSize = 58
+CFRUCompressedPokemonStrings = ["nickname", "otName"]
 
 PokemonData = dict.fromkeys(CFRUCompressedPokemon.keys(), None)
 
+
+def CompileCFRUCompressedPokemonStruct() -> Tuple[struct.Struct, List[str]]:
+    # Fields that aren't a native int size (and the strings) are read as bytes and converted after unpacking
+    formats = {1: "B", 2: "H", 4: "I"}
+    layout = "<"
+    byteFields = []
+    for tag, (offset, size) in CFRUCompressedPokemon.items():
+        assert struct.calcsize(layout) == offset  # Fields must be contiguous and in order
+        if size in formats and tag not in CFRUCompressedPokemonStrings:
+            layout += formats[size]
+        else:
+            layout += f"{size}s"
+            byteFields.append(tag)
+
+    assert struct.calcsize(layout) == CFRUCompressedPokemonSize
+    return struct.Struct(layout), byteFields
+
+
+CFRUCompressedPokemonStruct, CFRUCompressedPokemonByteFields = CompileCFRUCompressedPokemonStruct()
+CFRUCompressedPokemonFieldSizes = {offset: size for offset, size in CFRUCompressedPokemon.values()}
+CFRUCompressedPokemonFieldStructs = {1: struct.Struct("<B"), 2: struct.Struct("<H"), 4: struct.Struct("<I")}
+BlankCFRUCompressedPokemon = bytes(CFRUCompressedPokemonSize)
+
 BASE_FORMS_OF_BANNED_SPECIES = {  # All forms that can't exist outside of battle
     "SPECIES_CHERRIM_SUN": "SPECIES_CHERRIM",
     "SPECIES_HIPPOPOTAS_F": "SPECIES_HIPPOPOTAS",
@@ -104,23 +128,90 @@ BLANK_CONVERTED_POKEMON = \
 MONS_PER_BOX = 30
 UNBOUND_PRESET_BOX = 25
 
+gBlankPokemon = (None, None)  # (File signature, empty slot loaded with that game's data)
+
 
 class PokemonProcessing:
     @staticmethod
     def LoadCFRUCompressedMonAtBoxOffset(allBoxes: List[int], monOffset: int) -> dict:
-        pokemonData = PokemonData.copy()
-
-        for tag in CFRUCompressedPokemon:
-            startOffset = monOffset + CFRUCompressedPokemon[tag][0]
-            endOffset = startOffset + CFRUCompressedPokemon[tag][1]
-            data = allBoxes[startOffset:endOffset]
-            if tag == "nickname" or tag == "otName":
-                pokemonData[tag] = BytesToString(data)  # Read as proper string
+        if type(allBoxes) not in (bytes, bytearray, memoryview):
+            allBoxes = bytes(allBoxes[monOffset:monOffset + CFRUCompressedPokemonSize])
+            monOffset = 0
+
+        return PokemonProcessing.CFRUCompressedMonFromFields(CFRUCompressedPokemonStruct.unpack_from(allBoxes, monOffset))
+
+    @staticmethod
+    def LoadCFRUCompressedMons(allBoxes: bytes) -> List[dict]:
+        # Every record in the buffer unpacked in one pass
+        if type(allBoxes) not in (bytes, bytearray, memoryview):
+            allBoxes = bytes(allBoxes)
+
+        allPokemon = [PokemonProcessing.CFRUCompressedMonFromFields(fields, False) for fields in CFRUCompressedPokemonStruct.iter_unpack(allBoxes)]
+        PokemonProcessing.DecodeCFRUStrings(allPokemon)
+        return allPokemon
+
+    @staticmethod
+    def LoadCFRUMons(allBoxes: bytes) -> List[dict]:
+        # Same as loading each record and assigning its constants, but empty slots are copied from one blank Pokemon
+        if type(allBoxes) not in (bytes, bytearray, memoryview):
+            allBoxes = bytes(allBoxes)
+
+        blankPokemon = PokemonProcessing.GetBlankCFRUPokemon()
+        allPokemon = []
+        loadedPokemon = []  # The ones that aren't empty slots
+        recordOffsets = range(0, len(allBoxes), CFRUCompressedPokemonSize)
+        for offset, fields in zip(recordOffsets, CFRUCompressedPokemonStruct.iter_unpack(allBoxes)):
+            if allBoxes[offset:offset + CFRUCompressedPokemonSize] == BlankCFRUCompressedPokemon:
+                allPokemon.append(PokemonProcessing.CopyPokemon(blankPokemon))
+            else:
+                pokemonData = PokemonProcessing.CFRUCompressedMonFromFields(fields, False)
+                allPokemon.append(pokemonData)
+                loadedPokemon.append(pokemonData)
+
+        PokemonProcessing.DecodeCFRUStrings(loadedPokemon)  # Needed before the constants since they're part of the checksum
+        for pokemonData in loadedPokemon:
+            PokemonProcessing.AssignConstantsToCFRUData(pokemonData)
+
+        return allPokemon
+
+    @staticmethod
+    def GetBlankCFRUPokemon() -> dict:
+        # An empty slot depends only on the game's data, so it's only loaded (and its checksum calculated) once per game
+        global gBlankPokemon
+
+        fileSignature, blankPokemon = gBlankPokemon
+        if blankPokemon is None or fileSignature != Defines.fileSignature:
+            blankPokemon = PokemonProcessing.LoadCFRUCompressedMonAtBoxOffset(BlankCFRUCompressedPokemon, 0)
+            PokemonProcessing.AssignConstantsToCFRUData(blankPokemon)
+            gBlankPokemon = (Defines.fileSignature, blankPokemon)
+
+        return blankPokemon
+
+    @staticmethod
+    def CopyPokemon(pokemonData: dict) -> dict:
+        return {key: value.copy() if type(value) == list else value for key, value in pokemonData.items()}  # Lists are the only mutable values
+
+    @staticmethod
+    def CFRUCompressedMonFromFields(fields: Iterable, decodeStrings: bool = True) -> dict:
+        # Strings can be left as bytes to be decoded together with DecodeCFRUStrings
+        pokemonData = dict(zip(PokemonData, fields))
+
+        for tag in CFRUCompressedPokemonByteFields:
+            if tag in CFRUCompressedPokemonStrings:
+                if decodeStrings:
+                    pokemonData[tag] = Defines.charMapCodec.Decode(pokemonData[tag])  # Read as proper string
             else:
-                pokemonData[tag] = BytesToInt(data)
+                pokemonData[tag] = int.from_bytes(pokemonData[tag], "little")
 
         return pokemonData
 
+    @staticmethod
+    def DecodeCFRUStrings(allPokemon: List[dict]):
+        for tag in CFRUCompressedPokemonStrings:
+            strings = Defines.charMapCodec.DecodeMany([pokemonData[tag] for pokemonData in allPokemon])
+            for pokemonData, string in zip(allPokemon, strings):
+                pokemonData[tag] = string
+
     @staticmethod
     def AssignConstantsToCFRUData(pokemonData: dict):
         # Fix Move Names
@@ -285,15 +376,24 @@ class PokemonProcessing:
     ### Code for updating save files ###
     @staticmethod
     def GetAllCFRUCompressedMons(allPokemonData: List[dict]) -> List[int]:
-        allCompressedMons = []
+        return list(PokemonProcessing.GetAllCFRUCompressedMonsData(allPokemonData))
+
+    @staticmethod
+    def GetAllCFRUCompressedMonsData(allPokemonData: List[dict]) -> bytearray:
+        allCompressedMons = bytearray(len(allPokemonData) * CFRUCompressedPokemonSize)  # Empty slots are left as zeroes
         for i, pokemonData in enumerate(allPokemonData):
-            allCompressedMons += PokemonProcessing.ConvertPokemonToCFRUCompressedMon(pokemonData, (i // MONS_PER_BOX) + 1)
+            species = pokemonData["species"]
+            if species != 0 and species != "SPECIES_NONE":
+                offset = i * CFRUCompressedPokemonSize
+                allCompressedMons[offset:offset + CFRUCompressedPokemonSize] = \
+                    PokemonProcessing.ConvertPokemonToCFRUCompressedMon(pokemonData, (i // MONS_PER_BOX) + 1)
         return allCompressedMons
 
     @staticmethod
     def ConvertPokemonToCFRUCompressedMon(pokemonData: dict, boxId) -> List[int]:
         species = pokemonData["species"]
-        finalData = [0] * CFRUCompressedPokemonSize
+        finalData = [0] * CFRUCompressedPokemonSize  # Returned as is when the Pokemon can't be saved
+        fields = {}  # Offset -> data, ORed together when more than one key is stored in the same field
         inPresetBox = boxId == UNBOUND_PRESET_BOX and Defines.GetCurrentGameName() == "unbound"
         if species == 0 or species == "SPECIES_NONE":
             return finalData  # No point in wasting time
@@ -336,9 +436,9 @@ class PokemonProcessing:
             return finalData  # Can't sneak in moves that isn't a list
 
         # Dissect the actual data
+        sanityOffset = CFRUCompressedPokemon["sanity"][0]
+        ivsOffset = CFRUCompressedPokemon["ivs"][0]
         for key in pokemonData:
-            reverse = True  # Data is stored in little endian
-
             if key == "species":
                 if not inPresetBox:
                     if species == "SPECIES_HOOPA_UNBOUND":
@@ -354,7 +454,7 @@ class PokemonProcessing:
                     finalSpecies = 0  # Bye, bye, Pokemon!
 
                 if finalSpecies != 0:
-                    finalData[CFRUCompressedPokemon["sanity"][0]] |= 2  # hasSpecies
+                    fields[sanityOffset] = fields.get(sanityOffset, 0) | 2  # hasSpecies
                 else:
                     return [0] * CFRUCompressedPokemonSize  # Wipe Pokemon with fake species
 
@@ -384,20 +484,19 @@ class PokemonProcessing:
                 data = ivs
                 offset = CFRUCompressedPokemon[key][0]
             elif key == "evs":
-                evs = 0
                 if pokemonData[key] is not None:
                     for i, ev in enumerate(pokemonData[key]):
-                        evs |= (min(ev, 0xFF) << (8 * i))
-                data = evs
-                offset = CFRUCompressedPokemon["hpEv"][0]
+                        offset = CFRUCompressedPokemon["hpEv"][0] + i  # Each EV is its own field
+                        fields[offset] = fields.get(offset, 0) | min(ev, 0xFF)
+                continue
             elif key == "isEgg":
                 if pokemonData["isEgg"] != 0:
-                    finalData[CFRUCompressedPokemon["sanity"][0]] |= 4
-                    finalData[57] |= 0x40  # End of IVs
+                    fields[sanityOffset] = fields.get(sanityOffset, 0) | 4
+                    fields[ivsOffset] = fields.get(ivsOffset, 0) | (0x40 << 24)  # End of IVs
                 continue
             elif key == "hiddenAbility":
                 if pokemonData["hiddenAbility"]:
-                    finalData[57] |= 0x80  # End of IVs
+                    fields[ivsOffset] = fields.get(ivsOffset, 0) | (0x80 << 24)  # End of IVs
                 continue
             elif key == "item":
                 item = pokemonData[key]
@@ -447,19 +546,8 @@ class PokemonProcessing:
                 else:
                     continue
             elif key == "nickname" or key == "otName":
-                charList = []
-                name = pokemonData[key]
-                for char in name:
-                    if char in Defines.reverseCharMap:
-                        char = hex(Defines.reverseCharMap[char])[2:].zfill(2)  # Make it look like "03" or "57"
-                    charList.append(char)
-
-                while(len(charList)) < CFRUCompressedPokemon[key][1]:
-                    charList.append("FF")  # EOS
-
-                data = charList
+                data = int.from_bytes(bytes(Defines.charMapCodec.Encode(pokemonData[key], CFRUCompressedPokemon[key][1])), "little")
                 offset = CFRUCompressedPokemon[key][0]
-                reverse = False  # Data is stored one byte at a time
             else:
                 if key in CFRUCompressedPokemon:
                     data = pokemonData[key]
@@ -467,32 +555,58 @@ class PokemonProcessing:
                 else:
                     continue
 
-            if reverse:
-                data = ConvertToReverseByteList(hex(data))
+            fields[offset] = fields.get(offset, 0) | data
 
-            for i, byte in enumerate(data):
-                finalData[offset + i] |= int(byte, 16)
+        return list(PokemonProcessing.PackCFRUCompressedMonFields(fields))
+
+    @staticmethod
+    def PackCFRUCompressedMonFields(fields: Dict[int, int]) -> bytearray:
+        finalData = bytearray(CFRUCompressedPokemonSize)
+        overflows = []
+
+        for offset, data in fields.items():
+            size = CFRUCompressedPokemonFieldSizes.get(offset, 0)
+            if data >> (8 * size) != 0:
+                overflows.append((offset, data))  # Doesn't fit in its field
+            elif size in CFRUCompressedPokemonFieldStructs:
+                CFRUCompressedPokemonFieldStructs[size].pack_into(finalData, offset, data)
+            else:
+                finalData[offset:offset + size] = data.to_bytes(size, "little")
+
+        # Data too big for its field has always spilled over into the fields after it
+        for offset, data in overflows:
+            for i, byte in enumerate(data.to_bytes((data.bit_length() + 7) // 8, "little")):
+                finalData[offset + i] |= byte
 
         return finalData
 
-    @staticmethod
-    def UpdatePokedexFlags(seenFlags: List[int], caughtFlags: List[int], allPokemonData: List[dict]) -> Tuple[List[int], List[int]]:
-        newSeenFlags = seenFlags.copy()
-        newCaughtFlags = caughtFlags.copy()
 
+    @staticmethod
+    def GetPokedexMask(allPokemonData: List[dict]) -> int:
+        # The dex flags of every Pokemon given, as one int to OR into the seen and caught flags
+        dexBits = Defines.speciesDexBits
+        dexMask = 0
         for pokemonData in allPokemonData:
-            species = pokemonData["species"]
-            if species != "SPECIES_NONE" and species != "":
-                dexNum = Defines.GetSpeciesDexNum(species)
+            dexMask |= dexBits.get(pokemonData["species"], 0)  # SPECIES_NONE and unknown species have no bit
+        return dexMask
 
-                if dexNum >= 1:
-                    dexNum -= 1
-                    byteOffset = dexNum // 8
-                    bitOffset = dexNum % 8
-                    bitToSet = (1 << bitOffset)
-                    newSeenFlags[byteOffset] |= bitToSet
-                    newCaughtFlags[byteOffset] |= bitToSet
+    @staticmethod
+    def ApplyPokedexMask(flags: List[int], dexMask: int) -> Tuple[List[int], bool]:
+        oldFlags = int.from_bytes(bytes(flags), "little")
+        newFlags = oldFlags | dexMask
+        return list(newFlags.to_bytes(len(flags), "little")), newFlags != oldFlags
+
+    @staticmethod
+    def UpdatePokedexFlagsWithChange(seenFlags: List[int], caughtFlags: List[int], allPokemonData: List[dict]) -> Tuple[List[int], List[int], bool]:
+        # Also returns whether any flag was newly set, so an unchanged Pokedex doesn't need to be written back
+        dexMask = PokemonProcessing.GetPokedexMask(allPokemonData)
+        newSeenFlags, seenChanged = PokemonProcessing.ApplyPokedexMask(seenFlags, dexMask)
+        newCaughtFlags, caughtChanged = PokemonProcessing.ApplyPokedexMask(caughtFlags, dexMask)
+        return newSeenFlags, newCaughtFlags, seenChanged or caughtChanged
 
+    @staticmethod
+    def UpdatePokedexFlags(seenFlags: List[int], caughtFlags: List[int], allPokemonData: List[dict]) -> Tuple[List[int], List[int]]:
+        newSeenFlags, newCaughtFlags, _ = PokemonProcessing.UpdatePokedexFlagsWithChange(seenFlags, caughtFlags, allPokemonData)
         return newSeenFlags, newCaughtFlags
 
     @staticmethod
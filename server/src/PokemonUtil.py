@@ -3,6 +3,8 @@ import json
 import os
 import random
 from dotenv import load_dotenv
+from json.encoder import encode_basestring_ascii
+from typing import List
 from Defines import Defines
 
 load_dotenv()
@@ -10,6 +12,10 @@ load_dotenv()
 MAX_LEVEL = 100
 NUM_STATS = 6
 CHECKSUM_KEY = os.getenv("CHECKSUM_KEY", "")
+ChecksumIgnoredKeys = {"markings", "checksum", "wonderTradeTimestamp"}
+MaxChecksumKeyOrders = 256
+
+gChecksumKeyOrders = {}  # Key order of a Pokemon dict -> [(key, serialized key)] in json.dumps(sort_keys=True) order
 
 StatIdsToBaseAndEVs = {
     0: ("baseHP", "hpEv"),
@@ -235,19 +241,48 @@ class PokemonUtil:
         return rawStat
 
     @staticmethod
-    def CalculateChecksum(pokemon: dict):        
+    def CalculateChecksum(pokemon: dict):
         if CHECKSUM_KEY == "":
             raise ValueError("Checksum key is not set. Please set CHECKSUM_KEY in the .env file.")
 
-        pokemon = pokemon.copy()  # Don't modify the original Pokemon
-        if "markings" in pokemon:
-            del pokemon["markings"]  # These can be changed on the site so shouldn't be included in the checksum
-        if "checksum" in pokemon:
-            del pokemon["checksum"]  # Don't include an older calculated checksum
-        if "wonderTradeTimestamp" in pokemon:
-            del pokemon["wonderTradeTimestamp"]  # Don't include an added-on Wonder Trade timestamp
+        # Markings can be changed on the site, an older checksum or an added-on Wonder Trade timestamp shouldn't be included either
+        return hashlib.md5((PokemonUtil.SerializeForChecksum(pokemon) + CHECKSUM_KEY).encode("utf-8")).hexdigest()  # Add more text on so people can't create their own checksums with the original data
+
+    @staticmethod
+    def CalculateChecksums(allPokemon: List[dict]) -> List[str]:
+        return [PokemonUtil.CalculateChecksum(pokemon) for pokemon in allPokemon]
+
+    @staticmethod
+    def SerializeForChecksum(pokemon: dict) -> str:
+        # Same text as json.dumps(sort_keys=True) on the Pokemon without the ignored keys (and PythonJSONStringify on the front-end)
+        keyOrder = tuple(pokemon)
+        serializedKeys = gChecksumKeyOrders.get(keyOrder)
+        if serializedKeys is None:
+            if not all(type(key) == str for key in keyOrder):
+                return json.dumps({key: value for key, value in pokemon.items() if key not in ChecksumIgnoredKeys}, sort_keys=True)
+
+            if len(gChecksumKeyOrders) >= MaxChecksumKeyOrders:
+                gChecksumKeyOrders.clear()  # Pokemon from the same source share a key order, so this is rarely hit
+            serializedKeys = [(key, encode_basestring_ascii(key) + ": ") for key in sorted(keyOrder) if key not in ChecksumIgnoredKeys]
+            gChecksumKeyOrders[keyOrder] = serializedKeys
 
-        return hashlib.md5((json.dumps(pokemon, sort_keys=True) + CHECKSUM_KEY).encode("utf-8")).hexdigest()  # Add more text on so people can't create their own checksums with the original data
+        return "{" + ", ".join(serializedKey + PokemonUtil.SerializeChecksumValue(pokemon[key]) for key, serializedKey in serializedKeys) + "}"
+
+    @staticmethod
+    def SerializeChecksumValue(value) -> str:
+        valueType = type(value)
+        if valueType == str:
+            return encode_basestring_ascii(value)
+        elif valueType == int:
+            return int.__repr__(value)
+        elif valueType == bool:
+            return "true" if value else "false"
+        elif value is None:
+            return "null"
+        elif valueType == list:
+            return "[" + ", ".join([PokemonUtil.SerializeChecksumValue(item) for item in value]) + "]"
+
+        return json.dumps(value, sort_keys=True)  # Anything else the Pokemon shouldn't normally have
 
     @staticmethod
     def IsUpdatedDataVersion(pokemon: dict):
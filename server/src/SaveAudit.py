@@ -0,0 +1,114 @@
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Iterator, Set
+
+from BulkProcessing import BulkProcessing, DEFAULT_CHUNK_SIZE, DEFAULT_WORKER_COUNT
+from Defines import Defines, GameDetails
+from SaveBlocks import SaveBlocks
+from SaveBlockProcessing import SaveBlockProcessing
+
+SaveFileExtension = ".sav"
+
+
+class SaveAudit:
+    @staticmethod
+    def AuditSave(saveFilePath: str) -> dict:
+        saveBlocks, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(saveFilePath))  # Full load so "valid" matches /uploadsave
+        result = {"path": saveFilePath, "valid": fileSignature != 0, "fileSignature": fileSignature, "gameName": "",
+                  "oldVersion": "", "randomizer": False, "inaccessibleReason": "", "boxCount": 0, "error": ""}
+
+        try:
+            if Defines.IsOldVersionFileSignature(fileSignature):
+                result["oldVersion"] = Defines.GetOldVersionGameName(fileSignature)
+            elif saveBlocks != {} and fileSignature in GameDetails and BulkProcessing.LoadDefines(fileSignature):
+                # The PC isn't decoded since none of the results depend on it
+                result["gameName"] = Defines.GetCurrentGameName()
+                result["boxCount"] = Defines.BoxCount()
+                result["randomizer"], result["inaccessibleReason"] = SaveBlockProcessing.GetSaveStatus(saveBlocks)
+        except Exception as e:
+            result["error"] = str(e)  # One bad save shouldn't stop the rest of the audit
+
+        return result
+
+    @staticmethod
+    def FindSaveFiles(directory: str, skipPaths: Set[str] = frozenset()) -> Iterator[str]:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()  # Walk in the same order every time
+            for fileName in sorted(files):
+                saveFilePath = os.path.join(root, fileName)
+                if fileName.lower().endswith(SaveFileExtension) and saveFilePath not in skipPaths:
+                    yield saveFilePath
+
+    @staticmethod
+    def LoadCheckpoint(outputFilePath: str) -> Set[str]:
+        auditedPaths = set()
+        if os.path.isfile(outputFilePath):
+            with open(outputFilePath, "r", encoding="utf-8") as outputFile:
+                for line in outputFile:
+                    try:
+                        auditedPaths.add(json.loads(line)["path"])
+                    except (ValueError, KeyError):
+                        pass  # Line was cut off when the last run was stopped
+
+        return auditedPaths
+
+    @staticmethod
+    def TrimPartialLine(outputFilePath: str):
+        # Remove a result that was cut off when the last run was stopped so new results don't get appended to it
+        if os.path.isfile(outputFilePath):
+            with open(outputFilePath, "rb+") as outputFile:
+                data = outputFile.read()
+                if data != b"" and not data.endswith(b"\n"):
+                    outputFile.truncate(data.rfind(b"\n") + 1)
+
+    @staticmethod
+    def Run(directory: str, outputFilePath: str = "", resume: bool = False,
+            workerCount: int = DEFAULT_WORKER_COUNT, chunkSize: int = DEFAULT_CHUNK_SIZE) -> int:
+        skipPaths = SaveAudit.LoadCheckpoint(outputFilePath) if resume and outputFilePath != "" else set()
+        saveFilePaths = SaveAudit.FindSaveFiles(directory, skipPaths)
+
+        if outputFilePath != "":
+            if resume:
+                SaveAudit.TrimPartialLine(outputFilePath)
+            outputFile = open(outputFilePath, "a" if resume else "w", encoding="utf-8")
+        else:
+            outputFile = sys.stdout
+
+        auditedCount = 0
+        startTime = time.perf_counter()
+        try:
+            for result in BulkProcessing.ProcessMany(SaveAudit.AuditSave, saveFilePaths, workerCount, chunkSize):
+                outputFile.write(json.dumps(result) + "\n")
+                outputFile.flush()  # Every written line is a checkpoint
+                auditedCount += 1
+        finally:
+            if outputFile is not sys.stdout:
+                outputFile.close()
+
+        elapsed = time.perf_counter() - startTime
+        filesPerSecond = auditedCount / elapsed if elapsed > 0 else 0
+        print(f"Audited {auditedCount} saves in {elapsed:.2f}s ({filesPerSecond:.1f} files/sec), "
+              f"skipped {len(skipPaths)} already audited", file=sys.stderr)
+        return auditedCount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit every save file in a directory tree and output the results as JSON lines.")
+    parser.add_argument("directory", help="directory to search for .sav files")
+    parser.add_argument("-o", "--output", default="", help="JSONL file to write to instead of stdout")
+    parser.add_argument("-r", "--resume", action="store_true", help="skip saves already in the output file and append to it")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKER_COUNT, help="number of worker processes (default: one per core)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="saves handed to a worker at once")
+    args = parser.parse_args()
+
+    if args.resume and args.output == "":
+        parser.error("--resume needs an --output file to resume from")
+
+    SaveAudit.Run(args.directory, args.output, args.resume, args.workers, args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
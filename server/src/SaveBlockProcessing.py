@@ -3,6 +3,7 @@ from typing import List, Tuple, Dict
 from Defines import Defines, CFRU_NEW_POKEDEX_FLAGS
 from PokemonProcessing import PokemonProcessing, CFRUCompressedPokemonSize
 from SaveBlocks import BlockDataSize
+from SaveTables import FlagTable, VarTable
 from Util import BytesToInt, BytesToString
 
 VanillaBoxSaveSections = list(range(5, 13 + 1))
@@ -55,7 +56,6 @@ CFRUVarsBOffset = 0x450
 CFRUVarsBSize = 0x200 - CFRUVarsASize
 CFRUVarsBEndOffset = CFRUVarsBOffset + CFRUVarsBSize
 
-VARS_START = 0x4000
 
 TrainerDetailsSaveBlock = 0
 TrainerNameLength = 7
@@ -88,6 +88,17 @@ StartingBoxMemoryOffsets = {
     31: 0x0
 }
 
+PCRegions = [  # (first box, number of boxes, [(save block, start offset, end offset)]) for each stretch of box memory
+    (0, VanillaMemoryBoxCount, [(5, StartingBoxMemoryOffsets[5], BlockDataSize)]
+                               + [(i, StartingBoxMemoryOffsets[i], BlockDataSize) for i in VanillaBoxSaveSections[1:]]),
+    (19, 3, [(30, StartingBoxMemoryOffsets[30], BlockDataSize), (31, StartingBoxMemoryOffsets[31], 0xF80)]),
+    (22, 2, [(2, StartingBoxMemoryOffsets[2], BlockDataSize), (3, StartingBoxMemoryOffsets[3], 0xCC0)]),
+    (24, 1, [(0, StartingBoxMemoryOffsets[0], StartingBoxMemoryOffsets[0] + CFRUCompressedPokemonSize * MonsPerBox)]),
+]
+
+gPCLayouts = dict()  # Box count -> spans of every slot in the PC
+gPCRuns = dict()  # Box count -> the PC's spans with the ones next to each other in a block merged
+
 
 class SaveBlockProcessing:
     @staticmethod
@@ -97,44 +108,128 @@ class SaveBlockProcessing:
         else:
             return CFRUPokedexFlagsSaveBlock, CFRUSeenFlagsOffset, CFRUCaughtFlagsOffset, CFRUCaughtFlagsEndOffset
 
+    @staticmethod
+    def GetPCLayout(boxCount: int) -> List[List[Tuple[int, int, int]]]:
+        # Each slot in the PC (box * MonsPerBox + slot) gets a list of one or two (save block, offset, length) spans
+        if boxCount not in gPCLayouts:
+            layout = []
+            for firstBox, regionBoxCount, blockRanges in PCRegions:
+                if firstBox >= boxCount:
+                    break
+
+                blockRanges = iter(blockRanges)
+                saveBlockNum, offset, endOffset = next(blockRanges)
+                for _ in range(min(regionBoxCount, boxCount - firstBox) * MonsPerBox):  # Games can stop partway through a region
+                    spans = []
+                    remaining = CFRUCompressedPokemonSize
+                    while remaining > 0:
+                        if offset >= endOffset:  # Mon continues in the next save block
+                            saveBlockNum, offset, endOffset = next(blockRanges)
+
+                        length = min(remaining, endOffset - offset)
+                        spans.append((saveBlockNum, offset, length))
+                        offset += length
+                        remaining -= length
+                    layout.append(spans)
+
+            gPCLayouts[boxCount] = layout
+
+        return gPCLayouts[boxCount]
+
+    @staticmethod
+    def GetPCRuns(boxCount: int) -> List[Tuple[int, int, int]]:
+        # The whole PC as a few long (save block, offset, length) spans, for reading or writing every slot at once
+        if boxCount not in gPCRuns:
+            runs = []
+            for spans in SaveBlockProcessing.GetPCLayout(boxCount):
+                for saveBlockNum, offset, length in spans:
+                    if runs and runs[-1][0] == saveBlockNum and runs[-1][1] + runs[-1][2] == offset:
+                        runs[-1] = (saveBlockNum, runs[-1][1], runs[-1][2] + length)  # Continues the last span
+                    else:
+                        runs.append((saveBlockNum, offset, length))
+
+            gPCRuns[boxCount] = runs
+
+        return gPCRuns[boxCount]
+
+    @staticmethod
+    def GetPCSlotSpans(box: int, slot: int) -> List[Tuple[int, int, int]]:
+        return SaveBlockProcessing.GetPCLayout(Defines.BoxCount())[box * MonsPerBox + slot]
+
+    @staticmethod
+    def ReadSpans(saveBlocks: Dict[int, List[int]], spans: List[Tuple[int, int, int]]) -> bytes:
+        if len(spans) == 1:  # Most mons are entirely in one save block so don't need to be copied
+            saveBlockNum, offset, length = spans[0]
+            return saveBlocks[saveBlockNum][offset:offset + length]
+
+        return b"".join(bytes(saveBlocks[saveBlockNum][offset:offset + length]) for saveBlockNum, offset, length in spans)
+
     @staticmethod
     def LoadPCPokemon(saveBlocks: Dict[int, List[int]]) -> List[dict]:
         allPokemon = []
 
         if Defines.IsCFRUHack():
-            allBoxes = SaveBlockProcessing.GetAllCFRUBoxesData(saveBlocks)
-            for monOffset in range(0, len(allBoxes), CFRUCompressedPokemonSize):
-                pokemonData = PokemonProcessing.LoadCFRUCompressedMonAtBoxOffset(allBoxes, monOffset)
-                PokemonProcessing.AssignConstantsToCFRUData(pokemonData)
-                allPokemon.append(pokemonData)
+            allPokemon = PokemonProcessing.LoadCFRUMons(SaveBlockProcessing.GetCFRUPCData(saveBlocks))
 
         return allPokemon
 
     @staticmethod
-    def GetAllCFRUBoxesData(saveBlocks: Dict[int, List[int]]) -> List[int]:
+    def LoadBoxPokemon(saveBlocks: Dict[int, List[int]], box: int) -> List[dict]:
+        boxPokemon = []
+
+        if Defines.IsCFRUHack() and 0 <= box < Defines.BoxCount():
+            boxLayout = SaveBlockProcessing.GetPCLayout(Defines.BoxCount())[box * MonsPerBox:(box + 1) * MonsPerBox]
+            boxData = b"".join(bytes(SaveBlockProcessing.ReadSpans(saveBlocks, spans)) for spans in boxLayout)
+            boxPokemon = PokemonProcessing.LoadCFRUMons(boxData)
+
+        return boxPokemon
+
+    @staticmethod
+    def LoadSlotPokemon(saveBlocks: Dict[int, List[int]], box: int, slot: int) -> dict:
+        if Defines.IsCFRUHack() and 0 <= box < Defines.BoxCount() and 0 <= slot < MonsPerBox:
+            return SaveBlockProcessing.LoadCFRUPokemonAtSpans(saveBlocks, SaveBlockProcessing.GetPCSlotSpans(box, slot))
+
+        return {}
+
+    @staticmethod
+    def LoadCFRUPokemonAtSpans(saveBlocks: Dict[int, List[int]], spans: List[Tuple[int, int, int]]) -> dict:
+        pokemonData = PokemonProcessing.LoadCFRUCompressedMonAtBoxOffset(SaveBlockProcessing.ReadSpans(saveBlocks, spans), 0)
+        PokemonProcessing.AssignConstantsToCFRUData(pokemonData)
+        return pokemonData
+
+    @staticmethod
+    def GetAllCFRUBoxesData(saveBlocks: Dict[int, List[int]]) -> bytearray:
         # Get from vanilla box memory: Boxes 1 - 19
-        res = saveBlocks[5][4:]  # First four bytes are current box
+        res = bytearray(saveBlocks[5][4:])  # First four bytes are current box
         for i in VanillaBoxSaveSections[1:]:
-            res += saveBlocks[i]
-        res = res[:VanillaMemoryBoxCount * MonsPerBox * CFRUCompressedPokemonSize]  # Only get mon data
+            res.extend(saveBlocks[i])
+        del res[VanillaMemoryBoxCount * MonsPerBox * CFRUCompressedPokemonSize:]  # Only get mon data
 
         # Get from expanded box memory: Boxes 20 - 22
         if Defines.BoxCount() >= 20:
-            res += saveBlocks[30][StartingBoxMemoryOffsets[30]:BlockDataSize]
-            res += saveBlocks[31][StartingBoxMemoryOffsets[31]:0xF80]
+            res.extend(saveBlocks[30][StartingBoxMemoryOffsets[30]:BlockDataSize])
+            res.extend(saveBlocks[31][StartingBoxMemoryOffsets[31]:0xF80])
 
         # Get from expanded box memory: Boxes 23 - 24
         if Defines.BoxCount() >= 23:
-            res += saveBlocks[2][StartingBoxMemoryOffsets[2]:BlockDataSize]
-            res += saveBlocks[3][StartingBoxMemoryOffsets[3]:0xCC0]
+            res.extend(saveBlocks[2][StartingBoxMemoryOffsets[2]:BlockDataSize])
+            res.extend(saveBlocks[3][StartingBoxMemoryOffsets[3]:0xCC0])
 
         # Get from expanded box memory: Box 25
         if Defines.BoxCount() >= 25:
-            res += saveBlocks[0][
-                StartingBoxMemoryOffsets[0]:StartingBoxMemoryOffsets[0] + CFRUCompressedPokemonSize * MonsPerBox]
+            res.extend(saveBlocks[0][
+                StartingBoxMemoryOffsets[0]:StartingBoxMemoryOffsets[0] + CFRUCompressedPokemonSize * MonsPerBox])
 
         return res
 
+    @staticmethod
+    def GetCFRUPCData(saveBlocks: Dict[int, List[int]]) -> bytearray:
+        # Every slot's record back to back, in the same order as the PC layout
+        pcData = bytearray()
+        for saveBlockNum, offset, length in SaveBlockProcessing.GetPCRuns(Defines.BoxCount()):
+            pcData.extend(saveBlocks[saveBlockNum][offset:offset + length])
+        return pcData
+
     @staticmethod
     def LoadCFRUBoxTitles(saveBlocks: Dict[int, List[int]]) -> List[str]:
         titles = []
@@ -142,9 +237,7 @@ class SaveBlockProcessing:
         if Defines.IsCFRUHack():
             numBoxesAfterVanillaAmount = Defines.BoxCount() - VanillaFRBoxCount  # 11 for 25 boxes
             titleData = saveBlocks[BoxNamesSaveBlock][BoxNamesEndOffset - BoxNameLength * Defines.BoxCount():BoxNamesEndOffset]
-            for i in range(0, len(titleData), BoxNameLength):
-                title = titleData[i:i + BoxNameLength]
-                title = BytesToString(title)
+            for title in Defines.charMapCodec.DecodeMany(titleData[i:i + BoxNameLength] for i in range(0, len(titleData), BoxNameLength)):
                 if title.lower().startswith("box") and len(title) >= 4 and title[3].isdigit():
                     title = title[:3] + " " + title[3:]  # Change titles like "Box24" to change to "Box 24"
                 titles.append(title)
@@ -160,8 +253,8 @@ class SaveBlockProcessing:
         if Defines.IsCFRUHack():
             dexFlagsSaveBlock, seenFlagsOffset, caughtFlagsOffset, caughtFlagsEndOffset = SaveBlockProcessing.GetCFRUPokedexFlagsOffsets()
             if dexFlagsSaveBlock in saveBlocks:
-                seenFlags = saveBlocks[dexFlagsSaveBlock][seenFlagsOffset:caughtFlagsOffset]
-                caughtFlags = saveBlocks[dexFlagsSaveBlock][caughtFlagsOffset:caughtFlagsEndOffset]
+                seenFlags = list(saveBlocks[dexFlagsSaveBlock][seenFlagsOffset:caughtFlagsOffset])
+                caughtFlags = list(saveBlocks[dexFlagsSaveBlock][caughtFlagsOffset:caughtFlagsEndOffset])
         else:
             raise Exception("Pokedex flags not implemented for non-CFRU hacks")
 
@@ -184,92 +277,77 @@ class SaveBlockProcessing:
 
     @staticmethod
     def IsRandomizedSave(saveBlocks: Dict[int, List[int]]) -> bool:
-        randomizerFlags = Defines.GetRandomizerFlags()
-        for flag in randomizerFlags:
-            if SaveBlockProcessing.FlagGet(flag, saveBlocks):
-                return True
+        if Defines.GetSaveRules().IsRandomized(SaveBlockProcessing.GetFlagTable(saveBlocks)):
+            return True
 
         return SaveBlockProcessing.IsGerbenFile(saveBlocks)
 
     @staticmethod
-    def FlagGet(flag: int, saveBlocks: Dict[int, List[int]]) -> bool:
+    def GetSaveStatus(saveBlocks: Dict[int, List[int]]) -> Tuple[bool, str]:
+        # Whether the save is randomized and why it can't be used (or "" if it can), checked together
+        if saveBlocks == {}:
+            return False, "Saveblocks are empty."
+
+        randomizer, inaccessibleReason = Defines.GetSaveRules().Evaluate(SaveBlockProcessing.GetFlagTable(saveBlocks),
+                                                                         SaveBlockProcessing.GetVarTable(saveBlocks))
+        return randomizer or SaveBlockProcessing.IsGerbenFile(saveBlocks), inaccessibleReason
+
+    @staticmethod
+    def GetFlagTable(saveBlocks: Dict[int, List[int]]) -> FlagTable:
+        if type(saveBlocks) != dict and "flags" in saveBlocks.decoded:
+            return saveBlocks.decoded["flags"]  # Already decoded for this save
+
         if Defines.IsCFRUHack():
-            if flag < 0x900:
-                if VanillaFlagsASaveBlock in saveBlocks and VanillaFlagsBSaveBlock in saveBlocks:
-                    flags = saveBlocks[VanillaFlagsASaveBlock][VanillaFlagsAOffset:VanillaFlagsAEndOffset] \
-                          + saveBlocks[VanillaFlagsBSaveBlock][VanillaFlagsBOffset:VanillaFlagsBEndOffset]
-                    return (flags[flag // 8] & (1 << (flag % 8))) != 0
-            elif flag >= 0x900 and flag < 0x1900:
-                if CFRUFlagsASaveBlock in saveBlocks and CFRUFlagsBSaveBlock in saveBlocks:
-                    flags = saveBlocks[CFRUFlagsASaveBlock][CFRUFlagsAOffset:CFRUFlagsAEndOffset] \
-                          + saveBlocks[CFRUFlagsBSaveBlock][CFRUFlagsBOffset:CFRUFlagsBEndOffset]
-                    return (flags[(flag - 0x900) // 8] & (1 << (flag % 8))) != 0
-
-            raise ValueError(f"Flag \"{flag}\" is not wihin the valid range")
+            vanillaFlags, cfruFlags = None, None
+            if VanillaFlagsASaveBlock in saveBlocks and VanillaFlagsBSaveBlock in saveBlocks:
+                vanillaFlags = bytes(saveBlocks[VanillaFlagsASaveBlock][VanillaFlagsAOffset:VanillaFlagsAEndOffset]) \
+                             + bytes(saveBlocks[VanillaFlagsBSaveBlock][VanillaFlagsBOffset:VanillaFlagsBEndOffset])
+            if CFRUFlagsASaveBlock in saveBlocks and CFRUFlagsBSaveBlock in saveBlocks:
+                cfruFlags = bytes(saveBlocks[CFRUFlagsASaveBlock][CFRUFlagsAOffset:CFRUFlagsAEndOffset]) \
+                          + bytes(saveBlocks[CFRUFlagsBSaveBlock][CFRUFlagsBOffset:CFRUFlagsBEndOffset])
+            flagTable = FlagTable(vanillaFlags, cfruFlags)
         else:
-            return False
+            flagTable = FlagTable(None, None, supported=False)
+
+        if type(saveBlocks) != dict:
+            saveBlocks.decoded["flags"] = flagTable
+        return flagTable
 
     @staticmethod
-    def VarGet(var: int, saveBlocks: Dict[int, List[int]]) -> int:
+    def GetVarTable(saveBlocks: Dict[int, List[int]]) -> VarTable:
+        if type(saveBlocks) != dict and "vars" in saveBlocks.decoded:
+            return saveBlocks.decoded["vars"]  # Already decoded for this save
+
         if Defines.IsCFRUHack():
-            varsStart = 0
-            if var >= VARS_START and var < VARS_START + 0x100:
-                if VanillaVarsSaveBlock in saveBlocks:
-                    vars = saveBlocks[VanillaVarsSaveBlock][VanillaVarsOffset:VanillaVarsEndOffset]
-                    varsStart = VARS_START
-            elif var >= 0x5000 and var < 0x5200:
-                if CFRUVarsASaveBlock in saveBlocks and CFRUVarsBSaveBlock in saveBlocks:
-                    vars = saveBlocks[CFRUVarsASaveBlock][CFRUVarsAOffset:CFRUVarsAEndOffset] \
-                         + saveBlocks[CFRUVarsBSaveBlock][CFRUVarsBOffset:CFRUVarsBEndOffset]
-                    varsStart = 0x5000
-
-            if varsStart != 0:
-                return BytesToInt(vars[(var - varsStart) * 2:(var - varsStart) * 2 + 2])
-
-            raise ValueError(f"Var \"{var}\" is not wihin the valid range")
+            vanillaVars, cfruVars = None, None
+            if VanillaVarsSaveBlock in saveBlocks:
+                vanillaVars = bytes(saveBlocks[VanillaVarsSaveBlock][VanillaVarsOffset:VanillaVarsEndOffset])
+            if CFRUVarsASaveBlock in saveBlocks and CFRUVarsBSaveBlock in saveBlocks:
+                cfruVars = bytes(saveBlocks[CFRUVarsASaveBlock][CFRUVarsAOffset:CFRUVarsAEndOffset]) \
+                         + bytes(saveBlocks[CFRUVarsBSaveBlock][CFRUVarsBOffset:CFRUVarsBEndOffset])
+            varTable = VarTable(vanillaVars, cfruVars)
         else:
-            return -1
+            varTable = VarTable(None, None, supported=False)
+
+        if type(saveBlocks) != dict:
+            saveBlocks.decoded["vars"] = varTable
+        return varTable
+
+    @staticmethod
+    def FlagGet(flag: int, saveBlocks: Dict[int, List[int]]) -> bool:
+        return SaveBlockProcessing.GetFlagTable(saveBlocks).Get(flag)
+
+    @staticmethod
+    def VarGet(var: int, saveBlocks: Dict[int, List[int]]) -> int:
+        return SaveBlockProcessing.GetVarTable(saveBlocks).Get(var)
 
     @staticmethod
     def GetInaccessibleReason(saveBlocks: Dict[int, List[int]]) -> str:
         if saveBlocks == {}:
             return "Saveblocks are empty."
 
-        conditions = Defines.GetInaccessibleConditions()
-        for condition in conditions:
-            if "butNotIfFlagSet" in condition:
-                if type(condition["butNotIfFlagSet"]) == list:
-                    skipCondition = False
-                    for flag in condition["butNotIfFlagSet"]:
-                        if SaveBlockProcessing.FlagGet(flag, saveBlocks):
-                            skipCondition = True
-                            break
-
-                    if skipCondition:  # At least one flag is set
-                        continue
-                else:
-                    flag = condition["butNotIfFlagSet"]
-                    if SaveBlockProcessing.FlagGet(flag, saveBlocks):
-                        continue
-
-            if "flagSet" in condition:
-                flag = condition["flagSet"]
-                if SaveBlockProcessing.FlagGet(flag, saveBlocks):
-                    return condition["reason"]
-            elif "flagNotSet" in condition:
-                flag = condition["flagNotSet"]
-                if not SaveBlockProcessing.FlagGet(flag, saveBlocks):
-                    return condition["reason"]
-            elif "varSetTo" in condition:
-                var, value = condition["varSetTo"]
-                if SaveBlockProcessing.VarGet(var, saveBlocks) == value:
-                    return condition["reason"]
-            elif "varNotSetTo" in condition:
-                var, value = condition["varNotSetTo"]
-                if SaveBlockProcessing.VarGet(var, saveBlocks) != value:
-                    return condition["reason"]
-
-        return ""
+        return Defines.GetSaveRules().GetInaccessibleReason(SaveBlockProcessing.GetFlagTable(saveBlocks),
+                                                            SaveBlockProcessing.GetVarTable(saveBlocks))
 
     @staticmethod
     def IsAccessibleCurrently(saveBlocks: Dict[int, List[int]]) -> bool:
@@ -277,39 +355,44 @@ class SaveBlockProcessing:
 
 
     ### Code for updating save files ###
+    @staticmethod
+    def CopySaveBlocks(saveBlocks: Dict[int, List[int]]) -> Dict[int, List[int]]:
+        if type(saveBlocks) != dict:
+            return saveBlocks.Copy()  # Save images only copy blocks when they're written to
+
+        return copy.deepcopy(saveBlocks)
+
     @staticmethod
     def UpdateCFRUBoxData(saveBlocks: Dict[int, List[int]], allPokemonData: List[dict]) -> Dict[int, List[int]]:
-        saveBlocks = copy.deepcopy(saveBlocks)
-        allCompressedMons = PokemonProcessing.GetAllCFRUCompressedMons(allPokemonData)
+        saveBlocks = SaveBlockProcessing.CopySaveBlocks(saveBlocks)
+        allCompressedMons = PokemonProcessing.GetAllCFRUCompressedMonsData(allPokemonData)
+        SaveBlockProcessing.SaveSpans(saveBlocks, SaveBlockProcessing.GetPCRuns(Defines.BoxCount()), allCompressedMons)
+        return saveBlocks
 
-        endOfBox19Memory = VanillaMemoryBoxCount * MonsPerBox * CFRUCompressedPokemonSize
-        box1to19 = allCompressedMons[:endOfBox19Memory]
-        endOfBox22Memory = endOfBox19Memory + 3 * MonsPerBox * CFRUCompressedPokemonSize
-        box20to22 = allCompressedMons[endOfBox19Memory:endOfBox22Memory]
-        endOfBox24Memory = endOfBox22Memory + 2 * MonsPerBox * CFRUCompressedPokemonSize
-        box23to24 = allCompressedMons[endOfBox22Memory:endOfBox24Memory]
-        endOfBox25Memory = endOfBox24Memory + 1 * MonsPerBox * CFRUCompressedPokemonSize
-        box25 = allCompressedMons[endOfBox24Memory:endOfBox25Memory]
+    @staticmethod
+    def UpdateCFRUSlots(saveBlocks: Dict[int, List[int]], edits: List[Tuple[int, int, dict]]) -> Dict[int, List[int]]:
+        # Only the edited (box, slot, Pokemon) are re-encoded and written, the rest of the PC is left as is
+        saveBlocks = SaveBlockProcessing.CopySaveBlocks(saveBlocks)
 
-        SaveBlockProcessing.SaveBoxMemory(box1to19, endOfBox19Memory, saveBlocks, 5)
+        for box, slot, pokemonData in edits:
+            if box < 0 or box >= Defines.BoxCount() or slot < 0 or slot >= MonsPerBox:
+                raise ValueError(f"Invalid PC slot: box {box}, slot {slot}")
 
-        if Defines.BoxCount() >= 20:
-            SaveBlockProcessing.SaveBoxMemory(box20to22, endOfBox22Memory - endOfBox19Memory, saveBlocks, 30)
-        
-        if Defines.BoxCount() >= 23:
-            SaveBlockProcessing.SaveBoxMemory(box23to24, endOfBox24Memory - endOfBox22Memory, saveBlocks, 2)
-        
-        if Defines.BoxCount() >= 25:
-            SaveBlockProcessing.SaveBoxMemory(box25, endOfBox25Memory - endOfBox24Memory, saveBlocks, 0)
+            compressedMon = PokemonProcessing.ConvertPokemonToCFRUCompressedMon(pokemonData, box + 1)
+            SaveBlockProcessing.SaveSpans(saveBlocks, SaveBlockProcessing.GetPCSlotSpans(box, slot), compressedMon)
 
-        assert (box1to19 + box20to22 + box23to24 + box25 == allCompressedMons)
-        assert (box25 == allCompressedMons[endOfBox24Memory:])
         return saveBlocks
 
     @staticmethod
-    def SaveBoxMemory(memToSave: List[int], endOfMemory: int, saveBlocks: Dict[int, List[int]], startingSaveBlockNum: int):
-        SaveBlockProcessing.SaveMemorySubset(saveBlocks, startingSaveBlockNum, memToSave,
-                                             StartingBoxMemoryOffsets[startingSaveBlockNum], endOfMemory)
+    def SaveSpans(saveBlocks: Dict[int, List[int]], spans: List[Tuple[int, int, int]], memToSave: List[int]):
+        spansLength = sum(length for _, _, length in spans)
+        if len(memToSave) < spansLength:  # Checked first so a save is never left half written
+            raise ValueError(f"Not enough data to save: {len(memToSave)} bytes for {spansLength}")
+
+        memOffset = 0
+        for saveBlockNum, offset, length in spans:
+            SaveBlockProcessing.SaveSpan(saveBlocks, saveBlockNum, offset, memToSave[memOffset:memOffset + length])
+            memOffset += length
 
     @staticmethod
     def SaveMemorySubset(saveBlocks: Dict[int, List[int]], startingSaveBlockNum: int, memToSave: List[int], memOffsetStart: int,
@@ -318,18 +401,29 @@ class SaveBlockProcessing:
         saveBlockOffset = memOffsetStart
         memOffset = 0
         while memOffset < endOfMemory:
-            saveBlocks[saveBlockNum][saveBlockOffset] = memToSave[memOffset]
-            memOffset += 1
-            saveBlockOffset += 1
-            if saveBlockOffset >= BlockDataSize:  # Loop around to next save block
+            length = min(endOfMemory - memOffset, BlockDataSize - saveBlockOffset)  # Rest of the memory or rest of the save block
+            SaveBlockProcessing.SaveSpan(saveBlocks, saveBlockNum, saveBlockOffset, memToSave[memOffset:memOffset + length])
+            memOffset += length
+            if memOffset < endOfMemory:  # Loop around to next save block
                 saveBlockNum += 1
                 saveBlockOffset = StartingBoxMemoryOffsets[saveBlockNum]
 
+    @staticmethod
+    def SaveSpan(saveBlocks: Dict[int, List[int]], saveBlockNum: int, saveBlockOffset: int, memToSave: List[int]):
+        saveBlock = saveBlocks[saveBlockNum]
+        endOffset = saveBlockOffset + len(memToSave)
+        memToSave = list(memToSave) if type(saveBlock) == list else bytes(memToSave)
+
+        if saveBlock[saveBlockOffset:endOffset] != memToSave:
+            if type(saveBlocks) != dict:  # Save images copy a block the first time it's written to and track the change
+                saveBlock = saveBlocks.GetWritableBlock(saveBlockNum)
+            saveBlock[saveBlockOffset:endOffset] = memToSave
+
     @staticmethod
     def UpdatePokedexFlags(saveBlocks: Dict[int, List[int]], seenFlags: List[int], caughtFlags: List[int]) -> Dict[int, List[int]]:
         if Defines.IsCFRUHack():
             dexFlagsSaveBlock, seenFlagsOffset, caughtFlagsOffset, _ = SaveBlockProcessing.GetCFRUPokedexFlagsOffsets()
-            saveBlocks = copy.deepcopy(saveBlocks)
+            saveBlocks = SaveBlockProcessing.CopySaveBlocks(saveBlocks)
             SaveBlockProcessing.SaveMemorySubset(saveBlocks, dexFlagsSaveBlock, seenFlags, seenFlagsOffset, len(seenFlags))
             SaveBlockProcessing.SaveMemorySubset(saveBlocks, dexFlagsSaveBlock, caughtFlags, caughtFlagsOffset, len(caughtFlags))
         else:
@@ -1,8 +1,9 @@
 import os
+import struct
 from typing import BinaryIO, List, Dict, Tuple
 
 from Defines import Defines
-from Util import BytesToInt, ConvertToReverseByteList
+from Util import BytesToInt
 
 SaveBlockNumbers = list(range(0, 13 + 1)) + [30, 31]
 SaveSize = 0xE000
@@ -12,76 +13,188 @@ BlockIdOffset = 0xFF4
 ChecksumOffset = 0xFF6  # Addition of all bytes in saveblock after overflow
 FileSignatureOffset = 0xFF8  # Unique id for the game
 SaveIndexOffset = 0xFFC  # Goes up by 1 each time the game is saved
+BlocksPerSave = SaveSize // BlockSize
+FileBlockCount = 0x20000 // BlockSize  # Both saves + save blocks 30 & 31
+FooterStruct = struct.Struct("<4xHHII")  # Unused, Block Id, Checksum, File Signature, Save Index
+FooterTableStruct = struct.Struct("<" + f"{FooterStruct.format[1:]}{BlockDataSize}x" * (FileBlockCount - 1) + FooterStruct.format[1:])  # Every footer in the file at once
+
+ChecksumSizes = {  # Blocks that don't use all of their data in the checksum
+    0: 0xF24,
+    4: 0xD98,
+    13: 0x450,
+}
+ChecksumStructs = {size: struct.Struct(f"<{size // 4}I") for size in set(ChecksumSizes.values()) | {BlockDataSize}}  # Every 4-byte word of the block
+
+
+class InvalidBlockError(ValueError):
+    pass  # A lazily loaded block's checksum didn't match its footer
+
+
+class SaveImage:
+    def __init__(self, saveData: bytes, blockOffsets: Dict[int, int], uncheckedBlocks: Dict[int, int] = None):
+        self.data = bytes(saveData)  # The entire save file as it was loaded, never modified
+        self.blockOffsets = blockOffsets  # Block id -> offset of the block's data in the file
+        self.view = memoryview(self.data)
+        self.uncheckedBlocks = dict(uncheckedBlocks or {})  # Block id -> checksum from its footer, checked the first time the block is read
+        self.modifiedBlocks = dict()  # Block id -> this image's own copy of the block, made the first time it's written to
+        self.dirtyBlocks = set()  # Blocks that have been modified since the save was loaded
+        self.decoded = dict()  # Values decoded from the blocks, cleared whenever a block is written to
+
+    def __getitem__(self, blockId: int) -> memoryview:
+        if blockId in self.modifiedBlocks:
+            return memoryview(self.modifiedBlocks[blockId])
+
+        return self.GetOriginalBlock(blockId)  # Read-only until GetWritableBlock is called
+
+    def __contains__(self, blockId: int) -> bool:
+        return blockId in self.blockOffsets
+
+    def __iter__(self):
+        return iter(self.blockOffsets)
+
+    def __len__(self) -> int:
+        return len(self.blockOffsets)
+
+    def __deepcopy__(self, memo: dict):
+        return self.Copy()
+
+    def keys(self):
+        return self.blockOffsets.keys()
+
+    def items(self):
+        return [(blockId, self[blockId]) for blockId in self.blockOffsets]
+
+    def Copy(self):
+        # The loaded save is shared, so only blocks that were already modified need to be copied
+        saveImage = SaveImage(self.data, self.blockOffsets, self.uncheckedBlocks)
+        for blockId, blockData in self.modifiedBlocks.items():
+            saveImage.modifiedBlocks[blockId] = bytearray(blockData)
+        saveImage.dirtyBlocks = self.dirtyBlocks.copy()
+        saveImage.decoded = self.decoded.copy()  # Still matches the blocks
+        return saveImage
+
+    def GetWritableBlock(self, blockId: int) -> memoryview:
+        if blockId not in self.modifiedBlocks:
+            self.modifiedBlocks[blockId] = bytearray(self.GetOriginalBlock(blockId))
+
+        self.MarkDirty(blockId)
+        self.decoded.clear()  # Could be out of date after the write
+        return memoryview(self.modifiedBlocks[blockId])
+
+    def GetOriginalBlock(self, blockId: int) -> memoryview:
+        offset = self.blockOffsets[blockId]
+        if blockId in self.uncheckedBlocks:
+            self.CheckBlock(blockId, offset)
+
+        return self.view[offset:offset + BlockDataSize]
+
+    def CheckBlock(self, blockId: int, offset: int):
+        if SaveBlocks.CalculateChecksumAtOffset(self.data, offset, blockId) != self.uncheckedBlocks[blockId]:
+            raise InvalidBlockError(f"Save block {blockId} has an invalid checksum")
+
+        self.uncheckedBlocks.pop(blockId, None)  # Only needs to be checked once
+
+    def Rollback(self):
+        self.modifiedBlocks.clear()
+        self.dirtyBlocks.clear()
+        self.decoded.clear()
+
+    def MarkDirty(self, blockId: int):
+        self.dirtyBlocks.add(blockId)
+
+    def DirtyBlockCount(self) -> int:
+        return len(self.dirtyBlocks)
 
 
 class SaveBlocks:
     @staticmethod
     def LoadAll(saveFile: str) -> Tuple[Dict[int, List[int]], int]:
-        # Validate the save file first
-        if not SaveBlocks.Validate(saveFile):
-            return [{}, 0]
+        saveImage, fileSignature = SaveBlocks.LoadAllFromData(SaveBlocks.ReadSaveFile(saveFile))
+        if saveImage == {}:
+            return [{}, fileSignature]
 
-        saveBlocks = SaveBlocks.CreateBlankDict()  # Get the storage dict for the final data
-
-        with open(saveFile, "rb") as binaryFile:
-            if SaveBlocks.UsesSaveIndexA(binaryFile):
-                saveOffset = 0
-            else:
-                saveOffset = SaveSize
+        return {blockId: list(saveBlockData) for blockId, saveBlockData in saveImage.items()}, fileSignature
 
-            # Extract File Signature
-            binaryFile.seek(saveOffset + FileSignatureOffset)
-            fileSignature = BytesToInt(binaryFile.read(4))
-    
-            # Extract Save Blocks
-            for blockOffset in range(0, SaveSize, BlockSize):
-                blockId, saveBlockData = SaveBlocks.LoadOne(binaryFile, saveOffset, blockOffset)
+    @staticmethod
+    def LoadAllFromData(saveData: bytes, lazy: bool = False) -> Tuple[SaveImage, int]:
+        # With lazy, only the footers are validated here and each block's checksum is checked the first time it's read
+        # This is for checks that only need a few blocks, and the save that isn't used is never checked at all
+        # Validate the save data first
+        if not SaveBlocks.IsValidSize(saveData):
+            return [{}, 0]
 
-                if blockId in saveBlocks:
-                    saveBlocks[blockId] = saveBlockData
+        footers = SaveBlocks.LoadFooterTable(saveData)
+        if lazy:
+            if SaveBlocks.GetSavesToValidate(footers) == []:
+                return [{}, 0]
+        elif not SaveBlocks.ValidateDataWithFooters(saveData, footers):
+            return [{}, 0]
 
-            # Extract Boxes 20 - 22 (Save Blocks 30 & 31)
-            for i in range(30, 31 + 1):
-                saveBlocks[i] = SaveBlocks.LoadOne(binaryFile, 0, i * BlockSize)[1]
+        firstBlock = SaveBlocks.GetMainSaveFirstBlock(footers)
 
+        # Extract File Signature
+        fileSignature = footers[firstBlock][2]
         if Defines.IsOldVersionFileSignature(fileSignature):
             return [{}, fileSignature]  # Return the file signature so the player can be notified to update their version
 
-        return saveBlocks, fileSignature
+        # Locate Save Blocks
+        blockOffsets = dict()  # Where each save block can be found in the file
+        for fileBlock in range(firstBlock, firstBlock + BlocksPerSave):
+            blockOffsets[footers[fileBlock][0]] = fileBlock * BlockSize
+
+        # Locate Boxes 20 - 22 (Save Blocks 30 & 31)
+        for i in range(30, 31 + 1):
+            blockOffsets[i] = i * BlockSize
+
+        if any(blockId not in blockOffsets for blockId in SaveBlockNumbers):
+            return [{}, 0]  # Main save doesn't have every block
+
+        blockOffsets = {blockId: blockOffsets[blockId] for blockId in SaveBlockNumbers}  # Keep blocks in numerical order
+        uncheckedBlocks = dict()
+        if lazy:
+            uncheckedBlocks = {blockId: checksum for blockId, checksum, _, _ in footers[firstBlock:firstBlock + BlocksPerSave]}
+        return SaveImage(saveData, blockOffsets, uncheckedBlocks), fileSignature
 
     @staticmethod
     def LoadOne(binaryFile: BinaryIO, saveOffset: int, blockOffset: int) -> Tuple[int, List[int]]:
-        offset = saveOffset + blockOffset
+        binaryFile.seek(0)
+        blockId, saveBlockData = SaveBlocks.LoadOneFromData(binaryFile.read(), saveOffset, blockOffset)
+        return blockId, list(saveBlockData)
 
-        # Load Block Id
-        binaryFile.seek(offset + BlockIdOffset)
-        blockId = BytesToInt(binaryFile.read(2))
+    @staticmethod
+    def LoadOneFromData(saveData: bytes, saveOffset: int, blockOffset: int) -> Tuple[int, memoryview]:
+        offset = saveOffset + blockOffset
+        blockId = BytesToInt(saveData[offset + BlockIdOffset:offset + BlockIdOffset + 2])
+        saveBlockData = memoryview(saveData)[offset:offset + BlockDataSize]  # No copy of the underlying data
+        return blockId, saveBlockData
 
-        # Load Data
-        binaryFile.seek(offset)
-        saveBlockData = list(binaryFile.read(BlockDataSize))
+    @staticmethod
+    def ReadSaveFile(saveFile: str) -> bytes:
+        if not os.path.isfile(saveFile):
+            return b""
 
-        return blockId, saveBlockData
+        with open(saveFile, "rb") as binaryFile:
+            return binaryFile.read()  # The entire save is only 128 kb so it's read in one go
 
     @staticmethod
-    def UsesSaveIndexA(binaryFile) -> bool:
-        # Get Save Index of Save A
-        offset = 0
-        binaryFile.seek(offset + SaveIndexOffset)
-        saveIndexA = BytesToInt(binaryFile.read(4))
+    def LoadFooterTable(saveData: bytes) -> List[Tuple[int, int, int, int]]:
+        # Each block in the file gets a tuple of (block id, checksum, file signature, save index)
+        footerData = FooterTableStruct.unpack_from(saveData, BlockDataSize)
+        return list(zip(footerData[0::4], footerData[1::4], footerData[2::4], footerData[3::4]))
 
-        # Extract File Signature of Save A
-        binaryFile.seek(offset + FileSignatureOffset)
-        fileSignatureA = BytesToInt(binaryFile.read(4))
+    @staticmethod
+    def GetMainSaveFirstBlock(footers: List[Tuple[int, int, int, int]]) -> int:
+        # Same save that's validated when only one of them can be used, eg. when the other one's file signature was erased
+        firstBlocks = SaveBlocks.GetSavesToValidate(footers)
+        if len(firstBlocks) == 1:
+            return firstBlocks[0]
 
-        # Get Save Index of Save B
-        offset = SaveSize
-        binaryFile.seek(offset + SaveIndexOffset)
-        saveIndexB = BytesToInt(binaryFile.read(4))
+        return 0 if SaveBlocks.UsesSaveIndexA(footers) else BlocksPerSave
 
-        # Extract File Signature of Save B
-        binaryFile.seek(offset + FileSignatureOffset)
-        fileSignatureB = BytesToInt(binaryFile.read(4))
+    @staticmethod
+    def UsesSaveIndexA(footers: List[Tuple[int, int, int, int]]) -> bool:
+        _, _, fileSignatureA, saveIndexA = footers[0]
+        _, _, fileSignatureB, saveIndexB = footers[BlocksPerSave]
 
         # Determine Correct Save Offset
         if saveIndexA == 0xFFFFFFFF and fileSignatureA == 0xFFFFFFFF:  # Save 1 is empty
@@ -91,54 +204,84 @@ class SaveBlocks:
 
         return saveIndexA >= saveIndexB  # Main save is one with higher save index
 
+    @staticmethod
+    def IsValidSize(saveData: bytes) -> bool:
+        return len(saveData) == 0x20000 \
+            or len(saveData) == 0x20010  # 128 kb or Flashcart 128kb
+
     @staticmethod
     def Validate(saveFile: str) -> bool:
-        if not os.path.isfile(saveFile) \
-                or (os.path.getsize(saveFile) != 0x20000  # 128 kb
-                 and os.path.getsize(saveFile) != 0x20010):  # Flashcart 128kb
+        return SaveBlocks.ValidateData(SaveBlocks.ReadSaveFile(saveFile))
+
+    @staticmethod
+    def ValidateData(saveData: bytes) -> bool:
+        if not SaveBlocks.IsValidSize(saveData):
             return False
 
-        with open(saveFile, "rb") as binaryFile:
-            binaryFile.seek(FileSignatureOffset)
-            fileSignatureA = binaryFile.read(4)
-            if BytesToInt(fileSignatureA) == 0xFFFFFFFF:  # Save 1 is empty
-                # Check save 2 is good and is the first save
-                if not SaveBlocks.ValidateSave(binaryFile, SaveSize, SaveSize * 2):
-                    return False
-
-                binaryFile.seek(SaveSize + SaveIndexOffset)  # Save count of actual save
-                return BytesToInt(binaryFile.read(2)) == 1  # Save 2 should be the first time the game was saved
-
-            binaryFile.seek(SaveSize + FileSignatureOffset)
-            fileSignatureB = binaryFile.read(4)
-            if BytesToInt(fileSignatureB) == 0xFFFFFFFF:  # Save 2 is empty
-                # Check save 1 is good and is the first save
-                if not SaveBlocks.ValidateSave(binaryFile, 0, SaveSize):
-                    return False
-
-                binaryFile.seek(SaveIndexOffset)  # Save count of actual save
-                return BytesToInt(binaryFile.read(2)) == 1  # Save 1 should be the first time the game was saved
-
-            if fileSignatureA != fileSignatureB:  # In the process of updating (eg. after the file signature was changed due to new species added)
-                if SaveBlocks.UsesSaveIndexA(binaryFile):
-                    return SaveBlocks.ValidateSave(binaryFile, 0, SaveSize)  # Only validate first save
-                else:
-                    return SaveBlocks.ValidateSave(binaryFile, SaveSize, SaveSize * 2)  # Only validate second save
-
-            return SaveBlocks.ValidateSave(binaryFile, 0, SaveSize) \
-                and SaveBlocks.ValidateSave(binaryFile, SaveSize, SaveSize * 2)  # Both saves must be valid for use
+        return SaveBlocks.ValidateDataWithFooters(saveData, SaveBlocks.LoadFooterTable(saveData))
+
+    @staticmethod
+    def ValidateDataWithFooters(saveData: bytes, footers: List[Tuple[int, int, int, int]]) -> bool:
+        firstBlocks = SaveBlocks.GetSavesToValidate(footers)
+        return firstBlocks != [] \
+            and all(SaveBlocks.ValidateSaveChecksums(saveData, footers, firstBlock) for firstBlock in firstBlocks)
+
+    @staticmethod
+    def GetSavesToValidate(footers: List[Tuple[int, int, int, int]]) -> List[int]:
+        # The first file block of each save whose checksums need to be valid, or [] if the footers are bad
+        # Footers are checked first so garbage can be rejected before any checksums are calculated
+        _, _, fileSignatureA, saveIndexA = footers[0]
+        _, _, fileSignatureB, saveIndexB = footers[BlocksPerSave]
+
+        if fileSignatureA == 0xFFFFFFFF:  # Save 1 is empty
+            # Check save 2 is good and is the first save
+            if SaveBlocks.ValidateSaveFooters(footers, BlocksPerSave) \
+            and (saveIndexB & 0xFFFF) == 1:  # Save 2 should be the first time the game was saved
+                return [BlocksPerSave]
+            return []
+
+        if fileSignatureB == 0xFFFFFFFF:  # Save 2 is empty
+            # Check save 1 is good and is the first save
+            if SaveBlocks.ValidateSaveFooters(footers, 0) \
+            and (saveIndexA & 0xFFFF) == 1:  # Save 1 should be the first time the game was saved
+                return [0]
+            return []
+
+        if fileSignatureA != fileSignatureB:  # In the process of updating (eg. after the file signature was changed due to new species added)
+            if SaveBlocks.UsesSaveIndexA(footers):
+                firstBlocks = [0]  # Only validate first save
+            else:
+                firstBlocks = [BlocksPerSave]  # Only validate second save
+        else:
+            firstBlocks = [0, BlocksPerSave]  # Both saves must be valid for use
+
+        if all(SaveBlocks.ValidateSaveFooters(footers, firstBlock) for firstBlock in firstBlocks):
+            return firstBlocks
+        return []
 
     @staticmethod
     def ValidateSave(binaryFile: BinaryIO, startOffset: int, endOffset: int) -> bool:
+        binaryFile.seek(0)
+        return SaveBlocks.ValidateSaveData(binaryFile.read(), startOffset, endOffset)
+
+    @staticmethod
+    def ValidateSaveData(saveData: bytes, startOffset: int, endOffset: int) -> bool:
+        footers = SaveBlocks.LoadFooterTable(saveData)
+        firstBlock = startOffset // BlockSize
+        return SaveBlocks.ValidateSaveFooters(footers, firstBlock, endOffset // BlockSize) \
+            and SaveBlocks.ValidateSaveChecksums(saveData, footers, firstBlock, endOffset // BlockSize)
+
+    @staticmethod
+    def ValidateSaveFooters(footers: List[Tuple[int, int, int, int]], firstBlock: int, endBlock: int = None) -> bool:
+        if endBlock is None:
+            endBlock = firstBlock + BlocksPerSave
+
         fileSignature = 0
         saveIndex = 0
         checkedBlockIds = dict()
 
-        for offset in range(startOffset, endOffset, BlockSize):  # Check Both Saves
+        for blockId, _, currFileSignature, currSaveIndex in footers[firstBlock:endBlock]:
             # Check Block Id
-            binaryFile.seek(offset + BlockIdOffset)
-            blockId = BytesToInt(binaryFile.read(2))
-
             if blockId not in SaveBlockNumbers:
                 return False  # Not valid block Id
 
@@ -148,9 +291,6 @@ class SaveBlocks:
             checkedBlockIds[blockId] = True
 
             # Check File Signature
-            binaryFile.seek(offset + FileSignatureOffset)
-            currFileSignature = BytesToInt(binaryFile.read(4))
-
             if fileSignature == 0:  # First save block checked
                 fileSignature = currFileSignature
             elif currFileSignature != fileSignature:
@@ -160,53 +300,42 @@ class SaveBlocks:
                 return False  # Not valid file signature for use here
 
             # Check Save Index
-            binaryFile.seek(offset + SaveIndexOffset)
-            currSaveIndex = BytesToInt(binaryFile.read(4))
-
             if saveIndex == 0:  # First save block checked
                 saveIndex = currSaveIndex
             elif currSaveIndex != saveIndex:
                 return False  # Save indexes aren't the same for all save blocks
 
-            # Check Checksum
-            binaryFile.seek(offset + ChecksumOffset)
-            checksum = BytesToInt(binaryFile.read(2))
-
-            binaryFile.seek(offset)
-            saveBlockData = list(binaryFile.read(BlockDataSize))
-
-            if SaveBlocks.CalculateChecksum(saveBlockData, blockId) != checksum:
-                return False  # Invalid checksum
-
         return True
 
     @staticmethod
-    def CalculateChecksum(saveBlock: List[int], saveBlockId: int) -> int:
-        if saveBlockId == 0:
-            size = 0xF24
-        elif saveBlockId == 4:
-            size = 0xD98
-        elif saveBlockId == 13:
-            size = 0x450
-        else:
-            size = BlockDataSize
+    def ValidateSaveChecksums(saveData: bytes, footers: List[Tuple[int, int, int, int]], firstBlock: int, endBlock: int = None) -> bool:
+        if endBlock is None:
+            endBlock = firstBlock + BlocksPerSave
 
-        checksum = 0
-        for i in range(0, size, 4):  # Sum up all the bytes in the block
-            word = BytesToInt(saveBlock[i:i + 4])
-            checksum += word
+        blocksToChecksum = [(fileBlock * BlockSize, footers[fileBlock][0]) for fileBlock in range(firstBlock, endBlock)]
+        expectedChecksums = [footers[fileBlock][1] for fileBlock in range(firstBlock, endBlock)]
+        return SaveBlocks.CalculateChecksums(saveData, blocksToChecksum) == expectedChecksums
 
-            while checksum > 0xFFFFFFFF:  # Overflow
-                checksum -= 0x100000000
+    @staticmethod
+    def CalculateChecksum(saveBlock: List[int], saveBlockId: int) -> int:
+        if type(saveBlock) == list:
+            saveBlock = bytes(saveBlock)
 
-        upperBits = (checksum >> 16) & 0xFFFF
-        lowerBits = checksum & 0xFFFF
-        checksum = upperBits + lowerBits
-        while checksum > 0xFFFF:  # Overflow
-            checksum -= 0x10000  # Bring back to 16 bit
+        return SaveBlocks.CalculateChecksumAtOffset(saveBlock, 0, saveBlockId)
 
+    @staticmethod
+    def CalculateChecksumAtOffset(saveData: bytes, offset: int, saveBlockId: int) -> int:
+        checksumStruct = ChecksumStructs[ChecksumSizes.get(saveBlockId, BlockDataSize)]
+        checksum = sum(checksumStruct.unpack_from(saveData, offset)) & 0xFFFFFFFF  # Sum up all the words in the block with overflow
+        checksum = ((checksum >> 16) + (checksum & 0xFFFF)) & 0xFFFF  # Fold down to 16 bits with overflow
         return checksum
 
+    @staticmethod
+    def CalculateChecksums(saveData: bytes, blocks: List[Tuple[int, int]]) -> List[int]:
+        # Each block is a tuple of (offset in saveData, block id)
+        # Still one unpack per block: summing the words is nearly all of the time, so unpacking a run of blocks at once is no faster
+        return [SaveBlocks.CalculateChecksumAtOffset(saveData, offset, blockId) for offset, blockId in blocks]
+
     @staticmethod
     def CreateBlankDict() -> Dict[int, list]:
         return dict((key, list()) for key in SaveBlockNumbers)
@@ -218,40 +347,55 @@ class SaveBlocks:
         if not os.path.isfile(saveFile):
             return False
 
-        with open(saveFile, "rb+") as binaryFile:  # Read and write
-            if SaveBlocks.UsesSaveIndexA(binaryFile):
-                saveOffset = 0
-            else:
-                saveOffset = SaveSize
+        newSaveData = SaveBlocks.ReplaceAllInData(SaveBlocks.ReadSaveFile(saveFile), saveBlocks)
+        with open(saveFile, "wb") as binaryFile:
+            binaryFile.write(newSaveData)
+
+        return True  # Successfully updated the save file
+
+    @staticmethod
+    def ReplaceAllInData(saveData: bytes, saveBlocks: Dict[int, List[int]]) -> bytes:
+        saveData = bytearray(saveData)  # Don't modify the original
+        footers = SaveBlocks.LoadFooterTable(saveData)
+        firstBlock = SaveBlocks.GetMainSaveFirstBlock(footers)
+
+        if type(saveBlocks) == dict:
+            blocksToWrite = saveBlocks.keys()  # No way of knowing what changed
+        else:
+            blocksToWrite = saveBlocks.dirtyBlocks  # Only rewrite the blocks that were actually modified
+
+        # Replace Relevant Saveblocks
+        replacedBlocks = []
+        for fileBlock in range(firstBlock, firstBlock + BlocksPerSave):
+            offset = fileBlock * BlockSize
+            blockId = footers[fileBlock][0]
+
+            if blockId in saveBlocks and blockId in blocksToWrite:
+                saveData[offset:offset + BlockDataSize] = bytes(saveBlocks[blockId])
+                replacedBlocks.append((offset, blockId))
 
-            # Replace Relevant Saveblocks
-            for blockOffset in range(0, SaveSize, BlockSize):
-                offset = saveOffset + blockOffset
-                binaryFile.seek(offset + BlockIdOffset)
-                blockId = BytesToInt(binaryFile.read(2))
+        # Replace Saveblocks 30 & 31
+        for blockId in range(30, 31 + 1):
+            if blockId in blocksToWrite:
+                offset = blockId * BlockSize
+                saveData[offset:offset + BlockDataSize] = bytes(saveBlocks[blockId])
+                replacedBlocks.append((offset, blockId))
 
-                if blockId in saveBlocks:
-                    SaveBlocks.ReplaceOne(binaryFile, offset, saveBlocks[blockId], blockId)
+        # Update the checksums of all the replaced blocks together
+        checksums = SaveBlocks.CalculateChecksums(saveData, replacedBlocks)
+        for (offset, _), checksum in zip(replacedBlocks, checksums):
+            saveData[offset + ChecksumOffset:offset + ChecksumOffset + 2] = checksum.to_bytes(2, "little")
 
-            # Replace Saveblocks 30 & 31
-            SaveBlocks.ReplaceOne(binaryFile, 30 * 0x1000, saveBlocks[30], 30)
-            SaveBlocks.ReplaceOne(binaryFile, 31 * 0x1000, saveBlocks[31], 31)
-            return True  # Successfully updated the save file
+        return bytes(saveData)
 
     @staticmethod
     def ReplaceOne(binaryFile: BinaryIO, offset: int, saveblockData: List[int], blockId: int):
         # Update Data
+        saveblockData = bytes(saveblockData)
         binaryFile.seek(offset)
-        binaryFile.write(bytes(saveblockData))
+        binaryFile.write(saveblockData)
 
         # Update Checksum
-        binaryFile.seek(offset)
-        newData = binaryFile.read(BlockDataSize)
-        checksum = SaveBlocks.CalculateChecksum(list(newData), blockId)
-        checksum = ConvertToReverseByteList(hex(checksum))
-        checksum = list(int(x, 16) for x in checksum)
-        while len(checksum) < 2:
-            checksum.append(0)  # Make sure checksum is always 16-bit
+        checksum = SaveBlocks.CalculateChecksum(saveblockData, blockId)
         binaryFile.seek(offset + ChecksumOffset)
-        binaryFile.write(bytes(checksum))
-
+        binaryFile.write(checksum.to_bytes(2, "little"))  # Checksum is always 16-bit
@@ -0,0 +1,107 @@
+import hashlib
+import struct
+from typing import List, Tuple
+
+from SaveBlocks import BlockSize
+
+# Patch format (all integers little endian):
+#   Header:
+#     magic            4 bytes   b"UCSP"
+#     version          u8        PatchVersion
+#     original size    u32       Size of the save the patch applies to
+#     new size         u32       Size of the save after the patch is applied
+#     original digest  16 bytes  BLAKE2b-128 of the original save
+#     new digest       16 bytes  BLAKE2b-128 of the patched save
+#     range count      u32
+#   Then for each range, in increasing offset order:
+#     offset           u32       Where in the save the range starts
+#     length           u32
+#     data             length bytes to write at offset
+# Checksums are just bytes in the save, so they're carried in the ranges like everything else.
+
+PatchMagic = b"UCSP"
+PatchVersion = 1
+PatchHeaderStruct = struct.Struct("<4sBII16s16sI")
+PatchRangeStruct = struct.Struct("<II")
+MaxRangeGap = PatchRangeStruct.size  # Unchanged bytes cheaper to resend than to start a new range for
+
+
+class SavePatch:
+    @staticmethod
+    def GetDigest(saveData: bytes) -> bytes:
+        return hashlib.blake2b(saveData, digest_size=16).digest()
+
+    @staticmethod
+    def FindChangedRanges(originalData: bytes, newData: bytes) -> List[Tuple[int, int]]:
+        ranges = []  # [start, end) pairs
+        originalView, newView = memoryview(originalData), memoryview(newData)
+        commonSize = min(len(originalData), len(newData))
+
+        for blockOffset in range(0, commonSize, BlockSize):
+            blockEnd = min(blockOffset + BlockSize, commonSize)
+            if originalView[blockOffset:blockEnd] == newView[blockOffset:blockEnd]:
+                continue  # Most blocks don't change at all
+
+            for i in range(blockOffset, blockEnd):
+                if originalData[i] != newData[i]:
+                    if ranges != [] and i - ranges[-1][1] <= MaxRangeGap:
+                        ranges[-1][1] = i + 1  # Extend the previous range
+                    else:
+                        ranges.append([i, i + 1])
+
+        if len(newData) > commonSize:  # Anything past the end of the original is new
+            if ranges != [] and commonSize - ranges[-1][1] <= MaxRangeGap:
+                ranges[-1][1] = len(newData)
+            else:
+                ranges.append([commonSize, len(newData)])
+
+        return [(start, end - start) for start, end in ranges]
+
+    @staticmethod
+    def Create(originalData: bytes, newData: bytes) -> bytes:
+        ranges = SavePatch.FindChangedRanges(originalData, newData)
+        patch = bytearray(PatchHeaderStruct.pack(PatchMagic, PatchVersion, len(originalData), len(newData),
+                                                 SavePatch.GetDigest(originalData), SavePatch.GetDigest(newData), len(ranges)))
+
+        for offset, length in ranges:
+            patch += PatchRangeStruct.pack(offset, length)
+            patch += newData[offset:offset + length]
+
+        return bytes(patch)
+
+    @staticmethod
+    def Apply(originalData: bytes, patch: bytes) -> bytes:
+        # Returns an empty result if the patch is malformed, is for a different save, or doesn't produce the expected save
+        if len(patch) < PatchHeaderStruct.size:
+            return b""
+
+        magic, version, originalSize, newSize, originalDigest, newDigest, rangeCount = PatchHeaderStruct.unpack_from(patch, 0)
+        if magic != PatchMagic or version != PatchVersion \
+        or len(originalData) != originalSize or SavePatch.GetDigest(originalData) != originalDigest:
+            return b""
+
+        newData = bytearray(originalData[:newSize])
+        newData.extend(bytes(newSize - len(newData)))
+        patchOffset = PatchHeaderStruct.size
+
+        for _ in range(rangeCount):
+            if patchOffset + PatchRangeStruct.size > len(patch):
+                return b""  # Patch was cut off
+
+            offset, length = PatchRangeStruct.unpack_from(patch, patchOffset)
+            patchOffset += PatchRangeStruct.size
+            if offset + length > newSize or patchOffset + length > len(patch):
+                return b""
+
+            newData[offset:offset + length] = patch[patchOffset:patchOffset + length]
+            patchOffset += length
+
+        if patchOffset != len(patch) or SavePatch.GetDigest(newData) != newDigest:
+            return b""
+
+        return bytes(newData)
+
+    @staticmethod
+    def Verify(originalData: bytes, newData: bytes, patch: bytes) -> bool:
+        patchedData = SavePatch.Apply(originalData, patch)
+        return patchedData != b"" and patchedData == newData
@@ -0,0 +1,60 @@
+from typing import Callable, List, Tuple
+
+from SaveTables import FlagTable, VarTable
+
+
+class InaccessibleRule:
+    def __init__(self, condition: dict):
+        self.reason = condition["reason"]
+
+        skipFlags = condition.get("butNotIfFlagSet", [])
+        if type(skipFlags) != list:
+            skipFlags = [skipFlags]
+        self.skipMasks = FlagTable.GetMasks(skipFlags) if len(skipFlags) > 0 else None  # Rule doesn't apply if any are set
+
+        self.applies = InaccessibleRule.CompileTest(condition)
+
+    @staticmethod
+    def CompileTest(condition: dict) -> Callable[[FlagTable, VarTable], bool]:
+        if "flagSet" in condition:
+            masks = FlagTable.GetMasks([condition["flagSet"]])
+            return lambda flags, vars: flags.AnySetInMasks(masks)
+        elif "flagNotSet" in condition:
+            masks = FlagTable.GetMasks([condition["flagNotSet"]])
+            return lambda flags, vars: not flags.AnySetInMasks(masks)
+        elif "varSetTo" in condition:
+            var, value = condition["varSetTo"]
+            return lambda flags, vars: vars.Get(var) == value
+        elif "varNotSetTo" in condition:
+            var, value = condition["varNotSetTo"]
+            return lambda flags, vars: vars.Get(var) != value
+
+        return lambda flags, vars: False  # Nothing to check
+
+    def GetReason(self, flags: FlagTable, vars: VarTable) -> str:
+        if self.skipMasks is not None and flags.AnySetInMasks(self.skipMasks):
+            return ""
+
+        return self.reason if self.applies(flags, vars) else ""
+
+
+class SaveRules:
+    def __init__(self, fileSignature: int, gameDetails: dict):
+        self.fileSignature = fileSignature  # Game the rules were compiled for
+        self.randomizerMasks = FlagTable.GetMasks(gameDetails.get("randomizerFlags", []))
+        self.inaccessibleRules: List[InaccessibleRule] = [InaccessibleRule(condition) for condition in gameDetails.get("inaccessible", [])]
+
+    def IsRandomized(self, flags: FlagTable) -> bool:
+        return self.randomizerMasks != (0, 0) and flags.AnySetInMasks(self.randomizerMasks)
+
+    def GetInaccessibleReason(self, flags: FlagTable, vars: VarTable) -> str:
+        for rule in self.inaccessibleRules:
+            reason = rule.GetReason(flags, vars)
+            if reason != "":
+                return reason
+
+        return ""
+
+    def Evaluate(self, flags: FlagTable, vars: VarTable) -> Tuple[bool, str]:
+        # Both verdicts from the same tables: whether a randomizer flag is set and why the save can't be used (if it can't)
+        return self.IsRandomized(flags), self.GetInaccessibleReason(flags, vars)
@@ -0,0 +1,70 @@
+import struct
+from typing import Iterable, Optional, Tuple
+
+VARS_START = 0x4000
+CFRU_FLAGS_START = 0x900
+CFRU_FLAGS_END = 0x1900
+CFRU_VARS_START = 0x5000
+CFRU_VARS_END = 0x5200
+
+
+class FlagTable:
+    def __init__(self, vanillaFlags: Optional[bytes], cfruFlags: Optional[bytes], supported: bool = True):
+        # Each set of flags is one int with bit n set if flag n (from the start of the set) is set
+        self.vanillaFlags = int.from_bytes(vanillaFlags, "little") if vanillaFlags is not None else None
+        self.cfruFlags = int.from_bytes(cfruFlags, "little") if cfruFlags is not None else None
+        self.supported = supported  # Flags can only be read from CFRU hacks
+
+    @staticmethod
+    def GetMasks(flags: Iterable[int]) -> Tuple[int, int]:
+        vanillaMask, cfruMask = 0, 0
+        for flag in flags:
+            if 0 <= flag < CFRU_FLAGS_START:
+                vanillaMask |= 1 << flag
+            elif CFRU_FLAGS_START <= flag < CFRU_FLAGS_END:
+                cfruMask |= 1 << (flag - CFRU_FLAGS_START)
+            else:
+                raise ValueError(f"Flag \"{flag}\" is not wihin the valid range")
+
+        return vanillaMask, cfruMask
+
+    def Get(self, flag: int) -> bool:
+        return self.AnySet([flag])
+
+    def AnySet(self, flags: Iterable[int]) -> bool:
+        if not self.supported:
+            return False
+
+        return self.AnySetInMasks(FlagTable.GetMasks(flags))
+
+    def AnySetInMasks(self, masks: Tuple[int, int]) -> bool:
+        if not self.supported:
+            return False
+
+        vanillaMask, cfruMask = masks
+        if (vanillaMask != 0 and self.vanillaFlags is None) or (cfruMask != 0 and self.cfruFlags is None):
+            raise ValueError("Flags are not in the save blocks")
+
+        return (vanillaMask != 0 and (self.vanillaFlags & vanillaMask) != 0) \
+            or (cfruMask != 0 and (self.cfruFlags & cfruMask) != 0)
+
+
+class VarTable:
+    def __init__(self, vanillaVars: Optional[bytes], cfruVars: Optional[bytes], supported: bool = True):
+        # Each var is two bytes
+        self.vanillaVars = struct.unpack(f"<{len(vanillaVars) // 2}H", vanillaVars) if vanillaVars is not None else None
+        self.cfruVars = struct.unpack(f"<{len(cfruVars) // 2}H", cfruVars) if cfruVars is not None else None
+        self.supported = supported  # Vars can only be read from CFRU hacks
+
+    def Get(self, var: int) -> int:
+        if not self.supported:
+            return -1
+
+        if VARS_START <= var < VARS_START + 0x100 and self.vanillaVars is not None:
+            return self.vanillaVars[var - VARS_START]
+        elif CFRU_VARS_START <= var < CFRU_VARS_END and self.cfruVars is not None:
+            if var - CFRU_VARS_START < len(self.cfruVars):
+                return self.cfruVars[var - CFRU_VARS_START]
+            return 0  # Valid var but not saved
+
+        raise ValueError(f"Var \"{var}\" is not wihin the valid range")
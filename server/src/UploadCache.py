@@ -0,0 +1,45 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+DEFAULT_MAX_ENTRIES = 32  # A full upload result is around 1 MB in memory
+
+
+class UploadCache:
+    def __init__(self, maxEntries: int = DEFAULT_MAX_ENTRIES):
+        self.maxEntries = maxEntries
+        self.entries = OrderedDict()  # Key -> result, least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()  # Requests are handled on multiple threads
+
+    @staticmethod
+    def GetKey(saveData: bytes) -> bytes:
+        return hashlib.blake2b(saveData, digest_size=16).digest()
+
+    def Get(self, key: bytes) -> Optional[dict]:
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)  # Now the most recently used
+                self.hits += 1
+                return self.entries[key]
+
+            self.misses += 1
+            return None
+
+    def Add(self, key: bytes, result):
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)  # In case it replaced an older result
+
+            while len(self.entries) > self.maxEntries:
+                self.entries.popitem(last=False)  # Remove least recently used
+
+    def Clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def GetStats(self) -> dict:
+        with self.lock:
+            return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
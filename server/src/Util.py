@@ -9,23 +9,7 @@ def BytesToInt(line: List[bytes]) -> int:
 
 
 def BytesToString(byteString: List[bytes]) -> str:
-    string = ""
-    # error = False
-    for byte in byteString:
-        byte = int(byte)
-        if byte == EOS:  # End of string
-            break
-        elif byte in Defines.charMap:
-            string += Defines.charMap[byte]
-        else:
-            pass
-            # error = True
-            # print("Error: An unidentifiable character was encountered while extracting a string. {}".format(hex(byte)))
-
-    # if error:
-    #    print("Extracted string: \"{}\"".format(string))
-
-    return string
+    return Defines.charMapCodec.Decode(bytes(int(byte) for byte in byteString))  # Bytes can also be given as text, eg. [b"205", b"223"]
 
 
 def ConvertToReverseByteList(string: str) -> List[str]: